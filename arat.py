@@ -2,218 +2,15 @@
 # -*- coding: utf-8 -*-
 """
 arat.py
-Terminal tabanlı Türkçe komut arama aracı.
-- İçinde 1000+ farklı Türkçe açıklama -> komut eşleşmesi üretir.
-- Arama: fuzzy (benzerlik) ile en uygun sonuçları gösterir.
-- Hiçbir komutu çalıştırmaz; sadece gösterir.
+Terminal tabanlı Türkçe komut arama aracı; komut satırı giriş noktası.
+Uygulama arat_core.py'de durur: betik olarak çalışan dosya her seferinde
+yeniden derlenir, içe aktarılan modül ise .pyc önbelleğinden yüklenir.
+Kullanım ve seçenekler için bkz. arat_core.py.
 """
 
 import sys
-import json
-from difflib import SequenceMatcher, get_close_matches
-import readline  # güzel terminal deneyimi (history, edit)
-from textwrap import indent
 
-def make_commands(n_min=1000):
-    """Programatik olarak ~n_min giriş üreten komut sözlüğü döndürür."""
-    base = {
-        "indirme komudu": {
-            "Debian/Ubuntu": "sudo apt install <paket>",
-            "Arch": "sudo pacman -S <paket>",
-            "Fedora": "sudo dnf install <paket>"
-        },
-        "güncelleme komudu": {
-            "Debian/Ubuntu": "sudo apt update && sudo apt upgrade -y",
-            "Arch": "sudo pacman -Syu",
-            "Fedora": "sudo dnf upgrade --refresh -y"
-        },
-        "paket kaldırma": {
-            "Debian/Ubuntu": "sudo apt remove <paket>",
-            "Arch": "sudo pacman -R <paket>",
-            "Fedora": "sudo dnf remove <paket>"
-        },
-        "dosya silme": {
-            "Tüm": "rm <dosya>"
-        },
-        "dosya taşıma": {
-            "Tüm": "mv <kaynak> <hedef>"
-        },
-        "dizin oluşturma": {
-            "Tüm": "mkdir -p <dizin>"
-        },
-        "dizin silme": {
-            "Tüm": "rmdir <dizin>"
-        },
-        "listele": {
-            "Tüm": "ls -la"
-        },
-        "geçerli dizin": {
-            "Tüm": "pwd"
-        },
-        "dosya göster": {
-            "Tüm": "cat <dosya>"
-        },
-        "dosya başı": {
-            "Tüm": "head <dosya>"
-        },
-        "dosya sonu": {
-            "Tüm": "tail <dosya>"
-        },
-        "disk boşluğu": {
-            "Tüm": "df -h"
-        },
-        "hafıza kullanımı": {
-            "Tüm": "free -h"
-        },
-        "manuel sayfa": {
-            "Tüm": "man <komut>"
-        },
-        "servis başlat": {
-            "Tüm": "sudo systemctl start <servis>"
-        },
-        "servis durdur": {
-            "Tüm": "sudo systemctl stop <servis>"
-        },
-        "servis yeniden başlat": {
-            "Tüm": "sudo systemctl restart <servis>"
-        },
-        "servis durum": {
-            "Tüm": "sudo systemctl status <servis>"
-        }
-    }
-
-    # Çeşitli kelime parçalarıyla daha gerçekçi 1000+ anahtar üret
-    verbs = [
-        "kur", "yükle", "indirme komudu", "paket yükleme", "güncelle",
-        "sil", "kaldır", "ara", "başlat", "durdur", "yeniden başlat", "durum",
-        "listele", "göster", "taşı", "kopyala", "ita", "ayarla", "aç", "kapat",
-        "bağlan", "ayıkla", "sıkıştır", "açıkla", "log göster", "log temizle"
-    ]
-    nouns = [
-        "paket", "dosya", "dizin", "servis", "sistem", "ağ", "disk", "bellek",
-        "kullanıcı", "izin", "port", "günlük", "cron", "zamanlayıcı", "yedek",
-        "ssh", "firewall", "ağ arayüzü", "samba", "docker", "konteyner",
-        "işlem", "kernel", "modül", "kaynak", "açık", "güvenlik"
-    ]
-    templates = [
-        "{v} {n}", "{n} {v}", "{v} {n} komudu", "{n} için {v}", "{v} işlemi",
-        "{n} yönetimi {v}", "{v} yapmak", "{v} nasıl yapılır", "{n} kontrol"
-    ]
-
-    commands = dict(base)  # kopyala
-    idx = 1
-    i = 0
-    # üretme döngüsü: farklı kombinasyonlarla anahtarlar ekle
-    while len(commands) < n_min:
-        v = verbs[i % len(verbs)]
-        n = nouns[(i*3) % len(nouns)]
-        tpl = templates[i % len(templates)]
-        key = tpl.format(v=v, n=n).strip()
-        # benzersizleştir
-        if key in commands:
-            key = f"{key} {idx}"
-            idx += 1
-        # basit karşılık üret (çeşitlilik için birkaç varyasyon)
-        if "paket" in n or "paket" in v or "yük" in v or "kur" in v or "indirme" in v:
-            val = {
-                "Debian/Ubuntu": "sudo apt install <paket>",
-                "Arch": "sudo pacman -S <paket>",
-                "Fedora": "sudo dnf install <paket>"
-            }
-        elif "servis" in n or "başlat" in v or "durdur" in v:
-            val = {"Tüm": "sudo systemctl <action> <servis>"}
-        elif "ssh" in n or "ağ" in n or "port" in n:
-            val = {"Tüm": "ssh <user>@<host>  # veya netstat -tulpn / ss -tulpn"}
-        elif "docker" in n or "konteyner" in n:
-            val = {"Tüm": "docker <komut> <container>  # örn: docker run ..."}
-        elif "yedek" in n or "backup" in n:
-            val = {"Tüm": "tar -czvf <yedek>.tar.gz <kaynak>"}
-        elif "log" in n or "günlük" in n:
-            val = {"Tüm": "journalctl -u <servis> --since today"}
-        else:
-            # genel fallback komutları
-            examples = [
-                "ls -la <dizin>",
-                "cp <kaynak> <hedef>",
-                "mv <kaynak> <hedef>",
-                "rm -rf <hedef>",
-                "grep -R \"<aranan>\" <dizin>",
-                "find <dizin> -name \"<isim>\"",
-                "chmod 644 <dosya>",
-                "chown user:group <dosya>"
-            ]
-            val = {"Tüm": examples[i % len(examples)]}
-        commands[key] = val
-        i += 1
-        # küçük varyasyonlar ekleyerek gerçekçi 1000+ oluştur
-        if len(commands) % 100 == 0:
-            # her 100'de bir küçük varyasyon kümesi ekle
-            commands[f"özel işlem {len(commands)}"] = {"Tüm": "echo 'özel işlem'"} 
-
-    return commands
-
-def score(a, b):
-    return SequenceMatcher(None, a, b).ratio()
-
-def search_commands(commands, query, limit=10):
-    """Query'ye göre benzerlik skoruna göre sıralanmış sonuç döndürür."""
-    q = query.lower().strip()
-    # hesapla skorlar
-    scored = []
-    for k in commands.keys():
-        s = score(k.lower(), q)
-        # ayrıca içindeki kelimelere bak (substring boost)
-        if q in k.lower():
-            s = max(s, 0.95)
-        scored.append((s, k))
-    scored.sort(reverse=True, key=lambda x: x[0])
-    # filtrele: 0.2 altını at
-    filtered = [(s, k) for (s, k) in scored if s >= 0.20]
-    return filtered[:limit]
-
-def pretty_print_result(key, cmd_map, rank, score_val):
-    print(f"\n[{rank}] {key}  (benzerlik: {score_val:.2f})")
-    for platform, cmd in cmd_map.items():
-        # indent komut metnini
-        print(indent(f"{platform}: {cmd}", "   "))
-
-def interactive_loop(commands):
-    print("Etkinleştirilmiş arama modu. Çıkmak için 'çık' veya Ctrl-C.")
-    try:
-        while True:
-            q = input("\nArama > ").strip()
-            if not q:
-                continue
-            if q.lower() in ("çık", "quit", "exit", "q"):
-                print("Çıkılıyor.")
-                break
-            res = search_commands(commands, q, limit=8)
-            if not res:
-                print("Sonuç bulunamadı.")
-                continue
-            for i, (s, k) in enumerate(res, start=1):
-                pretty_print_result(k, commands[k], i, s)
-    except KeyboardInterrupt:
-        print("\nKapatılıyor...")
-
-def main(argv):
-    commands = make_commands(1000)
-    # opsiyonel: oluşturulan veri kaydedilsin mi? (kullanıcıya zarar vermez)
-    # with open("commands_generated.json", "w", encoding="utf-8") as f:
-    #     json.dump(commands, f, ensure_ascii=False, indent=2)
-
-    if len(argv) >= 2:
-        query = " ".join(argv[1:]).strip()
-        res = search_commands(commands, query, limit=20)
-        if not res:
-            print("❌ Sonuç bulunamadı. Başka bir şey dene.")
-            return 0
-        for i, (s, k) in enumerate(res, start=1):
-            pretty_print_result(k, commands[k], i, s)
-        return 0
-    else:
-        interactive_loop(commands)
-        return 0
+from arat_core import main
 
 if __name__ == "__main__":
     sys.exit(main(sys.argv))
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+arat_client.py
+`arat.py --serve` sunucusuna bağlanıp tek sorgu soran küçük istemci
+(kabuk tamamlama / kısayolları için: arat.py'yi yüklemez).
+Kullanım:
+    python3 arat_client.py <sorgu>            # anahtar<TAB>komut satırları
+    python3 arat_client.py -n 5 <sorgu>       # en fazla 5 sonuç
+    python3 arat_client.py --reload           # sunucuya yeniden yükleme
+"""
+
+import json
+import os
+import socket
+import struct
+import sys
+
+def socket_path():
+    # arat_core.default_socket_path ile aynı
+    if os.environ.get("ARAT_SOCKET"):
+        return os.environ["ARAT_SOCKET"]
+    base = os.environ.get("XDG_RUNTIME_DIR")
+    if base:
+        return os.path.join(base, f"arat-{os.getuid()}.sock")
+    return os.path.join("/tmp", f"arat-{os.getuid()}", "arat.sock")
+
+def _peer_uid(s, path):
+    if hasattr(socket, "SO_PEERCRED"):
+        creds = s.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+        return struct.unpack("3i", creds)[1]  # pid, uid, gid
+    return os.stat(path).st_uid
+
+def ask(req, path=None, timeout=2.0):
+    path = path or socket_path()
+    with socket.socket(socket.AF_UNIX) as s:
+        s.settimeout(timeout)
+        s.connect(path)
+        # başka bir kullanıcının açtığı soket sorguları okuyup sahte yanıt verebilir
+        uid = _peer_uid(s, path)
+        if uid != os.getuid():
+            raise PermissionError(f"{path} başka bir kullanıcının sunucusu (uid {uid})")
+        s.sendall(json.dumps(req, ensure_ascii=False).encode() + b"\n")
+        return json.loads(s.makefile("rb").readline())
+
+def main(argv):
+    args = argv[1:]
+    limit = 10
+    if args[:1] == ["-n"]:
+        value = args[1] if len(args) >= 2 else ""
+        limit = int(value) if value.isdecimal() else 0
+        if limit < 1:
+            print(f"-n pozitif bir tam sayı ister: {value!r}", file=sys.stderr)
+            return 2
+        args = args[2:]
+    try:
+        if args == ["--reload"]:
+            print(ask({"op": "reload"}, timeout=60))
+            return 0
+        if not args:
+            print(__doc__)
+            return 2
+        resp = ask({"q": " ".join(args), "limit": limit})
+    except OSError as e:
+        print(f"arat sunucusuna bağlanılamadı ({e}); önce: python3 arat.py --serve", file=sys.stderr)
+        return 1
+    except ValueError as e:
+        # boş ya da yarım satır: sunucu yanıt vermeden kapandı veya soket başka bir programın
+        print(f"arat sunucusundan geçersiz yanıt ({e})", file=sys.stderr)
+        return 1
+    if "error" in resp:
+        print(resp["error"], file=sys.stderr)
+        return 1
+    for r in resp["results"]:
+        for cmd in r["commands"].values():
+            # man girişlerinde kullanım çok satırlı olabilir: satır başına bir sonuç kalsın
+            print(f"{r['key']}\t{'; '.join(cmd.splitlines())}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,1822 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+arat_core.py
+Terminal tabanlı Türkçe komut arama aracı (uygulama). Komut satırı giriş
+noktası arat.py'dir: betik olarak çalışan dosya .pyc önbelleğine yazılmadığı
+için kod bu modülde durur, her çalıştırmada yeniden derlenmez.
+- İçinde 1000+ farklı Türkçe açıklama -> komut eşleşmesi üretir.
+- Arama: fuzzy (benzerlik) ile en uygun sonuçları gösterir; kelime ve bigram
+  ters indeksi aday kümesini daraltır, yalnız adaylar puanlanır.
+- Komutlar ve indeks bir kez ~/.cache/arat/commands.db dosyasına derlenir ve
+  mmap ile açılır; arat_core.py değişince kendiliğinden yeniden derlenir.
+- Man sayfaları: python3 arat.py --index-man [--full] /usr/share/man altındaki
+  sayfaların NAME/SYNOPSIS bölümlerini (gz/xz/bz2) paralel ve artımlı ekler.
+- Sunucu: python3 arat.py --serve [soket] indeksi bellekte tutar, Unix
+  soketinde satır başına JSON sorgu yanıtlar; istemci: arat_client.py
+- Yazarken arama: python3 arat.py --live (curses; her tuşta yeniden sıralar)
+- Toplu sorgu: python3 arat.py --batch [dosya] [-n N] [-j işçi] satır başına
+  bir sorgu okur, girdi sırasıyla JSONL yazar (çekirdekler arasında paralel).
+- Karşılaştırma: python3 arat.py --bench [N], --bench-startup, --bench-serve [istemci] [sorgu],
+  --bench-live [N], --bench-batch [N]
+- Hiçbir komutu çalıştırmaz; sadece gösterir.
+"""
+
+import sys
+import os
+import heapq
+import struct
+import time
+from bisect import bisect_left
+# array (collections.abc'yi yükler), difflib, readline, mmap: tek seferlik
+# sorguda başlangıcı yavaşlatmasın diye kullanıldıkları yerde içe aktarılır
+
+ENTRY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "arat.py")  # alt süreçler için
+
+def make_commands(n_min=1000):
+    """Programatik olarak ~n_min giriş üreten komut sözlüğü döndürür."""
+    base = {
+        "indirme komudu": {
+            "Debian/Ubuntu": "sudo apt install <paket>",
+            "Arch": "sudo pacman -S <paket>",
+            "Fedora": "sudo dnf install <paket>"
+        },
+        "güncelleme komudu": {
+            "Debian/Ubuntu": "sudo apt update && sudo apt upgrade -y",
+            "Arch": "sudo pacman -Syu",
+            "Fedora": "sudo dnf upgrade --refresh -y"
+        },
+        "paket kaldırma": {
+            "Debian/Ubuntu": "sudo apt remove <paket>",
+            "Arch": "sudo pacman -R <paket>",
+            "Fedora": "sudo dnf remove <paket>"
+        },
+        "dosya silme": {
+            "Tüm": "rm <dosya>"
+        },
+        "dosya taşıma": {
+            "Tüm": "mv <kaynak> <hedef>"
+        },
+        "dizin oluşturma": {
+            "Tüm": "mkdir -p <dizin>"
+        },
+        "dizin silme": {
+            "Tüm": "rmdir <dizin>"
+        },
+        "listele": {
+            "Tüm": "ls -la"
+        },
+        "geçerli dizin": {
+            "Tüm": "pwd"
+        },
+        "dosya göster": {
+            "Tüm": "cat <dosya>"
+        },
+        "dosya başı": {
+            "Tüm": "head <dosya>"
+        },
+        "dosya sonu": {
+            "Tüm": "tail <dosya>"
+        },
+        "disk boşluğu": {
+            "Tüm": "df -h"
+        },
+        "hafıza kullanımı": {
+            "Tüm": "free -h"
+        },
+        "manuel sayfa": {
+            "Tüm": "man <komut>"
+        },
+        "servis başlat": {
+            "Tüm": "sudo systemctl start <servis>"
+        },
+        "servis durdur": {
+            "Tüm": "sudo systemctl stop <servis>"
+        },
+        "servis yeniden başlat": {
+            "Tüm": "sudo systemctl restart <servis>"
+        },
+        "servis durum": {
+            "Tüm": "sudo systemctl status <servis>"
+        }
+    }
+
+    # Çeşitli kelime parçalarıyla daha gerçekçi 1000+ anahtar üret
+    verbs = [
+        "kur", "yükle", "indirme komudu", "paket yükleme", "güncelle",
+        "sil", "kaldır", "ara", "başlat", "durdur", "yeniden başlat", "durum",
+        "listele", "göster", "taşı", "kopyala", "ita", "ayarla", "aç", "kapat",
+        "bağlan", "ayıkla", "sıkıştır", "açıkla", "log göster", "log temizle"
+    ]
+    nouns = [
+        "paket", "dosya", "dizin", "servis", "sistem", "ağ", "disk", "bellek",
+        "kullanıcı", "izin", "port", "günlük", "cron", "zamanlayıcı", "yedek",
+        "ssh", "firewall", "ağ arayüzü", "samba", "docker", "konteyner",
+        "işlem", "kernel", "modül", "kaynak", "açık", "güvenlik"
+    ]
+    templates = [
+        "{v} {n}", "{n} {v}", "{v} {n} komudu", "{n} için {v}", "{v} işlemi",
+        "{n} yönetimi {v}", "{v} yapmak", "{v} nasıl yapılır", "{n} kontrol"
+    ]
+
+    commands = dict(base)  # kopyala
+    idx = 1
+    i = 0
+    # üretme döngüsü: farklı kombinasyonlarla anahtarlar ekle
+    while len(commands) < n_min:
+        v = verbs[i % len(verbs)]
+        n = nouns[(i*3) % len(nouns)]
+        tpl = templates[i % len(templates)]
+        key = tpl.format(v=v, n=n).strip()
+        # benzersizleştir
+        if key in commands:
+            key = f"{key} {idx}"
+            idx += 1
+        # basit karşılık üret (çeşitlilik için birkaç varyasyon)
+        if "paket" in n or "paket" in v or "yük" in v or "kur" in v or "indirme" in v:
+            val = {
+                "Debian/Ubuntu": "sudo apt install <paket>",
+                "Arch": "sudo pacman -S <paket>",
+                "Fedora": "sudo dnf install <paket>"
+            }
+        elif "servis" in n or "başlat" in v or "durdur" in v:
+            val = {"Tüm": "sudo systemctl <action> <servis>"}
+        elif "ssh" in n or "ağ" in n or "port" in n:
+            val = {"Tüm": "ssh <user>@<host>  # veya netstat -tulpn / ss -tulpn"}
+        elif "docker" in n or "konteyner" in n:
+            val = {"Tüm": "docker <komut> <container>  # örn: docker run ..."}
+        elif "yedek" in n or "backup" in n:
+            val = {"Tüm": "tar -czvf <yedek>.tar.gz <kaynak>"}
+        elif "log" in n or "günlük" in n:
+            val = {"Tüm": "journalctl -u <servis> --since today"}
+        else:
+            # genel fallback komutları
+            examples = [
+                "ls -la <dizin>",
+                "cp <kaynak> <hedef>",
+                "mv <kaynak> <hedef>",
+                "rm -rf <hedef>",
+                "grep -R \"<aranan>\" <dizin>",
+                "find <dizin> -name \"<isim>\"",
+                "chmod 644 <dosya>",
+                "chown user:group <dosya>"
+            ]
+            val = {"Tüm": examples[i % len(examples)]}
+        commands[key] = val
+        i += 1
+        # küçük varyasyonlar ekleyerek gerçekçi 1000+ oluştur
+        if len(commands) % 100 == 0:
+            # her 100'de bir küçük varyasyon kümesi ekle
+            commands[f"özel işlem {len(commands)}"] = {"Tüm": "echo 'özel işlem'"} 
+
+    return commands
+
+# ------------------ Man sayfası derlemi ------------------
+MAN_ROOTS = ["/usr/share/man", "/usr/local/share/man"]
+MAN_SYNOPSIS_LINES = 3   # sonuçta gösterilen en fazla kullanım satırı
+MAN_POOL_MIN = 64        # bundan az değişen sayfa varsa süreç havuzu açılmaz
+
+def default_man_cache_path():
+    return os.path.join(os.path.dirname(default_db_path()), "man.json")
+
+def _man_open(path):
+    if path.endswith(".gz"):
+        import gzip
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    if path.endswith(".xz") or path.endswith(".lzma"):
+        import lzma
+        return lzma.open(path, "rt", encoding="utf-8", errors="replace")
+    if path.endswith(".bz2"):
+        import bz2
+        return bz2.open(path, "rt", encoding="utf-8", errors="replace")
+    return open(path, encoding="utf-8", errors="replace")
+
+_troff = None
+
+def _troff_patterns():
+    global _troff
+    if _troff is None:
+        import re
+        _troff = (re.compile(r'"((?:[^"]|"")*)"?|(\S+)'),  # makro argümanları
+                  re.compile(r"\\(f(\[[^\]]*\]|\(..|.)|s[+-]?\d+|[&|^%c]|\*(\[[^\]]*\]|\(..|.))"),
+                  re.compile(r"\\\((..)|\\\[([^\]]*)\]|\\(.)"))
+    return _troff
+
+_TROFF_CHARS = {"em": "—", "en": "–", "hy": "-", "aq": "'", "dq": '"', "lq": '"', "rq": '"',
+                "oq": "'", "cq": "'", "bu": "•", "co": "©", "rg": "®", "mi": "-", "ga": "`",
+                "ti": "~", "ha": "^", "rs": "\\", "ba": "|", "lB": "[", "rB": "]", "-": "-",
+                "e": "\\", "~": " ", " ": " ", "0": " ", "|": "", "^": "", "'": "'", "`": "`", ".": "."}
+_FONT_MACROS = {"B", "I", "SM", "SB", "BR", "BI", "IB", "IR", "RB", "RI"}
+_BREAK_MACROS = {"br", "PP", "P", "LP", "sp", "TP", "IP", "HP", "nf", "fi", "RS", "RE", "SS", "Ss",
+                 "Pp", "Bl", "El", "It", "Vb", "Ve", "EX", "EE"}
+
+def _troff_text(s):
+    args_re, drop_re, char_re = _troff_patterns()
+    s = drop_re.sub("", s)
+    return char_re.sub(lambda m: _TROFF_CHARS.get(m.group(1) or m.group(2) or m.group(3), ""), s)
+
+def _troff_line(line, page):
+    """Bir roff satırını düz metne çevirir; satır sonu gerektiriyorsa None (ayırıcı)."""
+    if not line.strip():
+        return None
+    if line[0] not in ".'":
+        return _troff_text(line)
+    args_re = _troff_patterns()[0]
+    req, _, rest = line[1:].strip().partition(" ")
+    if req.startswith('\\"') or req in _BREAK_MACROS:
+        return None
+    args = [m.group(2) if m.group(1) is None else m.group(1).replace('""', '"')
+            for m in args_re.finditer(rest)]
+    if req in _FONT_MACROS:
+        return _troff_text(("" if len(req) == 2 and req not in ("SM", "SB") else " ").join(args))
+    if req[:1].isupper() and len(req) == 2 and req[1].islower():
+        # mdoc (kabaca): makro adlarını at, Fl bayrağa '-' ekle, Op köşeli
+        # parantez, argümansız Nm sayfa adı; Nd açıklamayı başlatır
+        if req == "Nd":
+            return "- " + _troff_text(" ".join(args))
+        if req in ("Bk", "Ek"):
+            return ""
+        out, opt = [], 0
+        if req == "Nm":
+            args = args or [page]
+        for a in [req] + args:
+            if len(a) == 2 and a[0].isupper() and a[1].islower():
+                if a == "Op":
+                    out.append("[")
+                    opt += 1
+                flag = a == "Fl"
+                continue
+            out.append(("-" + a) if flag else a)
+        out.extend("]" * opt)
+        text = " ".join(out).replace("[ ", "[").replace(" ]", "]")
+        return _troff_text(text)
+    return ""
+
+def parse_man_page(path):
+    """
+    Bir man sayfasının NAME ve SYNOPSIS bölümlerinden arama girişleri üretir:
+    [(anahtar, {"Kullanım": ..., "Kılavuz": "man <bölüm> <ad>"})]. SYNOPSIS
+    bitince okuma durur (sayfanın geri kalanı açılmaz). .so yönlendirmeleri
+    ve ayrıştırılamayan sayfalar için boş liste.
+    """
+    base = os.path.basename(path)
+    for ext in (".gz", ".xz", ".lzma", ".bz2"):
+        if base.endswith(ext):
+            base = base[:-len(ext)]
+    page, _, sec = base.rpartition(".")
+    sections = {"NAME": [], "SYNOPSIS": []}
+    cur, nofill, cont = None, False, ""
+    try:
+        with _man_open(path) as f:
+            for line in f:
+                line = cont + line.rstrip("\n")
+                if line.endswith("\\") and not line.endswith("\\\\"):
+                    cont = line[:-1]   # satır devamı
+                    continue
+                cont = ""
+                if line.startswith(".so "):
+                    return []
+                if line.startswith((".SH", ".Sh")):
+                    title = line[3:].strip().strip('"').upper()
+                    # SYNOPSIS'ten (ya da ondan yoksun sayfada DESCRIPTION'a
+                    # gelince) sonrası okunmaz; LIBRARY gibi ara bölümler atlanır
+                    if cur == "SYNOPSIS" or title == "DESCRIPTION":
+                        break
+                    cur = title if title in sections else None
+                    continue
+                if cur is None:
+                    continue
+                if line.startswith((".nf", ".fi", ".EX", ".EE", ".Vb", ".Ve")):
+                    nofill = line[1:3] in ("nf", "EX", "Vb")
+                elif line.startswith(".Nm") and cur == "SYNOPSIS":
+                    sections[cur].append(None)   # mdoc: her kullanım biçimi Nm ile başlar
+                sections[cur].append(_troff_line(line, page))
+                if nofill and cur == "SYNOPSIS":
+                    sections[cur].append(None)   # .nf: her kaynak satırı ayrı satır
+    except (OSError, EOFError, ValueError):
+        return []
+    name = " ".join(t for t in sections["NAME"] if t).strip()
+    for sep in (" - ", " — ", " -- ", " – "):
+        names, found, desc = name.partition(sep)
+        if found:
+            break
+    if not found or not desc.strip():
+        return []
+    synopsis, words = [], []
+    for t in sections["SYNOPSIS"] + [None]:
+        if t is None:
+            line = " ".join(" ".join(words).split())
+            if line and not line.startswith("#include"):
+                synopsis.append(line)
+            words = []
+        elif t:
+            words.append(t)
+    main_name = names.split(",")[0].strip() or page
+    key = f"{names.strip()} ({sec}) - {' '.join(desc.split())}"
+    value = {"Kullanım": "\n".join(synopsis[:MAN_SYNOPSIS_LINES]) or main_name,
+             "Kılavuz": f"man {sec} {main_name}"}
+    return [(key, value)]
+
+def _man_files(roots=None):
+    # yalnız İngilizce/varsayılan bölümler (manN/); çeviriler ve sembolik bağlar (takma adlar) atlanır
+    roots = roots or (os.environ.get("MANPATH", "").split(":") if os.environ.get("MANPATH") else MAN_ROOTS)
+    for root in roots:
+        try:
+            subdirs = [e for e in os.scandir(root) if e.name.startswith("man") and e.is_dir()]
+        except OSError:
+            continue
+        for d in subdirs:
+            try:
+                entries = list(os.scandir(d.path))
+            except OSError:
+                continue
+            for e in entries:
+                if e.is_file(follow_symlinks=False):
+                    st = e.stat(follow_symlinks=False)
+                    yield e.path, st.st_mtime_ns, st.st_size
+
+def index_man_pages(cache_path=None, roots=None, full=False, workers=None, verbose=True):
+    """
+    Man sayfalarını artımlı olarak indeksler: (mtime, boyut) önbellektekiyle
+    aynı olan sayfalar yeniden ayrıştırılmaz. Değişenler süreç havuzunda
+    paralel ayrıştırılır. Önbellek yalnız bir şey değiştiyse yeniden yazılır;
+    böylece değişiklik yoksa veritabanı da yeniden derlenmez.
+    Dönüş: (sayfa sayısı, yeniden ayrıştırılan, giriş sayısı).
+    """
+    import json
+    cache_path = cache_path or default_man_cache_path()
+    t0 = time.perf_counter()
+    cache = {}
+    if not full:
+        try:
+            with open(cache_path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == 1:
+                cache = data["pages"]
+        except (OSError, ValueError, KeyError):
+            pass
+    files = list(_man_files(roots))
+    pages, todo = {}, []
+    for path, mtime, size in files:
+        old = cache.get(path)
+        if old is not None and old[0] == mtime and old[1] == size:
+            pages[path] = old
+        else:
+            todo.append((path, mtime, size))
+    changed = bool(todo) or len(pages) != len(cache)
+    if todo:
+        paths = [p for p, _, _ in todo]
+        if len(todo) >= MAN_POOL_MIN:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(workers) as pool:
+                parsed = list(pool.map(parse_man_page, paths, chunksize=32))
+        else:
+            parsed = [parse_man_page(p) for p in paths]
+        for (path, mtime, size), entries in zip(todo, parsed):
+            pages[path] = [mtime, size, entries]
+    if changed:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "pages": pages}, f, ensure_ascii=False)
+        os.replace(tmp, cache_path)
+    n_entries = sum(len(p[2]) for p in pages.values())
+    if verbose:
+        print(f"{len(files)} man sayfası, {len(todo)} yeniden ayrıştırıldı, {n_entries} giriş "
+              f"({time.perf_counter()-t0:.2f}s{'' if changed else ', değişiklik yok'})")
+    return len(files), len(todo), n_entries
+
+def load_man_entries(cache_path=None):
+    """Man önbelleğindeki girişler ({anahtar: komutlar}); önbellek yoksa boş."""
+    import json
+    try:
+        with open(cache_path or default_man_cache_path(), encoding="utf-8") as f:
+            pages = json.load(f)["pages"]
+    except (OSError, ValueError, KeyError):
+        return {}
+    out = {}
+    for path in sorted(pages):
+        for key, value in pages[path][2]:
+            out.setdefault(key, value)
+    return out
+
+def load_corpus():
+    """Veritabanına derlenen derlem: üretilmiş komutlar + (indekslendiyse) man sayfaları."""
+    commands = make_commands(DB_ENTRIES)
+    for key, value in load_man_entries().items():
+        commands.setdefault(key, value)
+    return commands
+
+MIN_SCORE = 0.20       # bu benzerliğin altındaki sonuçlar gösterilmez
+SUBSTRING_SCORE = 0.95 # sorgu anahtarın içinde geçiyorsa en az bu skor
+POOL_FACTOR = 10       # search(): kelime adaylarının toplam payı = POOL_FACTOR × limit
+POOL_MIN = 100         # küçük limitlerde (ör. istemcinin -n 1'i) pay bundan küçük olmaz
+QUOTA_MIN = 4          # benzer kelime başına en az bu kadar aday
+TOKEN_SCORE = 0.20     # sorgu kelimesine bu orandan benzer kelimeler aday getirir
+DB_ENTRIES = 1000      # derlenen veritabanındaki en az giriş sayısı (make_commands)
+DB_MAGIC = b"ARDB"
+DB_FORMAT = 3          # dosya düzeni değişince artır: eski dosyalar yeniden derlenir
+
+def score(a, b):
+    from difflib import SequenceMatcher
+    return SequenceMatcher(None, a, b).ratio()
+
+def _search_linear(commands, query, limit=10):
+    """Eski yol: her anahtarı SequenceMatcher ile puanlar (O(N·L²)); kıyas için duruyor."""
+    q = query.lower().strip()
+    # hesapla skorlar
+    scored = []
+    for k in commands.keys():
+        s = score(k.lower(), q)
+        # ayrıca içindeki kelimelere bak (substring boost)
+        if q in k.lower():
+            s = max(s, SUBSTRING_SCORE)
+        scored.append((s, k))
+    scored.sort(reverse=True, key=lambda x: x[0])
+    # filtrele: 0.2 altını at
+    filtered = [(s, k) for (s, k) in scored if s >= MIN_SCORE]
+    return filtered[:limit]
+
+def _ngrams(s, n):
+    return {s[i:i+n] for i in range(len(s) - n + 1)}
+
+_NONZERO = bytes([0] + [1] * 255)  # translate tablosu: sıfır olmayan bayt -> 1
+
+class _Mask(dict):
+    # str.translate tablosu: tabloda olmayan her harf "\0" olur
+    def __missing__(self, ch):
+        self[ch] = 0
+        return 0
+
+class _QueryMatcher:
+    """
+    SequenceMatcher(None, a, q).ratio() / quick_ratio() ile aynı sonuçları
+    veren küçük eşleyici. difflib'i (re + collections ile ~17ms) içe aktarmak
+    tek seferlik bir sorgunun geri kalanından pahalı olduğu için var; q 200
+    karakteri geçerse difflib'in autojunk kuralı devreye girer, o zaman
+    difflib kullanılır (bkz. _matcher).
+    """
+    def __init__(self, q, memo=True):
+        self.b, self.lb = q, len(q)
+        self.b2j, self.bcount = {}, {}
+        for j, ch in enumerate(q):
+            self.b2j.setdefault(ch, []).append(j)
+            self.bcount[ch] = self.bcount.get(ch, 0) + 1
+        # memo=False: her anahtar bir kez puanlanacaksa (ör. kelime sözlüğü) maske boşa iş
+        self.mask = _Mask({ord(ch): ord(ch) for ch in q}) if memo and "\0" not in q else None
+        self.masks, self.quick, self.full = {}, {}, {}
+
+    # q'da olmayan harfler hiçbir şeyle eşleşmez; ardışık olanları tek "\0"a
+    # indirmek eşleşen blokları ve sıralarını değiştirmez. Eşleşme sayıları
+    # bu maskeyle önbelleğe alınır: yalnız q'da olmayan harflerde ayrışan
+    # anahtarlar (ör. numaralı türevler) bir kez puanlanır.
+    def _masked(self, a):
+        m = self.masks.get(a)
+        if m is None:
+            if self.mask is None:
+                return a
+            m = self.masks[a] = "\0".join(filter(None, a.translate(self.mask).split("\0")))
+        return m
+
+    def quick_ratio(self, a):
+        m = self._masked(a)
+        n = self.quick.get(m)
+        if n is None:
+            n = self.quick[m] = self._quick_matches(m)
+        return 2.0 * n / (len(a) + self.lb)
+
+    def ratio(self, a):
+        m = self._masked(a)
+        n = self.full.get(m)
+        if n is None:
+            n = self.full[m] = self._matches(m)
+        return 2.0 * n / (len(a) + self.lb)
+
+    def _quick_matches(self, a):
+        avail, matches = dict(self.bcount), 0
+        for ch in a:
+            n = avail.get(ch, 0)
+            if n > 0:
+                avail[ch] = n - 1
+                matches += 1
+        return matches
+
+    def _matches(self, a):
+        # get_matching_blocks: en uzun ortak bloğu bul, iki yanında özyinele
+        b2j, matches = self.b2j, 0
+        queue = [(0, len(a), 0, self.lb)]
+        while queue:
+            alo, ahi, blo, bhi = queue.pop()
+            besti, bestj, bestsize = alo, blo, 0
+            j2len = {}
+            for i in range(alo, ahi):
+                js = b2j.get(a[i])
+                if js is None:
+                    # q'da olmayan harf (maskede "\0"): süren bloklar burada biter
+                    if j2len:
+                        j2len = {}
+                    continue
+                get, newj2len = j2len.get, {}
+                for j in js:
+                    if j < blo:
+                        continue
+                    if j >= bhi:
+                        break
+                    k = newj2len[j] = get(j - 1, 0) + 1
+                    if k > bestsize:
+                        besti, bestj, bestsize = i - k + 1, j - k + 1, k
+                j2len = newj2len
+            if bestsize:
+                matches += bestsize
+                if alo < besti and blo < bestj:
+                    queue.append((alo, besti, blo, bestj))
+                if besti + bestsize < ahi and bestj + bestsize < bhi:
+                    queue.append((besti + bestsize, ahi, bestj + bestsize, bhi))
+        return matches
+
+class _DifflibMatcher:
+    def __init__(self, q):
+        from difflib import SequenceMatcher
+        self.sm = SequenceMatcher(None)
+        self.sm.set_seq2(q)  # q'nun eşleme tablosu bir kez kurulur
+
+    def quick_ratio(self, a):
+        self.sm.set_seq1(a)
+        return self.sm.quick_ratio()
+
+    def ratio(self, a):
+        self.sm.set_seq1(a)
+        return self.sm.ratio()
+
+def _matcher(q, memo=True):
+    return _QueryMatcher(q, memo) if len(q) < 200 else _DifflibMatcher(q)
+
+class CommandIndex:
+    """
+    Anahtarlar üzerinde bigram ve kelime ters indeksi.
+
+    Anahtarlar (uzunluk, anahtar) sırasıyla numaralanır; posting'ler bu
+    numaralarla tutulur. Sık geçen bigramların posting'leri bit kümesi
+    (Python int), seyrekler sıralı numara dizisi olarak saklanır; bigramlar
+    q'yu içeren anahtarları bulmak için kullanılır.
+
+    Bir anahtarın son kelimesi atılınca kalan da bir anahtarsa ("servis
+    ayarla 229" -> "servis ayarla") ona alt anahtar denir; alt anahtar
+    kelime posting'lerine yalnız ebeveyninde olmayan kelimesiyle girer.
+    Böylece aynı kelimeyi taşıyan yüzlerce numaralı türev kelime havuzunu
+    doldurmaz: sorgu kelimelerine benzeyen kelimelerden uzunluğu |q|'ya en
+    yakın anahtarlar aday olur, en iyi sonuçların alt anahtarları ikinci
+    turda eklenir. Adaylar eskisiyle aynı SequenceMatcher oranı + substring
+    boost ile puanlanır, ilk `limit` sonuç bir heap ile seçilir.
+
+    Sözlük gibi de kullanılır: index[anahtar] -> {platform: komut}.
+    """
+    MAX_TOKENS = 16  # aday getiren en fazla benzer kelime (en benzerler)
+
+    def __init__(self, commands):
+        from array import array
+        keys = sorted(commands, key=lambda k: (len(k), k))
+        self.commands = commands
+        self.keys = keys
+        self.lower = [k.lower() for k in keys]
+        grams, tokens, first, children = {}, {}, {}, {}
+        for i, k in enumerate(self.lower):
+            for g in _ngrams(k, 2):
+                grams.setdefault(g, []).append(i)
+            # ebeveyn daha kısadır, numarası zaten verilmiştir
+            head, _, tail = k.rpartition(" ")
+            parent = first.get(head)
+            first.setdefault(k, i)
+            if parent is None:
+                words = set(k.split())
+            else:
+                children.setdefault(parent, []).append(i)
+                words = {tail}
+            for t in words:
+                tokens.setdefault(t, []).append(i)
+        self.nbytes = (len(keys) + 31) // 32 * 4  # 4 bayta hizalı: dosyada da aynen saklanır
+        dense = max(64, len(keys) // 512)
+        self.df = {g: len(ids) for g, ids in grams.items()}
+        self.postings = {g: (self._to_bits(ids) if len(ids) >= dense else array("I", ids))
+                         for g, ids in grams.items()}
+        self.tokens = sorted(tokens)
+        self.token_postings = [array("I", tokens[t]) for t in self.tokens]
+        # kelime sözlüğünün harf ve bigram indeksi: sorgu kelimesine benzeyen kelimeler için
+        token_grams = {}
+        for n, t in enumerate(self.tokens):
+            for g in set(t) | _ngrams(t, 2):
+                token_grams.setdefault(g, []).append(n)
+        self.token_grams = {g: array("I", ns) for g, ns in token_grams.items()}
+        # alt anahtarlar: i'ninkiler child_ids[child_off[i]:child_off[i+1]], kısadan uzuna
+        self.child_off, self.child_ids = array("I", [0]), array("I")
+        for i in range(len(keys)):
+            self.child_ids.extend(children.get(i, ()))
+            self.child_off.append(len(self.child_ids))
+        self._order = _KeyOrder(keys)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __iter__(self):
+        return iter(self.keys)
+
+    def __getitem__(self, key):
+        return self.commands[key]
+
+    def _key(self, i):
+        return self.keys[i]
+
+    def _lower(self, i):
+        return self.lower[i]
+
+    def _df(self, g):
+        return self.df.get(g, 0)
+
+    def _bits(self, g):
+        p = self.postings[g]
+        return p if isinstance(p, int) else self._to_bits(p)
+
+    def _token(self, n):
+        return self.tokens[n]
+
+    def _token_postings(self, n):
+        return self.token_postings[n]
+
+    def _token_grams(self, g):
+        return self.token_grams.get(g, ())
+
+    def _children(self, i, n):
+        lo = self.child_off[i]
+        return self.child_ids[lo:min(self.child_off[i+1], lo + n)]
+
+    def _to_bits(self, ids):
+        buf = bytearray(self.nbytes)
+        for i in ids:
+            buf[i >> 3] |= 1 << (i & 7)
+        return int.from_bytes(buf, "little")
+
+    def _first_ids(self, bits, n):
+        # bit kümesindeki en küçük n numara (= en kısa anahtarlar)
+        out = []
+        data = bits.to_bytes(self.nbytes, "little")
+        flags = data.translate(_NONZERO)
+        pos = flags.find(1)
+        while pos >= 0:
+            b, base = data[pos], pos * 8
+            while b:
+                low = b & -b
+                out.append(base + low.bit_length() - 1)
+                if len(out) == n:
+                    return out
+                b ^= low
+            pos = flags.find(1, pos + 1)
+        return out
+
+    def candidates(self, q, want):
+        """
+        Sorgu kelimelerine en çok benzeyen MAX_TOKENS kelimeyi içeren anahtar
+        numaraları: her kelimenin posting'inden uzunluğu |q|'ya en yakın eşit
+        pay (toplam yaklaşık `want`, kelime başına en az QUOTA_MIN).
+        """
+        best = {}
+        for qt in set(q.split()):
+            for r, n in self._related_tokens(qt):
+                if r > best.get(n, 0.0):
+                    best[n] = r
+        related = heapq.nlargest(self.MAX_TOKENS, best, key=best.__getitem__)
+        if not related:
+            return []
+        lq = len(q)
+        pos = bisect_left(self._order, (lq,))
+        quota = max(want // len(related), QUOTA_MIN)
+        out = set()
+        for n in related:
+            out.update(self._nearest(self._token_postings(n), pos, lq, quota))
+        return list(out)
+
+    def _related_tokens(self, qt):
+        # qt ile en az bir bigramı (kısa kelimede harfi) ortak, oranı TOKEN_SCORE'u
+        # geçen kelimeler: (oran, kelime numarası)
+        lq = len(qt)
+        seen = set()
+        for g in (_ngrams(qt, 2) if lq > 3 else set(qt)):
+            seen.update(self._token_grams(g))
+        sm, out = _matcher(qt, memo=False), []
+        for n in seen:
+            t = self._token(n)
+            lt = len(t)
+            if 2.0 * min(lt, lq) / (lt + lq) >= TOKEN_SCORE:
+                r = sm.quick_ratio(t)
+                if r >= TOKEN_SCORE:
+                    out.append((r, n))
+        return out
+
+    def _nearest(self, ids, pos, lq, n):
+        """
+        Sıralı `ids` dizisinden ratio üst sınırı 2·min(|k|, |q|) / (|k| + |q|)
+        en yüksek n numara: pos'tan (|q| uzunluğundaki ilk numara) iki yöne
+        yürünür; sınır MIN_SCORE'un altına düşünce durulur.
+        """
+        out = []
+        hi = bisect_left(ids, pos)
+        lo = hi - 1
+        # pos'tan öncekiler |q|'dan kısa: sınır 2|k|/(|k|+|q|); sonrakiler 2|q|/(|k|+|q|)
+        lo_len = len(self._key(ids[lo])) if lo >= 0 else 0
+        hi_len = len(self._key(ids[hi])) if hi < len(ids) else -1
+        while len(out) < n:
+            lo_b = 2.0 * lo_len / (lo_len + lq)
+            hi_b = 2.0 * lq / (hi_len + lq) if hi_len >= 0 else 0.0
+            if max(lo_b, hi_b) < MIN_SCORE:
+                break
+            if hi_b >= lo_b:
+                out.append(ids[hi])
+                hi += 1
+                hi_len = len(self._key(ids[hi])) if hi < len(ids) else -1
+            else:
+                out.append(ids[lo])
+                lo -= 1
+                lo_len = len(self._key(ids[lo])) if lo >= 0 else 0
+        return out
+
+    def search(self, query, limit=10, pool=None, scored=None):
+        """
+        En iyi `limit` (skor, anahtar). `pool` kelime adaylarının toplam
+        payıdır; `scored` için bkz. rank.
+        """
+        q = query.lower().strip()
+        if not q:
+            return []
+        lq = len(q)
+        hits = self._containing(q, limit)
+        if len(hits) == limit and 2.0 * lq / (2 * lq + 1) < SUBSTRING_SCORE:
+            # q'yu içermeyen bir anahtar en fazla 2|q|/(2|q|+1) alır; bu
+            # SUBSTRING_SCORE'un altındaysa q'yu içeren ilk `limit` anahtar kesin sonuçtur
+            return self.rank(q, hits, limit, scored)
+        sm = _matcher(q)
+        ids = set(hits)
+        ids.update(self.candidates(q, pool or max(POOL_MIN, POOL_FACTOR * limit)))
+        top = self._rank(q, ids, limit, scored, sm)
+        more = {c for _, i, _ in top for c in self._children(-i, limit)} - ids
+        if more:
+            top = sorted(top + self._rank(q, more, limit, scored, sm), reverse=True)[:limit]
+        return [(s, k) for s, _, k in top]
+
+    def _containing(self, q, limit, start=0):
+        """q'yu içeren ilk `limit` anahtar numarası (start'tan itibaren, artan sırada)."""
+        out = []
+        if len(q) == 1:
+            ids = range(start, len(self))
+        else:
+            bits = -1
+            for g in _ngrams(q, 2):
+                if not self._df(g):
+                    return out
+                bits &= self._bits(g)
+            bits &= -1 << start
+            ids = self._first_ids(bits, 8 * limit)
+        for i in ids:
+            if q in self._lower(i):
+                out.append(i)
+                if len(out) == limit:
+                    break
+        return out
+
+    def rank(self, q, ids, limit=10, scored=None):
+        """
+        `ids` adaylarını küçük harfli `q` sorgusuna göre puanlar; en iyi `limit`
+        (skor, anahtar). `scored` listesi verilirse tam puanlanan her aday
+        (skor, numara) olarak eklenir (LiveSearch havuzu daraltmak için kullanır).
+        """
+        return [(s, k) for s, _, k in self._rank(q, ids, limit, scored)]
+
+    def _rank(self, q, ids, limit, scored=None, sm=None):
+        # (skor, -numara, anahtar) listesi, en iyiden kötüye
+        heap = []       # (skor, -numara, anahtar) min-heap'i; en iyi `limit` sonuç
+        lq = len(q)
+        # her aday için skorun üst sınırı: substring ise kesin skor, değilse
+        # real_quick_ratio (2·min/toplam) ve MIN_SCORE'u geçenlerde
+        # quick_ratio; en umut verenden başlanır, sınır heap'in en kötüsünün
+        # altına düşünce kalanlar puanlanmaz
+        bounded = []
+        for i in ids:
+            k = self._lower(i)
+            lk = len(k)
+            if q in k:
+                # q tek blok olarak eşleşir: ratio = 2·|q| / (|k| + |q|), SequenceMatcher gerekmez
+                bounded.append((max(2.0 * lq / (lk + lq), SUBSTRING_SCORE), True, i, k))
+                continue
+            bound = 2.0 * min(lk, lq) / (lk + lq)
+            if bound >= MIN_SCORE:
+                if sm is None:
+                    sm = _matcher(q)  # eşleyici yalnız substring olmayan aday çıkınca kurulur
+                bound = sm.quick_ratio(k)
+            bounded.append((bound, False, i, k))
+        bounded.sort(key=lambda b: (-b[0], b[2]))  # eşit sınırda küçük numara (kısa anahtar) önce
+        # scored: puanlanmayan adaylar için bilinen en iyi üst sınır
+        note = scored.append if scored is not None else (lambda item: None)
+        for n, (bound, exact, i, k) in enumerate(bounded):
+            full = len(heap) == limit
+            floor = heap[0][0] if full else MIN_SCORE
+            # heap doluyken eşit skor da içeri giremez (eşitlikte önce gelen kalır)
+            if bound < floor or (full and bound == floor):
+                if scored is not None:
+                    scored.extend((b, i) for b, _, i, _ in bounded[n:])
+                break
+            s = bound if exact else sm.ratio(k)
+            note((s, i))
+            if s < MIN_SCORE:
+                continue
+            item = (s, -i, self._key(i))
+            if len(heap) < limit:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+        return sorted(heap, reverse=True)
+
+    def save(self, path, stamp):
+        """
+        İndeksi ve komutları tek bir ikili dosyaya yazar (CommandDB ile mmap'lenir).
+        Düzen: başlık + bölüm tablosu + bölümler; tüm sayılar little-endian,
+        numara dizileri uint32, bit kümeleri nbytes uzunluğunda.
+        """
+        postings = bytearray()
+
+        def put(blob):
+            off = len(postings)
+            postings.extend(blob)
+            return off
+
+        gram_keys = sorted(self.postings)
+        gram_meta = bytearray()
+        for g in gram_keys:
+            p = self.postings[g]
+            if isinstance(p, int):
+                gram_meta += _DB_META.pack(self.df[g], 1, put(p.to_bytes(self.nbytes, "little")))
+            else:
+                gram_meta += _DB_META.pack(self.df[g], 0, put(_u32(p)))
+        tok_meta = bytearray()
+        for p in self.token_postings:
+            tok_meta += _DB_META.pack(len(p), 0, put(_u32(p)))
+        tgram_keys = sorted(self.token_grams)
+        tgram_meta = bytearray()
+        for g in tgram_keys:
+            p = self.token_grams[g]
+            tgram_meta += _DB_META.pack(len(p), 0, put(_u32(p)))
+        values = ["\x1e".join(f"{plat}\x1f{cmd}" for plat, cmd in self.commands[k].items())
+                  for k in self.keys]
+        sections = [*_pack_strings(self.keys), *_pack_strings(values),
+                    *_pack_strings(gram_keys), bytes(gram_meta),
+                    *_pack_strings(self.tokens), bytes(tok_meta),
+                    *_pack_strings(tgram_keys), bytes(tgram_meta),
+                    _u32(self.child_off), _u32(self.child_ids), bytes(postings)]
+        head = _DB_HEADER.size + len(sections) * _DB_SECTION.size
+        table, off = bytearray(), head
+        for s in sections:
+            off = (off + 7) & ~7  # bölümler 8 bayta hizalı
+            table += _DB_SECTION.pack(off, len(s))
+            off += len(s)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(_DB_HEADER.pack(DB_MAGIC, DB_FORMAT, len(self.keys), len(sections), stamp))
+            f.write(table)
+            for s in sections:
+                f.write(b"\0" * (-f.tell() % 8))
+                f.write(s)
+        os.replace(tmp, path)  # okuyan başka bir süreç yarım dosya görmesin
+
+_DB_HEADER = struct.Struct("<4sIII128s")  # magic, format, anahtar sayısı, bölüm sayısı, kaynak damgası
+_DB_SECTION = struct.Struct("<QQ")       # bölüm: dosya ofseti, uzunluk
+_DB_META = struct.Struct("<IIQ")         # posting: eleman sayısı, tür (0 dizi / 1 bit kümesi), ofset
+
+def _u32(ids):
+    from array import array
+    a = array("I", ids)
+    if sys.byteorder != "little":
+        a.byteswap()
+    return a.tobytes()
+
+def _pack_strings(strs):
+    # dize tablosu: (n+1) uint32 bayt ofseti + UTF-8 blob
+    blobs = [s.encode("utf-8") for s in strs]
+    offs, o = [0], 0
+    for b in blobs:
+        o += len(b)
+        offs.append(o)
+    return _u32(offs), b"".join(blobs)
+
+class _StrTable:
+    """mmap'teki dize tablosu üzerinde salt okunur dizi (bisect ile aranabilir)."""
+    __slots__ = ("off", "blob")
+
+    def __init__(self, off, blob):
+        self.off = off.cast("I")
+        self.blob = blob
+
+    def __len__(self):
+        return len(self.off) - 1
+
+    def __getitem__(self, i):
+        return str(self.blob[self.off[i]:self.off[i+1]], "utf-8")
+
+class _KeyOrder:
+    # anahtar numaraları (uzunluk, anahtar) sırasında: anahtardan numaraya bisect
+    __slots__ = ("keys",)
+
+    def __init__(self, keys):
+        self.keys = keys
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __getitem__(self, i):
+        k = self.keys[i]
+        return len(k), k
+
+class CommandDB(CommandIndex):
+    """
+    CommandIndex.save ile yazılmış dosyanın mmap'lenmiş hali. Açılışta yalnız
+    başlık okunur; dizeler, posting'ler ve komutlar sorgunun dokunduğu kadar
+    sayfadan çözülür. Arama mantığı CommandIndex ile aynıdır.
+    """
+    def __init__(self, path):
+        import mmap
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        mv = memoryview(self._mm)
+        try:
+            magic, fmt, nkeys, nsec, stamp = _DB_HEADER.unpack_from(mv)
+            if magic != DB_MAGIC or fmt != DB_FORMAT or nsec != 16:
+                raise ValueError(f"{path}: tanınmayan veritabanı biçimi")
+        except (struct.error, ValueError):
+            mv.release()
+            self._mm.close()
+            raise
+        self.stamp = stamp.rstrip(b"\0")
+        sec = [mv[o:o+n] for o, n in _DB_SECTION.iter_unpack(mv[_DB_HEADER.size:_DB_HEADER.size + nsec * 16])]
+        self._mv = mv
+        self.keys = _StrTable(sec[0], sec[1])
+        self._values = _StrTable(sec[2], sec[3])
+        self._grams = _StrTable(sec[4], sec[5])
+        self._gram_meta = sec[6]
+        self.tokens = _StrTable(sec[7], sec[8])
+        self._tok_meta = sec[9]
+        self._tgrams = _StrTable(sec[10], sec[11])
+        self._tgram_meta = sec[12]
+        self.child_off = sec[13].cast("I")
+        self.child_ids = sec[14].cast("I")
+        self._postings = sec[15]
+        self.nbytes = (nkeys + 31) // 32 * 4
+        self._order = _KeyOrder(self.keys)
+
+    def close(self):
+        for name in ("keys", "_values", "_grams", "tokens", "_tgrams", "_order"):
+            self.__dict__.pop(name, None)
+        self._gram_meta = self._tok_meta = self._tgram_meta = self._postings = None
+        self.child_off = self.child_ids = None
+        self._mv.release()
+        self._mm.close()
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __iter__(self):
+        return (self.keys[i] for i in range(len(self.keys)))
+
+    def __getitem__(self, key):
+        i = bisect_left(self._order, (len(key), key))
+        if i == len(self.keys) or self.keys[i] != key:
+            raise KeyError(key)
+        out = {}
+        for item in self._values[i].split("\x1e"):
+            plat, _, cmd = item.partition("\x1f")
+            out[plat] = cmd
+        return out
+
+    def _key(self, i):
+        return self.keys[i]
+
+    def _lower(self, i):
+        return self.keys[i].lower()
+
+    def _meta(self, g):
+        i = bisect_left(self._grams, g)
+        if i < len(self._grams) and self._grams[i] == g:
+            return _DB_META.unpack_from(self._gram_meta, i * _DB_META.size)
+        return None
+
+    def _df(self, g):
+        m = self._meta(g)
+        return m[0] if m else 0
+
+    def _ids(self, n, off):
+        return self._postings[off:off + 4 * n].cast("I")
+
+    def _bits(self, g):
+        n, kind, off = self._meta(g)
+        if kind == 1:
+            return int.from_bytes(self._postings[off:off + self.nbytes], "little")
+        return self._to_bits(self._ids(n, off))
+
+    def _token_postings(self, n):
+        count, _, off = _DB_META.unpack_from(self._tok_meta, n * _DB_META.size)
+        return self._ids(count, off)
+
+    def _token_grams(self, g):
+        i = bisect_left(self._tgrams, g)
+        if i < len(self._tgrams) and self._tgrams[i] == g:
+            count, _, off = _DB_META.unpack_from(self._tgram_meta, i * _DB_META.size)
+            return self._ids(count, off)
+        return ()
+
+def default_db_path():
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "arat", "commands.db")
+
+def _source_stamp():
+    # derlenmiş veri bu dosyadaki make_commands'tan ve man önbelleğinden gelir:
+    # ikisinden biri değişirse yeniden derle (man sayfalarının kendisi burada
+    # taranmaz; onları index_man_pages önbelleğe yansıtır)
+    st = os.stat(os.path.abspath(__file__))
+    try:
+        man = os.stat(default_man_cache_path())
+        man_stamp = f"{man.st_mtime_ns}:{man.st_size}"
+    except OSError:
+        man_stamp = "-"
+    return f"{DB_FORMAT}:{sys.byteorder}:{DB_ENTRIES}:{st.st_mtime_ns}:{st.st_size}:{man_stamp}".encode()
+
+def open_db(path=None, rebuild=False):
+    """
+    Derlenmiş komut veritabanını mmap ile açar; yoksa, biçimi eskiyse ya da
+    kaynak değiştiyse önce yeniden derler. Yazılamıyorsa bellekteki indeksi döndürür.
+    """
+    path = path or default_db_path()
+    stamp = _source_stamp()
+    if not rebuild:
+        try:
+            db = CommandDB(path)
+            if db.stamp == stamp:
+                return db
+            db.close()
+        except (OSError, ValueError):
+            pass
+    index = CommandIndex(load_corpus())
+    try:
+        index.save(path, stamp)
+        return CommandDB(path)
+    except OSError:
+        return index
+
+def search_commands(commands, query, limit=10, index=None):
+    """Query'ye göre benzerlik skoruna göre sıralanmış sonuç döndürür (index varsa indeksle)."""
+    if index is None:
+        return _search_linear(commands, query, limit)
+    return index.search(query, limit)
+
+def bench(n=100000, queries=("paket yükle", "servis yeniden başlat", "docker konteyner",
+                             "disk boşluğu", "log göster", "ssh", "firewall ayarla", "yedek al",
+                             "dosya kopyala", "ls", "cp", "git")):
+    """
+    Eski (doğrusal) ve indeksli aramayı n girişlik sözlükte karşılaştırır;
+    _search_linear referans alınır, sonucu farklı olan sorgular listelenir.
+    """
+    commands = make_commands(n)
+    t0 = time.perf_counter()
+    index = CommandIndex(commands)
+    print(f"{len(commands)} giriş, indeks kurulumu {time.perf_counter()-t0:.2f}s")
+    same = total = 0
+    differ = []
+    for q in queries:
+        t0 = time.perf_counter()
+        old = _search_linear(commands, q, 10)
+        t_old = time.perf_counter() - t0
+        t_new = min(_timed(index.search, q, 10) for _ in range(5))
+        new = index.search(q, 10)
+        # eşit skorlu anahtarların sırası farklı olabilir; skor dizileri karşılaştırılır
+        match = sum(abs(a[0] - b[0]) < 1e-9 for a, b in zip(old, new))
+        same += match
+        total += len(old)
+        if match != len(old) or len(new) != len(old):
+            differ.append(q)
+        print(f"  {q!r:26} doğrusal {t_old*1000:8.1f}ms  indeks {t_new*1000:6.3f}ms  "
+              f"ilk-10 skor eşleşmesi {match}/{len(old)} (indeks {len(new)} sonuç)")
+    print(f"toplam: {same}/{total} sıra aynı skoru taşıyor")
+    if differ:
+        print(f"doğrusal aramadan farklı: {', '.join(map(repr, differ))}")
+
+def _timed(fn, *args):
+    t0 = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - t0
+
+# ------------------ Sorgu sunucusu (--serve) ------------------
+def _private_socket_dir():
+    # XDG_RUNTIME_DIR yoksa: /tmp'de yalnız sahibine açık (0700) dizin; soket
+    # adı herkesin yazabildiği /tmp'de başka bir kullanıcı tarafından kapılamasın
+    return os.path.join("/tmp", f"arat-{os.getuid()}")
+
+def default_socket_path():
+    if os.environ.get("ARAT_SOCKET"):
+        return os.environ["ARAT_SOCKET"]
+    base = os.environ.get("XDG_RUNTIME_DIR")
+    if base:
+        return os.path.join(base, f"arat-{os.getuid()}.sock")
+    return os.path.join(_private_socket_dir(), "arat.sock")
+
+def _prepare_socket(sock_path):
+    """
+    Sunucu soketinin yerini hazırlar: özel dizini (gerekirse) 0700 kurar ve
+    sahibini/izinlerini doğrular, önceki sunucudan kalan soketi siler. Başka
+    kullanıcıya ait dizin/dosyaya ve canlı bir sunucunun soketine dokunmaz;
+    sorun varsa açıklamalı SystemExit.
+    """
+    import socket
+    import stat
+    uid = os.getuid()
+    d = os.path.dirname(sock_path)
+    if d == _private_socket_dir():
+        try:
+            os.mkdir(d, 0o700)
+        except FileExistsError:
+            pass
+        except OSError as e:
+            raise SystemExit(f"{d} oluşturulamadı: {e}")
+        st = os.lstat(d)
+        if not stat.S_ISDIR(st.st_mode) or st.st_uid != uid or st.st_mode & 0o077:
+            raise SystemExit(f"{d} bu kullanıcıya ait 0700 bir dizin değil; kullanılmıyor")
+    try:
+        st = os.lstat(sock_path)
+    except FileNotFoundError:
+        return
+    if st.st_uid != uid:
+        raise SystemExit(f"{sock_path} başka bir kullanıcıya ait (uid {st.st_uid}); silinmedi")
+    if not stat.S_ISSOCK(st.st_mode):
+        raise SystemExit(f"{sock_path} bir soket değil; silinmedi")
+    # önceki sunucudan kalan soket dosyası: canlı biri dinliyorsa dokunma
+    probe = socket.socket(socket.AF_UNIX)
+    try:
+        probe.connect(sock_path)
+    except OSError:
+        pass
+    else:
+        raise SystemExit(f"{sock_path} zaten kullanımda")
+    finally:
+        probe.close()
+    try:
+        os.unlink(sock_path)
+    except OSError as e:
+        raise SystemExit(f"{sock_path} silinemedi: {e}")
+
+def _answer(db, req):
+    # tek bir NDJSON isteğini yanıtlar (olay döngüsünde, senkron: arama < 1ms)
+    q = req.get("q")
+    if not isinstance(q, str):
+        return {"error": "'q' (metin) gerekli"}
+    limit = req.get("limit", 10)
+    if not isinstance(limit, int) or not 0 < limit <= 100:
+        return {"error": "'limit' 1..100 arası tamsayı olmalı"}
+    return {"results": [{"key": k, "score": round(s, 4), "commands": db[k]}
+                        for s, k in db.search(q, limit)]}
+
+def _reload_corpus(db_path=None, force=False):
+    # man sayfaları indekslenmişse önce artımlı yeniden indeksle (değişiklik yoksa anında)
+    if os.path.exists(default_man_cache_path()):
+        index_man_pages(verbose=False)
+    return open_db(db_path, force)
+
+def serve(sock_path=None, db_path=None):
+    """
+    Veritabanını bellekte tutup Unix soketinde satır başına bir JSON sorgusu
+    yanıtlar. İstek: {"q": "...", "limit": 10, "id": ...}; yanıt
+    {"results": [{"key", "score", "commands"}], "id": ...}. {"op": "ping"}
+    ve {"op": "reload", "force": false} de desteklenir; SIGHUP da reload
+    yapar. Reload (man sayfaları indekslendiyse onları da artımlı günceller)
+    yeni veritabanını arka planda açar/derler ve hazır olunca
+    değiştirir: açık bağlantılar kopmaz, bu sırada gelen sorgular eskisinden
+    yanıtlanır.
+    """
+    import asyncio
+    import json
+    import signal
+
+    sock_path = sock_path or default_socket_path()
+    _prepare_socket(sock_path)
+    state = {"db": open_db(db_path), "reloading": None, "bound": False}
+
+    async def reload(force=False):
+        if state["reloading"] is None:
+            async def run():
+                loop = asyncio.get_running_loop()
+                try:
+                    new = await loop.run_in_executor(None, _reload_corpus, db_path, force)
+                    old, state["db"] = state["db"], new
+                    if old is not new and isinstance(old, CommandDB):
+                        old.close()
+                    print(f"[arat] yeniden yüklendi: {len(new)} giriş", flush=True)
+                finally:
+                    state["reloading"] = None
+            state["reloading"] = asyncio.ensure_future(run())
+        await asyncio.shield(state["reloading"])
+        return {"ok": True, "entries": len(state["db"])}
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    req = json.loads(line)
+                    if not isinstance(req, dict):
+                        raise ValueError("istek bir JSON nesnesi olmalı")
+                except ValueError as e:
+                    resp = {"error": f"geçersiz istek: {e}"}
+                else:
+                    op = req.get("op", "search")
+                    if op == "search":
+                        resp = _answer(state["db"], req)
+                    elif op == "ping":
+                        resp = {"ok": True, "entries": len(state["db"])}
+                    elif op == "reload":
+                        resp = await reload(bool(req.get("force")))
+                    else:
+                        resp = {"error": f"bilinmeyen op: {op}"}
+                    if "id" in req:
+                        resp["id"] = req["id"]
+                writer.write(json.dumps(resp, ensure_ascii=False).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def main():
+        old_umask = os.umask(0o177)  # soket yalnız sahibine açık
+        try:
+            server = await asyncio.start_unix_server(handle, path=sock_path, limit=1 << 16)
+        finally:
+            os.umask(old_umask)
+        state["bound"] = True
+        loop = asyncio.get_running_loop()
+        loop.add_signal_handler(signal.SIGHUP, lambda: asyncio.ensure_future(reload()))
+        stop = asyncio.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+        print(f"[arat] {sock_path} dinleniyor ({len(state['db'])} giriş)", flush=True)
+        async with server:
+            await stop.wait()
+
+    try:
+        asyncio.run(main())
+    finally:
+        if state["bound"]:  # yalnız kendi açtığımız soketi sil
+            try:
+                os.unlink(sock_path)
+            except OSError:
+                pass
+
+def bench_serve(clients=32, queries=200, sock_path=None):
+    """
+    Sunucuyu ayrı süreçte başlatır; `clients` eşzamanlı kalıcı bağlantı ve
+    sorgu başına yeni bağlantı (arat_client.py gibi) ile gidiş-dönüş
+    sürelerini ölçer. Ölçüm sırasında bir reload da tetiklenir.
+    """
+    import json
+    import socket
+    import statistics
+    import subprocess
+    import threading
+
+    sock_path = sock_path or f"/tmp/arat-bench-{os.getpid()}.sock"
+    proc = subprocess.Popen([sys.executable, ENTRY, "--serve", sock_path], stdout=subprocess.DEVNULL)
+    try:
+        for _ in range(500):
+            if os.path.exists(sock_path):
+                break
+            time.sleep(0.01)
+        words = ["servis başlat", "disk", "paket yükle", "docker", "log göster", "ssh", "yedek"]
+        lat, errors = [], []
+
+        def rpc(f, s, req):
+            s.sendall(json.dumps(req).encode() + b"\n")
+            resp = json.loads(f.readline())
+            if "error" in resp:
+                errors.append(resp["error"])
+            return resp
+
+        def persistent(n):
+            with socket.socket(socket.AF_UNIX) as s:
+                s.connect(sock_path)
+                f = s.makefile("rb")
+                for i in range(queries):
+                    t0 = time.perf_counter()
+                    rpc(f, s, {"q": words[(n + i) % len(words)], "limit": 10})
+                    lat.append(time.perf_counter() - t0)
+
+        threads = [threading.Thread(target=persistent, args=(n,)) for n in range(clients)]
+        t0 = time.perf_counter()
+        for t in threads:
+            t.start()
+        with socket.socket(socket.AF_UNIX) as s:  # ölçüm sürerken yeniden yükle
+            s.connect(sock_path)
+            reloaded = rpc(s.makefile("rb"), s, {"op": "reload", "force": True})
+        for t in threads:
+            t.join()
+        wall = time.perf_counter() - t0
+        lat.sort()
+        print(f"{clients} istemci x {queries} sorgu (kalıcı bağlantı): {len(lat)/wall:.0f} sorgu/s, "
+              f"p50 {lat[len(lat)//2]*1000:.2f}ms  p99 {lat[int(len(lat)*.99)]*1000:.2f}ms  "
+              f"hata {len(errors)}  reload {reloaded}")
+        one = []
+        for i in range(200):
+            t0 = time.perf_counter()
+            with socket.socket(socket.AF_UNIX) as s:
+                s.connect(sock_path)
+                rpc(s.makefile("rb"), s, {"q": words[i % len(words)], "limit": 10})
+            one.append(time.perf_counter() - t0)
+        print(f"sorgu başına yeni bağlantı: medyan {statistics.median(one)*1000:.2f}ms  "
+              f"en kötü {max(one)*1000:.2f}ms")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+# ------------------ Toplu sorgu (--batch) ------------------
+BATCH_CHUNK = 32         # işçiye tek seferde gönderilen sorgu sayısı
+BATCH_WINDOW = 4         # işçi başına en fazla bekleyen parça (girdi akış olarak okunur)
+
+_batch_db = None         # işçi süreçlerindeki veritabanı (fork ile üst süreçten gelir)
+
+def _batch_init(db_path, no_db):
+    # fork ile başlayan işçi üst sürecin mmap'ini devralır; spawn/forkserver'da
+    # her işçi aynı veritabanı dosyasını mmap'ler (sayfalar çekirdekte paylaşılır)
+    global _batch_db
+    if _batch_db is None:
+        _batch_db = CommandIndex(make_commands(DB_ENTRIES)) if no_db else open_db(db_path)
+
+def _batch_lines(db, queries, limit):
+    import json
+    out = []
+    for q in queries:
+        res = db.search(q, limit) if q.strip() else []
+        out.append(json.dumps({"q": q, "results": [{"key": k, "score": round(s, 4), "commands": db[k]}
+                                                  for s, k in res]}, ensure_ascii=False) + "\n")
+    return "".join(out)
+
+def _batch_chunk(queries, limit):
+    return _batch_lines(_batch_db, queries, limit)
+
+def _read_chunks(src, size, idle=None):
+    """
+    `src` satırlarını `size`lık parçalar halinde verir. Dosya tanımlayıcısı
+    olan girdide (boru, terminal, dosya) okunan blok bitip yeni veri hemen
+    hazır değilse yarım parça da verilir ve okuma bloklanmadan önce idle()
+    çağrılır: yavaş akan girdide sonuçlar satır geldikçe çıkar.
+    """
+    try:
+        fd = src.fileno()
+    except (AttributeError, OSError):
+        fd = None
+    chunk = []
+    if fd is None:
+        for line in src:
+            chunk.append(line.rstrip("\r\n"))
+            if len(chunk) == size:
+                yield chunk
+                chunk = []
+    else:
+        import select
+        rest = b""
+        while True:
+            if not select.select([fd], [], [], 0)[0]:
+                if chunk:
+                    yield chunk
+                    chunk = []
+                if idle is not None:
+                    idle()
+            data = os.read(fd, 1 << 16)
+            if not data:
+                break
+            lines = (rest + data).split(b"\n")
+            rest = lines.pop()
+            for line in lines:
+                chunk.append(line.decode("utf-8", "replace").rstrip("\r"))
+                if len(chunk) == size:
+                    yield chunk
+                    chunk = []
+        if rest:
+            chunk.append(rest.decode("utf-8", "replace").rstrip("\r"))
+    if chunk:
+        yield chunk
+
+def batch(src, out, db, limit=5, workers=None, db_path=None, no_db=False, verbose=True):
+    """
+    `src` içindeki her satırı bir sorgu olarak arar ve `out`a girdi sırasıyla
+    satır başına bir JSON yazar: {"q": ..., "results": [{"key", "score",
+    "commands"}]} (boş satır -> boş sonuç, böylece çıktı satırı n girdi satırı
+    n'ye karşılık gelir). Sorgular BATCH_CHUNK'lık parçalar halinde süreç
+    havuzuna dağıtılır; JSON kodlama da işçilerde yapılır. Girdi akış olarak
+    okunur: en fazla workers·BATCH_WINDOW parça bekler, sonuçlar hazır oldukça
+    sırayla yazılır; girdi beklenirken bekleyen her şey yazılıp flush edilir.
+    Süre ve sorgu/s stderr'e yazılır.
+    """
+    global _batch_db
+    workers = workers or len(os.sched_getaffinity(0))
+    t0 = time.perf_counter()
+    n = 0
+    if workers == 1:
+        for chunk in _read_chunks(src, BATCH_CHUNK, out.flush):
+            out.write(_batch_lines(db, chunk, limit))
+            n += len(chunk)
+    else:
+        from collections import deque
+        from concurrent.futures import ProcessPoolExecutor
+        _batch_db = db
+        try:
+            with ProcessPoolExecutor(workers, initializer=_batch_init, initargs=(db_path, no_db)) as pool:
+                window = deque()
+
+                def drain():
+                    # girdi bekleyecek: bekleyen sonuçları sırayla yaz
+                    while window:
+                        out.write(window.popleft().result())
+                    out.flush()
+
+                for chunk in _read_chunks(src, BATCH_CHUNK, drain):
+                    window.append(pool.submit(_batch_chunk, chunk, limit))
+                    n += len(chunk)
+                    if len(window) >= workers * BATCH_WINDOW:
+                        out.write(window.popleft().result())
+                drain()
+        finally:
+            _batch_db = None
+    out.flush()
+    dt = time.perf_counter() - t0
+    if verbose:
+        print(f"{n} sorgu, {dt:.2f}s, {n / dt if dt else 0:.0f} sorgu/s ({workers} işçi)", file=sys.stderr)
+    return n
+
+def bench_batch(n=20000, queries=("paket yükle", "servis yeniden başlat", "docker konteyner",
+                                  "disk kullanımı", "log göster", "ssh", "firewall ayarla", "yedek al")):
+    """1, 2, 4 ... çekirdek işçiyle aynı sorgu listesinin sorgu/s değerini karşılaştırır."""
+    import io
+    db = open_db()
+    lines = "".join(f"{queries[i % len(queries)]} {i % 97}\n" for i in range(n))
+    cores = len(os.sched_getaffinity(0))
+    counts = sorted({w for w in (1, 2, 4, 8, 16, 32, 64) if w <= cores} | {cores})
+    base = None
+    for w in counts:
+        t0 = time.perf_counter()
+        batch(io.StringIO(lines), io.StringIO(), db, workers=w, verbose=False)
+        qps = n / (time.perf_counter() - t0)
+        base = base or qps
+        print(f"  {w:3} işçi  {qps:8.0f} sorgu/s  ölçek {qps / base:4.1f}x")
+
+def pretty_print_result(key, cmd_map, rank, score_val):
+    print(f"\n[{rank}] {key}  (benzerlik: {score_val:.2f})")
+    for platform, cmd in cmd_map.items():
+        # indent komut metnini
+        print("\n".join("   " + line for line in f"{platform}: {cmd}".splitlines()))
+
+def interactive_loop(commands, index=None):
+    import readline  # noqa: F401  güzel terminal deneyimi (history, edit)
+    print("Etkinleştirilmiş arama modu. Çıkmak için 'çık' veya Ctrl-C.")
+    try:
+        while True:
+            q = input("\nArama > ").strip()
+            if not q:
+                continue
+            if q.lower() in ("çık", "quit", "exit", "q"):
+                print("Çıkılıyor.")
+                break
+            res = search_commands(commands, q, limit=8, index=index)
+            if not res:
+                print("Sonuç bulunamadı.")
+                continue
+            for i, (s, k) in enumerate(res, start=1):
+                pretty_print_result(k, commands[k], i, s)
+    except KeyboardInterrupt:
+        print("\nKapatılıyor...")
+
+# ------------------ Yazarken arama (--live) ------------------
+LIVE_POOL = 256          # tam aramada kelime adaylarının payı (bkz. search)
+LIVE_KEEP = 64           # sorgu uzadıkça yalnız son turun en iyi bu kadar adayı yeniden puanlanır
+LIVE_DEBOUNCE = 0.004    # tuş gelince aramadan önce ardından gelenler için bekleme (s)
+LIVE_SETTLE = 0.15       # yazma durunca süzülmüş sonuçları tam aramayla düzeltme gecikmesi (s)
+LIVE_BUDGET = 0.016      # tuştan ekrana hedef süre (s); aşan tuşlar durum satırında sayılır
+
+class LiveSearch:
+    """
+    Her tuşta yeniden sıralayan arama. Sorgu yalnız uzuyorsa (önceki sorgu
+    yeni sorgunun öneki ise) corpus yeniden taranmaz: önceki turda en yüksek
+    skoru alan LIVE_KEEP aday ile yeni sorguyu içeren ilk anahtarlar yeniden
+    puanlanır (maliyet neredeyse tamamen ratio() çağrılarında). Sorgu
+    kısalınca/değişince ya da süzme `limit` sonucu dolduramayınca tam aramaya
+    dönülür. Süzülmüş sonuçlar yaklaşıktır (havuz kısa sorguya göre
+    seçildi); yazma durunca settle()
+    onları tam aramayla kesinleştirir, böylece tuş yolunda tam arama olmaz.
+    """
+    def __init__(self, index, limit=8, pool=LIVE_POOL):
+        self.index, self.limit, self.pool = index, limit, pool
+        self.q = ""
+        self.ids = None
+        self.refined = False    # son sonuçlar havuzdan mı süzüldü
+        self.full = self.reused = 0
+
+    def search(self, query):
+        q = query.lower().strip()
+        if not q:
+            self.q, self.ids, self.refined = "", None, False
+            return []
+        if self.ids is not None and q.startswith(self.q):
+            scored = []
+            # q'yu içeren anahtarlar (bit kümesi kesişimi, ucuz) havuza her tuşta eklenir
+            ids = set(self.ids).union(self.index._containing(q, self.limit))
+            res = self.index.rank(q, ids, self.limit, scored)
+            if len(res) == self.limit:
+                self.q, self.ids, self.refined = q, self._keep(scored), True
+                self.reused += 1
+                return res
+        return self._full(q)
+
+    def _keep(self, scored):
+        return [i for _, i in heapq.nlargest(LIVE_KEEP, scored)]
+
+    def settle(self):
+        """Son sorguyu tam aramayla yeniden çalıştırır (yalnız süzülmüş sonuçlar varsa)."""
+        return self._full(self.q) if self.refined else None
+
+    def _full(self, q):
+        scored = []
+        res = self.index.search(q, self.limit, self.pool, scored)
+        self.ids = self._keep(scored)
+        self.q = q
+        self.refined = False
+        self.full += 1
+        return res
+
+def _percentile(values, p):
+    s = sorted(values)
+    return s[min(len(s) - 1, int(len(s) * p))] if s else 0.0
+
+def _live_keys(scr, first):
+    """İlk tuştan sonra bekleyen tuşları toplar (yapıştırma/hızlı yazma tek aramaya iner)."""
+    keys = [first]
+    scr.timeout(0)
+    deadline = time.perf_counter() + LIVE_DEBOUNCE
+    while True:
+        try:
+            keys.append(scr.get_wch())
+        except Exception:  # curses.error: bekleyen tuş yok
+            wait = deadline - time.perf_counter()
+            if wait <= 0:
+                break
+            scr.timeout(max(1, int(wait * 1000)))
+            try:
+                keys.append(scr.get_wch())
+            except Exception:
+                break
+    return keys
+
+def live_loop(commands, index):
+    """
+    curses ile yazarken arama. Her tuş grubundan sonra sonuçlar yeniden
+    sıralanır; tuştan ekrana süreler (son/p50/p95) durum satırında görünür
+    ve çıkışta özetlenir. Yukarı/aşağı seçer, Enter seçileni yazdırıp çıkar,
+    Esc / Ctrl-C / Ctrl-D çıkar; Ctrl-U sorguyu, Ctrl-W son kelimeyi siler.
+    """
+    import curses
+    import locale
+    locale.setlocale(locale.LC_ALL, "")
+    live = LiveSearch(index)
+    lat = []                    # tuştan ekrana süreler (s)
+    chosen = []
+
+    def ui(scr):
+        curses.set_escdelay(25)  # tek Esc ile hemen çık (varsayılan 1s)
+        query, results, sel = "", [], 0
+        over, info = 0, ""
+        t_key = None            # işlenmekte olan tuş grubunun ilk tuşunun zamanı
+        while True:
+            h, w = scr.getmaxyx()
+            live.limit = max(1, (h - 2) // 2)
+            scr.erase()
+            last = f"son {lat[-1]*1000:.1f}ms  p50 {_percentile(lat, .5)*1000:.1f}  p95 {_percentile(lat, .95)*1000:.1f}" if lat else ""
+            status = f"{len(results)} sonuç  {info}  {last}  >{LIVE_BUDGET*1000:.0f}ms: {over}"
+            try:
+                scr.addnstr(1, 0, status, w - 1, curses.A_DIM)
+                for r, (s, k) in enumerate(results):
+                    y = 2 + 2 * r
+                    attr = curses.A_REVERSE if r == sel else curses.A_BOLD
+                    scr.addnstr(y, 0, f"{s:.2f} {k}", w - 1, attr)
+                    cmd = next(iter(commands[k].values()), "")
+                    scr.addnstr(y + 1, 0, "     " + " ; ".join(cmd.splitlines()), w - 1)
+                scr.addnstr(0, 0, "Arama > " + query, w - 1)
+            except curses.error:
+                pass  # pencere çok küçük
+            scr.refresh()
+            if t_key is not None:
+                lat.append(time.perf_counter() - t_key)
+                over += lat[-1] > LIVE_BUDGET
+            # süzülmüş sonuçlar ekrandayken kısa süre bekle; tuş gelmezse kesinleştir
+            scr.timeout(int(LIVE_SETTLE * 1000) if live.refined else -1)
+            try:
+                key = scr.get_wch()
+            except curses.error:
+                res = live.settle()
+                if res is not None:
+                    results, sel, info = res, 0, "tam"
+                t_key = None
+                continue
+            except KeyboardInterrupt:
+                return
+            t_key = time.perf_counter()
+            old = query
+            for key in _live_keys(scr, key):
+                if key in ("\x1b", "\x03", "\x04"):
+                    return
+                if key in ("\n", "\r", curses.KEY_ENTER):
+                    if results:
+                        chosen.append(results[sel])
+                    return
+                if key in (curses.KEY_BACKSPACE, "\x7f", "\b"):
+                    query = query[:-1]
+                elif key == "\x15":
+                    query = ""
+                elif key == "\x17":
+                    query = query.rstrip()
+                    query = query[:query.rfind(" ") + 1]
+                elif key == curses.KEY_UP:
+                    sel = max(0, sel - 1)
+                elif key == curses.KEY_DOWN:
+                    sel = min(len(results) - 1, sel + 1)
+                elif isinstance(key, str) and key.isprintable():
+                    query += key
+            if query != old:
+                t0 = time.perf_counter()
+                results, sel = live.search(query), 0
+                info = f"{'süzme' if live.refined else 'tam'} {(time.perf_counter()-t0)*1000:.2f}ms"
+
+    curses.wrapper(ui)
+    for s, k in chosen:
+        pretty_print_result(k, commands[k], 1, s)
+    if lat:
+        print(f"{len(lat)} tuş grubu: tuştan ekrana p50 {_percentile(lat, .5)*1000:.1f}ms  "
+              f"p95 {_percentile(lat, .95)*1000:.1f}ms  en kötü {max(lat)*1000:.1f}ms  "
+              f"(tam arama {live.full}, havuzdan süzme {live.reused})")
+    return 0
+
+def bench_live(n=50000, queries=("servis yeniden başlat", "paket yükle", "docker konteyner sil",
+                                 "disk kullanımı", "firewall kuralı ekle", "log göster")):
+    """
+    Sorguları harf harf yazıyormuş gibi arar: her tuşta tam arama ile
+    LiveSearch'ü (havuzdan süzme) karşılaştırır; sorgu bitince settle()
+    süresini de ölçer. Yalnız arama süresi ölçülür; ekrana çizme dahil
+    tuştan ekrana süre --live ekranında görülür.
+    """
+    commands = make_commands(n)
+    index = CommandIndex(commands)
+    print(f"{len(commands)} giriş, {sum(len(q) for q in queries)} tuş")
+    live, full_t, live_t, settle_t, same = LiveSearch(index), [], [], [], 0
+    for query in queries:
+        live.search("")
+        for i in range(1, len(query) + 1):
+            prefix = query[:i]
+            t0 = time.perf_counter()
+            ref = index.search(prefix, live.limit, LIVE_POOL)
+            full_t.append(time.perf_counter() - t0)
+            t0 = time.perf_counter()
+            res = live.search(prefix)
+            live_t.append(time.perf_counter() - t0)
+            same += [s for s, _ in res] == [s for s, _ in ref]
+        settle_t.append(_timed(live.settle))
+    for name, ts in (("her tuşta tam arama", full_t), ("LiveSearch", live_t),
+                     ("yazma durunca settle", settle_t)):
+        print(f"  {name:20} p50 {_percentile(ts, .5)*1000:6.2f}ms  p95 {_percentile(ts, .95)*1000:6.2f}ms  "
+              f"en kötü {max(ts)*1000:6.2f}ms")
+    print(f"  tam arama {live.full}, havuzdan süzme {live.reused}; "
+          f"{same}/{len(live_t)} tuşta sonuç skorları tam aramayla aynı")
+
+def bench_startup(query="servis başlat", runs=15):
+    """Tek seferlik sorgunun (yorumlayıcı dahil) duvar saati süresini `python3 -c pass` ile karşılaştırır."""
+    import statistics
+    import subprocess
+    open_db()  # ölçümden önce veritabanı derlenmiş olsun
+    cases = [("python3 -c pass", [sys.executable, "-c", "pass"]),
+             ("arat <sorgu> (mmap db)", [sys.executable, ENTRY, query]),
+             ("arat --no-db <sorgu>", [sys.executable, ENTRY, "--no-db", query])]
+    for name, cmd in cases:
+        times = []
+        for _ in range(runs):
+            t0 = time.perf_counter()
+            subprocess.run(cmd, stdout=subprocess.DEVNULL, check=True)
+            times.append(time.perf_counter() - t0)
+        print(f"  {name:26} medyan {statistics.median(times)*1000:6.1f}ms  en iyi {min(times)*1000:6.1f}ms")
+    # arat.py yalnız giriş noktası; bu modül .pyc önbelleğinden yüklenir
+    with open(__file__, encoding="utf-8") as f:
+        source = f.read()
+    t0 = time.perf_counter()
+    compile(source, __file__, "exec")
+    print(f"  (önbellek olmasa arat_core.py kaynağının derlenmesi {(time.perf_counter()-t0)*1000:.1f}ms sürerdi)")
+
+def _broken_pipe():
+    # okuyan taraf kapandı (ör. `| head`): çıkıştaki flush yeniden hata vermesin
+    os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    return 1
+
+def _batch_main(args, index, no_db):
+    # --batch [dosya|-] [-n sonuç] [-j işçi]
+    limit, workers, path = 5, None, "-"
+    while args:
+        if args[0] in ("-n", "-j") and len(args) >= 2:
+            try:
+                value = int(args[1])
+            except ValueError:
+                value = 0
+            if value < 1:
+                print(f"arat: {args[0]} pozitif bir tam sayı ister: {args[1]!r}", file=sys.stderr)
+                return 2
+            if args[0] == "-n":
+                limit = value
+            else:
+                workers = value
+            args = args[2:]
+        else:
+            path, args = args[0], args[1:]
+    try:
+        if path == "-":
+            batch(sys.stdin, sys.stdout, index, limit, workers, no_db=no_db)
+        else:
+            with open(path, encoding="utf-8") as f:
+                batch(f, sys.stdout, index, limit, workers, no_db=no_db)
+    except BrokenPipeError:
+        return _broken_pipe()
+    except OSError as e:
+        print(f"arat: {path}: {e.strerror or e}", file=sys.stderr)
+        return 1
+    return 0
+
+def main(argv):
+    args = argv[1:]
+    if args and args[0] == "--bench":
+        bench(int(args[1]) if len(args) >= 2 else 100000)
+        return 0
+    if args and args[0] == "--bench-startup":
+        bench_startup()
+        return 0
+    if args and args[0] == "--serve":
+        serve(args[1] if len(args) >= 2 else None)
+        return 0
+    if args and args[0] == "--bench-live":
+        bench_live(int(args[1]) if len(args) >= 2 else 50000)
+        return 0
+    if args and args[0] == "--bench-batch":
+        bench_batch(int(args[1]) if len(args) >= 2 else 20000)
+        return 0
+    if args and args[0] == "--bench-serve":
+        bench_serve(*(int(a) for a in args[1:3]))
+        return 0
+    if args and args[0] == "--index-man":
+        index_man_pages(full="--full" in args)
+        db = open_db()
+        print(f"Veritabanı: {default_db_path()} ({len(db)} giriş)")
+        return 0
+    if args and args[0] == "--rebuild":
+        db = open_db(rebuild=True)
+        print(f"Veritabanı derlendi: {default_db_path()} ({len(db)} giriş)")
+        return 0
+    no_db = bool(args) and args[0] == "--no-db"
+    if no_db:
+        # eski yol: sözlüğü her çalıştırmada bellekte kur
+        commands = make_commands(DB_ENTRIES)
+        index = CommandIndex(commands)
+        args = args[1:]
+    else:
+        commands = index = open_db()
+    if args and args[0] == "--live":
+        return live_loop(commands, index)
+    if args and args[0] == "--batch":
+        return _batch_main(args[1:], index, no_db)
+    # opsiyonel: oluşturulan veri kaydedilsin mi? (kullanıcıya zarar vermez)
+    # import json
+    # with open("commands_generated.json", "w", encoding="utf-8") as f:
+    #     json.dump(make_commands(DB_ENTRIES), f, ensure_ascii=False, indent=2)
+
+    if args:
+        query = " ".join(args).strip()
+        res = search_commands(commands, query, limit=20, index=index)
+        if not res:
+            print("❌ Sonuç bulunamadı. Başka bir şey dene.")
+            return 0
+        try:
+            for i, (s, k) in enumerate(res, start=1):
+                pretty_print_result(k, commands[k], i, s)
+            sys.stdout.flush()
+        except BrokenPipeError:
+            return _broken_pipe()
+        return 0
+    else:
+        interactive_loop(commands, index)
+        return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
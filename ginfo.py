@@ -4,11 +4,20 @@ ginfo - Linux Sistem Bilgi Aracı
 Ahmet Yasin BEREKET tarafından geliştirildi
 """
 
+import errno
+import heapq
 import os
 import platform
 import psutil
+import pwd
+import queue
+import resource
+import shutil
 import socket
 import subprocess
+import sys
+import threading
+import time
 
 def sistem_bilgisi():
     print("===== Sistem Bilgisi =====")
@@ -21,14 +30,114 @@ def sistem_bilgisi():
     print(f"IP Adresi: {socket.gethostbyname(socket.gethostname())}")
     print()
 
+# ------------------ Disk kullanımı ------------------
+DISK_SURE = 2.0     # statvfs için süre sınırı (s); tüm bağlama noktaları paralel sorulur
+DISK_ISCI = 32      # aynı anda çalışan statvfs iş parçacığı sayısı
+# kapasitesi olmayan ya da bellekte duran dosya sistemleri (psutil.disk_partitions gibi atlanır)
+SAHTE_DOSYA_SISTEMLERI = {
+    "proc", "sysfs", "devtmpfs", "devpts", "tmpfs", "ramfs", "cgroup", "cgroup2", "mqueue",
+    "debugfs", "tracefs", "securityfs", "pstore", "bpf", "configfs", "fusectl", "hugetlbfs",
+    "autofs", "binfmt_misc", "rpc_pipefs", "nsfs", "efivarfs", "selinuxfs",
+}
+# asılı kalabilen (ağ / FUSE) dosya sistemleri sona bırakılır ki yerel diskleri bekletmesin
+AG_DOSYA_SISTEMLERI = {"nfs", "nfs4", "cifs", "smb3", "smbfs", "9p", "ceph", "glusterfs",
+                       "sshfs", "fuse", "davfs", "afs"}
+_askida = set()     # önceki çağrılarda takılan ve hâlâ dönmemiş statvfs'lerin bağlama noktaları
+
+def _mountinfo_coz(s):
+    # mountinfo boşluk, sekme, satır sonu ve ters bölüyü \ooo olarak kaçırır
+    if "\\" not in s:
+        return s
+    parcalar = s.split("\\")
+    return parcalar[0] + "".join(chr(int(p[:3], 8)) + p[3:] for p in parcalar[1:])
+
+def baglama_noktalari():
+    """
+    /proc/self/mountinfo'dan [(cihaz, bağlama noktası, tür)]. Sahte dosya
+    sistemleri ve aynı cihazın tekrar bağlandığı noktalar (bind mount) atlanır.
+    """
+    sonuc, gorulen = [], set()
+    with open("/proc/self/mountinfo", encoding="utf-8", errors="replace") as f:
+        for satir in f:
+            alanlar = satir.split()
+            try:
+                ayrac = alanlar.index("-", 6)
+                cihaz_no, nokta = alanlar[2], _mountinfo_coz(alanlar[4])
+                tur, kaynak = alanlar[ayrac + 1], _mountinfo_coz(alanlar[ayrac + 2])
+            except (ValueError, IndexError):
+                continue
+            if tur in SAHTE_DOSYA_SISTEMLERI or cihaz_no in gorulen:
+                continue
+            gorulen.add(cihaz_no)
+            sonuc.append((kaynak, nokta, tur))
+    return sonuc
+
+def _ag_mi(tur):
+    return tur in AG_DOSYA_SISTEMLERI or tur.startswith("fuse.")
+
+def disk_kullanimlari(sure=None):
+    """
+    Her bağlama noktası için statvfs'i iş parçacıklarında çalıştırır ve en
+    fazla `sure` saniye bekler: [(cihaz, nokta, tür, statvfs | OSError | None)].
+    None, süresinde yanıt vermeyen (ya da önceki bir çağrıdan beri takılı)
+    noktadır. İş parçacıkları daemon'dur: takılı bir NFS çağrısı çıkışı da
+    bekletmez. Toplam süre nokta sayısından bağımsız olarak `sure` ile sınırlı.
+    """
+    sure = DISK_SURE if sure is None else sure
+    noktalar = baglama_noktalari()
+    isler, cevaplar = queue.Queue(), queue.Queue()
+    sorulan = 0
+    for b in sorted(noktalar, key=lambda b: _ag_mi(b[2])):
+        if b[1] not in _askida:
+            isler.put(b)
+            sorulan += 1
+
+    def isci():
+        while True:
+            try:
+                b = isler.get_nowait()
+            except queue.Empty:
+                return
+            _askida.add(b[1])
+            try:
+                st = os.statvfs(b[1])
+            except OSError as e:
+                st = e
+            _askida.discard(b[1])
+            cevaplar.put((b, st))
+
+    for _ in range(min(DISK_ISCI, sorulan)):
+        threading.Thread(target=isci, daemon=True).start()
+    sonuc = {}
+    bitis = time.monotonic() + sure
+    while len(sonuc) < sorulan:
+        kalan = bitis - time.monotonic()
+        try:
+            b, st = cevaplar.get(timeout=max(kalan, 0))
+        except queue.Empty:
+            break
+        sonuc[b] = st
+    # süre doldu: sırada kalanlar sorulmasın
+    while True:
+        try:
+            isler.get_nowait()
+        except queue.Empty:
+            break
+    return [(*b, sonuc.get(b)) for b in noktalar]
+
 def disk_kullanimi():
     print("===== Disk Kullanımı =====")
-    for part in psutil.disk_partitions():
-        try:
-            usage = psutil.disk_usage(part.mountpoint)
-            print(f"{part.device} -> {round(usage.used / (1024**3),2)}GB / {round(usage.total / (1024**3),2)}GB ({usage.percent}%)")
-        except PermissionError:
+    for cihaz, nokta, tur, st in disk_kullanimlari():
+        if st is None:
+            print(f"{cihaz} ({nokta}, {tur}) -> yanıt vermiyor ({DISK_SURE:g}s içinde dönmedi)")
             continue
+        if isinstance(st, OSError) or st.f_blocks == 0:
+            continue  # erişim yok ya da kapasitesiz dosya sistemi
+        toplam = st.f_blocks * st.f_frsize
+        kullanilan = (st.f_blocks - st.f_bfree) * st.f_frsize
+        bos = st.f_bavail * st.f_frsize
+        yuzde = round(kullanilan / (kullanilan + bos) * 100, 1) if kullanilan + bos else 0
+        print(f"{cihaz} -> {round(kullanilan / (1024**3),2)}GB / {round(toplam / (1024**3),2)}GB ({yuzde}%)")
     print()
 
 def ag_bilgisi():
@@ -40,19 +149,607 @@ def ag_bilgisi():
                 print(f"{intf_name}: {addr.address}")
     print()
 
-def prosesler():
-    print("===== Çalışan Süreçler =====")
-    for proc in psutil.process_iter(['pid', 'name', 'username']):
-        print(f"PID: {proc.info['pid']}, İsim: {proc.info['name']}, Kullanıcı: {proc.info['username']}")
+# ------------------ Süreç tablosu ------------------
+CLK_TCK = os.sysconf("SC_CLK_TCK")
+SAYFA_BOYUTU = os.sysconf("SC_PAGE_SIZE")
+_buf = bytearray(4096)  # /proc okumaları için tekrar kullanılan tampon
+
+def _oku(ad, dir_fd):
+    # /proc altındaki küçük bir dosyayı ortak tampona okur
+    fd = os.open(ad, os.O_RDONLY, dir_fd=dir_fd)
+    try:
+        n = os.readv(fd, [_buf])
+    finally:
+        os.close(fd)
+    return bytes(_buf[:n])
+
+def _io_oku(pid, dir_fd):
+    # okunan + yazılan bayt (yalnız kendi süreçlerimiz ya da root iken okunabilir)
+    try:
+        data = _oku(f"{pid}/io", dir_fd)
+    except OSError:
+        return 0
+    toplam = 0
+    for satir in data.split(b"\n"):
+        if satir.startswith((b"read_bytes:", b"write_bytes:")):
+            toplam += int(satir.split()[1])
+    return toplam
+
+def surec_goruntusu(io=False):
+    """
+    /proc/[pid]/stat dosyalarını tek geçişte okur: {pid: (cpu tik, rss bayt,
+    io bayt, ham stat)}. Sıralama için gereken sayılar dışındaki alanlar
+    yalnız gösterilecek satırlar için çözülür (bkz. _stat_alanlari).
+    Okuma sırasında çıkan süreçler (ENOENT/ESRCH) ve bozuk satırlar atlanır.
+    """
+    sonuc = {}
+    dir_fd = os.open("/proc", os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        for ad in os.listdir(dir_fd):
+            if not ad.isdigit():
+                continue
+            try:
+                data = _oku(f"{ad}/stat", dir_fd)
+                # isim parantez içinde ve boşluk/parantez içerebilir: son ')'a göre böl
+                f = data[data.rindex(b")") + 2:].split(None, 22)
+                sonuc[int(ad)] = (int(f[11]) + int(f[12]), int(f[21]) * SAYFA_BOYUTU,
+                                  _io_oku(ad, dir_fd) if io else 0, data)
+            except (OSError, ValueError, IndexError):
+                continue
+    finally:
+        os.close(dir_fd)
+    return sonuc
+
+def _stat_alanlari(data):
+    # ham stat satırından (isim, durum, thread sayısı)
+    bas, son = data.index(b"("), data.rindex(b")")
+    f = data[son + 2:].split(None, 18)
+    return data[bas + 1:son].decode(errors="replace"), f[0].decode(), int(f[17])
+
+def _statm(pid):
+    # RES ve SHR (bayt) ile sahibin uid'i; süreç çıkmışsa None
+    try:
+        with open(f"/proc/{pid}/statm", "rb") as f:
+            alanlar = f.read().split()
+            uid = os.fstat(f.fileno()).st_uid
+        return int(alanlar[1]) * SAYFA_BOYUTU, int(alanlar[2]) * SAYFA_BOYUTU, uid
+    except (OSError, ValueError, IndexError):
+        return None
+
+_kullanicilar = {}
+
+def _kullanici(uid):
+    if uid not in _kullanicilar:
+        try:
+            _kullanicilar[uid] = pwd.getpwuid(uid).pw_name
+        except KeyError:
+            _kullanicilar[uid] = str(uid)
+    return _kullanicilar[uid]
+
+def _boyut(b):
+    for birim in ("B", "K", "M", "G"):
+        if b < 1024:
+            return f"{b:.0f}{birim}" if birim == "B" else f"{b:.1f}{birim}"
+        b /= 1024
+    return f"{b:.1f}T"
+
+def en_yogun_surecler(n=20, sirala="cpu", aralik=0.5):
+    """
+    İki görüntü arasındaki farkla CPU% (ve sirala="io" ise IO bayt/s)
+    hesaplar, seçilen ölçüte göre en yüksek n süreci heap ile seçer.
+    statm (RES/SHR) ve kullanıcı yalnız seçilen satırlar için okunur. Dönüş: (satırlar, süreç
+    sayısı, ikinci görüntünün okuma süresi).
+    """
+    io = sirala == "io"
+    t0 = time.monotonic()
+    once = surec_goruntusu(io)
+    time.sleep(aralik)
+    t1 = time.monotonic()
+    simdi = surec_goruntusu(io)
+    okuma = time.monotonic() - t1
+    gecen = t1 - t0
+
+    def olcut(pid):
+        s = simdi[pid]
+        if sirala == "rss":
+            return s[1]
+        # ilk görüntüden sonra başlayan süreçlerin sayacı sıfırdan sayılır
+        i = 2 if io else 0
+        o = once.get(pid)
+        return s[i] - (o[i] if o else 0)
+    secilen = heapq.nlargest(n, simdi, key=olcut)
+    satirlar = []
+    for pid in secilen:
+        tik, rss, iob, data = simdi[pid]
+        o = once.get(pid)
+        cpu = (tik - (o[0] if o else 0)) / CLK_TCK / gecen * 100
+        io_hiz = (iob - (o[2] if o else 0)) / gecen if io else 0
+        m = _statm(pid)
+        if m is None:
+            continue  # bu arada çıktı
+        res, shr, uid = m
+        isim, durum, thr = _stat_alanlari(data)
+        satirlar.append((pid, _kullanici(uid), durum, cpu, res, shr, thr, io_hiz, isim))
+    return satirlar, len(simdi), okuma
+
+def prosesler(n=20, sirala="cpu", aralik=0.5):
+    satirlar, toplam, okuma = en_yogun_surecler(n, sirala, aralik)
+    print(f"===== Çalışan Süreçler ({toplam} süreç, {sirala} sırasına göre ilk {len(satirlar)}, "
+          f"okuma {okuma*1000:.0f}ms) =====")
+    baslik = f"{'PID':>7} {'KULLANICI':<10} D {'%CPU':>6} {'RES':>7} {'SHR':>7} {'THR':>4}"
+    baslik += f" {'IO/s':>7}" if sirala == "io" else ""
+    cikti = [baslik + " KOMUT"]
+    for pid, kul, durum, cpu, res, shr, thr, io_hiz, isim in satirlar:
+        satir = f"{pid:>7} {kul[:10]:<10} {durum} {cpu:6.1f} {_boyut(res):>7} {_boyut(shr):>7} {thr:>4}"
+        satir += f" {_boyut(io_hiz):>7}" if sirala == "io" else ""
+        cikti.append(satir + " " + isim)
+    # sayfalama: terminale sığan kadar göster, devamı için Enter
+    sayfa = max(5, shutil.get_terminal_size().lines - 3) if os.isatty(1) else len(cikti)
+    for i in range(0, len(cikti), sayfa):
+        print("\n".join(cikti[i:i + sayfa]))
+        if i + sayfa < len(cikti) and input("-- devam için Enter, çıkmak için q -- ").strip().lower() == "q":
+            break
     print()
 
-def paket_kontrol(paket):
-    print(f"===== {paket} Paketi Kontrolü =====")
-    result = subprocess.run(['dpkg', '-s', paket], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-    if "installed" in result.stdout:
-        print(f"{paket} yüklü.")
-    else:
-        print(f"{paket} yüklü değil.")
+# ------------------ Süreç ağacı ------------------
+class _Dugum:
+    __slots__ = ("ppid", "isim", "stat", "fd", "ss", "ss_fd", "tik", "rss", "thr",
+                 "alt_rss", "alt_thr", "alt_cpu", "cocuklar")
+
+    def __init__(self, ppid, isim, stat, fd, tik, rss, thr):
+        self.ppid, self.isim, self.stat, self.fd = ppid, isim, stat, fd
+        self.ss, self.ss_fd = None, None
+        self.tik, self.rss, self.thr = tik, rss, thr
+        # alt ağaç toplamları (kendisi dahil); alt_cpu: son yenilemedeki tik artışı
+        self.alt_rss, self.alt_thr, self.alt_cpu = rss, thr, 0
+        self.cocuklar = set()
+
+def _stat_coz(data):
+    # ham stat -> (ppid, isim, durum, cpu tik, rss bayt, thread)
+    bas, son = data.index(b"("), data.rindex(b")")
+    f = data[son + 2:].split(None, 22)
+    return (int(f[1]), data[bas + 1:son].decode(errors="replace"), f[0],
+            int(f[11]) + int(f[12]), int(f[21]) * SAYFA_BOYUTU, int(f[17]))
+
+class SurecAgaci:
+    """
+    /proc/[pid]/stat'tan ebeveyn/çocuk ağacı ve alt ağaç başına RSS, thread
+    ve CPU toplamları. yenile() ağacı baştan kurmaz:
+    - süreçlerin dosyaları açık tutulur ve pread ile baştan okunur;
+    - tek thread'li süreçlerde önce ucuz schedstat (çalışma süresi) okunur,
+      süreç o aradan beri hiç çalışmadıysa stat'ı okunmaz;
+    - /proc/loadavg'daki son PID değişmediyse yeni süreç yoktur, /proc
+      listelenmez; çıkan süreçler okuma hatasından (ESRCH) anlaşılır;
+    - yalnız içeriği değişen, yeni ya da çıkmış süreçler işlenir; değerlerin
+      farkı atalara yayılır, ebeveyni değişenin alt ağacı taşınır.
+    Uyuyan bir sürecin RSS'ini çekirdek geri alırsa bu, süreç yeniden
+    çalışana kadar görünmez. Açık dosya sınırı yetmezse fazla süreçler her
+    seferinde açılıp kapanır.
+    """
+    acik = 0   # tüm ağaçlarda açık tutulan dosya sayısı (sınır süreç başına)
+    canli = 0  # açık ağaç sayısı; sonuncusu kapanınca dosya sınırı geri alınır
+    eski_sinir = None
+
+    def __init__(self):
+        self.dugumler = {}
+        self.proc = os.open("/proc", os.O_RDONLY | os.O_DIRECTORY)
+        SurecAgaci.canli += 1
+        self.fd_butce = self._fd_butce()
+        self.son_pid = None
+        self.son_degisen = []   # son yenilemede alt_cpu'su artan düğümler (sıfırlamak için)
+        self.degisen = 0
+        self.aralik = 0.0
+        self._zaman = None
+        self.yenile()
+
+    @staticmethod
+    def _fd_butce():
+        # dosyaları açık tutmak için yumuşak sınırı sert sınıra yükselt (eskisi
+        # son ağaç kapanınca geri yüklenir: select() kullanan kodlar 1024 üstü
+        # fd'lerle bozulmasın)
+        try:
+            yumusak, sert = resource.getrlimit(resource.RLIMIT_NOFILE)
+            if sert == resource.RLIM_INFINITY or sert > yumusak:
+                yeni = 1 << 20 if sert == resource.RLIM_INFINITY else sert
+                resource.setrlimit(resource.RLIMIT_NOFILE, (yeni, sert))
+                if SurecAgaci.eski_sinir is None:
+                    SurecAgaci.eski_sinir = (yumusak, sert)
+                yumusak = yeni
+        except (ValueError, OSError):
+            yumusak = 1024
+        return max(0, yumusak - 256)   # geri kalan program için pay bırak
+
+    def kapat(self):
+        for d in self.dugumler.values():
+            self._fd_kapat(d)
+        self.dugumler.clear()
+        os.close(self.proc)
+        SurecAgaci.canli -= 1
+        if SurecAgaci.canli == 0 and SurecAgaci.eski_sinir is not None:
+            try:
+                resource.setrlimit(resource.RLIMIT_NOFILE, SurecAgaci.eski_sinir)
+            except (ValueError, OSError):
+                pass
+            SurecAgaci.eski_sinir = None
+
+    def _ac(self, ad):
+        if SurecAgaci.acik >= self.fd_butce:
+            return None
+        try:
+            fd = os.open(ad, os.O_RDONLY, dir_fd=self.proc)
+        except OSError as e:
+            if e.errno != errno.EMFILE:
+                raise
+            self.fd_butce = SurecAgaci.acik   # süreçteki başka açık dosyalar sınırı doldurdu
+            return None
+        SurecAgaci.acik += 1
+        return fd
+
+    def _fd_kapat(self, d):
+        for fd in (d.fd, d.ss_fd):
+            if fd is not None:
+                os.close(fd)
+                SurecAgaci.acik -= 1
+        d.fd = d.ss_fd = None
+
+    def _stat(self, pid, fd):
+        # süreç çıkmışsa OSError (ESRCH/ENOENT) ya da b""
+        if fd is not None:
+            return os.pread(fd, 1024, 0)
+        fd = os.open(f"{pid}/stat", os.O_RDONLY, dir_fd=self.proc)
+        try:
+            return os.pread(fd, 1024, 0)
+        finally:
+            os.close(fd)
+
+    def _son_pid(self):
+        # /proc/loadavg'ın son alanı en son verilen PID: değişmediyse fork olmadı
+        with open("/proc/loadavg", "rb") as f:
+            return f.read().split()[-1]
+
+    def _yay(self, pid, drss, dthr, dcpu=0):
+        # farkı pid'den köke kadar tüm atalara (kendisi dahil) ekle
+        d = self.dugumler.get(pid)
+        while d is not None:
+            d.alt_rss += drss
+            d.alt_thr += dthr
+            if dcpu:
+                if not d.alt_cpu:
+                    self.son_degisen.append(d)
+                d.alt_cpu += dcpu
+            pid = d.ppid
+            d = self.dugumler.get(pid)
+
+    def _cikar(self, pid):
+        d = self.dugumler.pop(pid)
+        # atalardan tüm alt ağacı düş; çocuklar (çekirdek onları yeniden
+        # ebeveynlendirene kadar) kök olur. ppid 0'a çekilir: çıkan PID yeniden
+        # kullanılırsa yetimlerin farkları alakasız yeni sürece yayılmasın
+        self._yay(d.ppid, -d.alt_rss, -d.alt_thr, -d.alt_cpu)
+        ebeveyn = self.dugumler.get(d.ppid)
+        if ebeveyn is not None:
+            ebeveyn.cocuklar.discard(pid)
+        for c in d.cocuklar:
+            cocuk = self.dugumler.get(c)
+            if cocuk is not None:
+                cocuk.ppid = 0
+        self._fd_kapat(d)
+        return d.cocuklar
+
+    def _ekle(self, pid):
+        try:
+            fd = self._ac(f"{pid}/stat")
+        except OSError:
+            return None
+        try:
+            data = self._stat(pid, fd)
+            ppid, isim, _, tik, rss, thr = _stat_coz(data)
+        except (OSError, ValueError, IndexError):
+            if fd is not None:
+                os.close(fd)
+                SurecAgaci.acik -= 1
+            return None
+        d = self.dugumler[pid] = _Dugum(ppid, isim, data, fd, tik, rss, thr)
+        if thr == 1:
+            self._schedstat_ac(pid, d)
+        return d
+
+    def _schedstat_ac(self, pid, d):
+        try:
+            d.ss_fd = self._ac(f"{pid}/schedstat")
+            d.ss = os.pread(d.ss_fd, 128, 0) if d.ss_fd is not None else None
+        except OSError:
+            d.ss = None   # schedstat yok (CONFIG_SCHED_INFO kapalı): her seferinde stat okunur
+
+    def yenile(self):
+        """Ağacı günceller; dönüş: işlenen (yeni + değişen + çıkan) süreç sayısı."""
+        simdi = time.monotonic()
+        self.aralik = simdi - self._zaman if self._zaman is not None else 0.0
+        self._zaman = simdi
+        ilk = not self.dugumler
+        for d in self.son_degisen:
+            d.alt_cpu = 0
+        self.son_degisen = []
+        son_pid = self._son_pid()
+        # 1) bilinen süreçler: schedstat aynıysa atla, değilse stat'ı oku
+        degisen, cikan = [], []
+        for pid, d in self.dugumler.items():
+            try:
+                if d.ss is not None:
+                    ss = os.pread(d.ss_fd, 128, 0)
+                    if ss == d.ss:
+                        continue   # o aradan beri hiç çalışmadı
+                    d.ss = ss
+                data = self._stat(pid, d.fd)
+            except OSError:
+                data = b""
+            if not data:
+                cikan.append(pid)
+            elif data != d.stat:
+                degisen.append((pid, data))
+        islenen = len(cikan)
+        yetimler = set()
+        for pid in cikan:
+            yetimler.update(self._cikar(pid))
+        # ebeveyni çıkanlar çalışmadan yeniden ebeveynlendirilir: stat'larını zorla oku
+        okunan = {pid for pid, _ in degisen}
+        for pid in yetimler:
+            d = self.dugumler.get(pid)
+            if d is not None and pid not in okunan:
+                try:
+                    degisen.append((pid, self._stat(pid, d.fd)))
+                except OSError:
+                    pass
+        # 2) yeni süreçler (yalnız son PID ilerlediyse /proc listelenir): önce
+        # hepsini ekle, sonra bağla ve kendi değerlerini yay
+        yeni = []
+        if son_pid != self.son_pid:
+            for ad in os.listdir(self.proc):
+                if ad.isdigit() and int(ad) not in self.dugumler:
+                    d = self._ekle(int(ad))
+                    if d is not None:
+                        yeni.append((int(ad), d))
+        self.son_pid = son_pid
+        for pid, d in yeni:
+            ebeveyn = self.dugumler.get(d.ppid)
+            if ebeveyn is not None:
+                ebeveyn.cocuklar.add(pid)
+                self._yay(d.ppid, d.rss, d.thr, 0 if ilk else d.tik)
+            if not ilk and d.tik:
+                # ilk görüldüğü yenilemede CPU: başlangıcından beri
+                if not d.alt_cpu:
+                    self.son_degisen.append(d)
+                d.alt_cpu += d.tik
+        islenen += len(yeni)
+        # 3) değişenler: kendi farklarını yay; ebeveyn değiştiyse alt ağacı taşı
+        for pid, data in degisen:   # (liste döngüde uzayabilir)
+            d = self.dugumler.get(pid)
+            if d is None or not data:
+                continue
+            try:
+                ppid, isim, durum, tik, rss, thr = _stat_coz(data)
+            except (ValueError, IndexError):
+                continue
+            if durum in (b"Z", b"X") and d.stat[d.stat.rindex(b")") + 2:][:1] not in (b"Z", b"X"):
+                # çekirdek çocukları süreç çıkarken (zombi toplanmadan) yeniden ebeveynlendirir
+                for c in d.cocuklar:
+                    if c not in okunan:
+                        okunan.add(c)
+                        try:
+                            degisen.append((c, self._stat(c, self.dugumler[c].fd)))
+                        except OSError:
+                            pass
+            d.stat, d.isim = data, isim
+            if ppid != d.ppid:
+                self._yay(d.ppid, -d.alt_rss, -d.alt_thr, -d.alt_cpu)
+                eski = self.dugumler.get(d.ppid)
+                if eski is not None:
+                    eski.cocuklar.discard(pid)
+                d.ppid = ppid
+                yeni_ebeveyn = self.dugumler.get(ppid)
+                if yeni_ebeveyn is not None:
+                    yeni_ebeveyn.cocuklar.add(pid)
+                self._yay(ppid, d.alt_rss, d.alt_thr, d.alt_cpu)
+            self._yay(pid, rss - d.rss, thr - d.thr, tik - d.tik)
+            d.tik, d.rss = tik, rss
+            if thr != d.thr:
+                d.thr = thr
+                if thr == 1 and d.ss_fd is None:
+                    self._schedstat_ac(pid, d)
+                elif thr != 1:
+                    d.ss = None   # çok thread'li: schedstat yalnız ana thread'i gösterir
+            islenen += 1
+        self.degisen = islenen
+        return islenen
+
+    def kokler(self):
+        return [pid for pid, d in self.dugumler.items() if d.ppid not in self.dugumler]
+
+    def satirlar(self, en_fazla=40, sirala="cpu"):
+        """Ağacı DFS sırasıyla [(derinlik, pid, düğüm)] verir; kardeşler alt ağaç toplamına göre sıralı."""
+        anahtar = (lambda p: (self.dugumler[p].alt_cpu, self.dugumler[p].alt_rss)) if sirala == "cpu" \
+            else (lambda p: self.dugumler[p].alt_rss)
+        sonuc = []
+        yigin = [(0, pid) for pid in sorted(self.kokler(), key=anahtar)]
+        while yigin and len(sonuc) < en_fazla:
+            derinlik, pid = yigin.pop()
+            sonuc.append((derinlik, pid, self.dugumler[pid]))
+            yigin.extend((derinlik + 1, c) for c in sorted(self.dugumler[pid].cocuklar, key=anahtar))
+        return sonuc
+
+def surec_agaci(aralik=1.0, en_fazla=40, sirala="cpu"):
+    """Ağacı bir kez kurar; Enter ile aynı ağaç artımlı yenilenir, q ile çıkılır."""
+    agac = SurecAgaci()
+    try:
+        time.sleep(aralik)
+        while True:
+            t0 = time.perf_counter()
+            agac.yenile()
+            sure = time.perf_counter() - t0
+            # %CPU: önceki yenilemeden bu yana ortalama
+            print(f"===== Süreç Ağacı ({len(agac.dugumler)} süreç, yenilemede {agac.degisen} değişiklik, "
+                  f"{sure*1000:.0f}ms) =====")
+            print(f"{'PID':>7} {'%CPU':>6} {'RSS':>8} {'THR':>5}  (alt ağaç toplamları)")
+            for derinlik, pid, d in agac.satirlar(en_fazla, sirala):
+                cpu = d.alt_cpu / CLK_TCK / agac.aralik * 100 if agac.aralik else 0
+                print(f"{pid:>7} {cpu:6.1f} {_boyut(d.alt_rss):>8} {d.alt_thr:>5}  {'  ' * derinlik}{d.isim}")
+            print()
+            if input("Yenilemek için Enter, çıkmak için q: ").strip().lower() == "q":
+                break
+    finally:
+        agac.kapat()
+    print()
+
+def agac_karsilastir(tekrar=5):
+    """Bu makinedeki süreçlerle tam yeniden kurma ile artımlı yenilemeyi karşılaştırır."""
+    kurma, yenileme = [], []
+    for _ in range(tekrar):
+        t0 = time.perf_counter()
+        agac = SurecAgaci()
+        kurma.append(time.perf_counter() - t0)
+        for _ in range(tekrar):
+            time.sleep(0.05)
+            t0 = time.perf_counter()
+            agac.yenile()
+            yenileme.append(time.perf_counter() - t0)
+        n, degisen = len(agac.dugumler), agac.degisen
+        # doğrulama: artımlı ağaç baştan kurulanla aynı mı (RSS karşılaştırılmaz:
+        # ölçen sürecin kendi RSS'i ikinci ağacı kurarken büyür)
+        taze = SurecAgaci()
+        farkli = sum(1 for pid, d in agac.dugumler.items()
+                     if pid not in taze.dugumler or d.cocuklar != taze.dugumler[pid].cocuklar
+                     or d.alt_thr != taze.dugumler[pid].alt_thr)
+        taze.kapat()
+        agac.kapat()
+    kurma.sort()
+    yenileme.sort()
+    print(f"{n} süreç, fd bütçesi {agac.fd_butce}")
+    print(f"  tam kurma     medyan {kurma[len(kurma)//2]*1000:7.1f}ms")
+    print(f"  yenileme      medyan {yenileme[len(yenileme)//2]*1000:7.1f}ms  "
+          f"({yenileme[len(yenileme)//2] / kurma[len(kurma)//2]:.0%}; son turda {degisen} süreç işlendi)")
+    print(f"  son turda baştan kurulan ağaçtan farklı düğüm (çocuklar/thread toplamı): {farkli}")
+
+# ------------------ Paket veritabanı ------------------
+DPKG_STATUS = "/var/lib/dpkg/status"
+PACMAN_LOCAL = "/var/lib/pacman/local"
+RPM_DIZINLERI = ("/usr/lib/sysimage/rpm", "/var/lib/rpm")
+
+def _dpkg_indeks():
+    # status dosyası: boş satırla ayrılmış kayıtlar; "Status: install ok installed"
+    # son kelimesi asıl durumdur (installed, config-files, not-installed, ...)
+    with open(DPKG_STATUS, encoding="utf-8", errors="replace") as f:
+        metin = f.read()
+    indeks = {}
+    for kayit in metin.split("\n\n"):
+        ad = surum = durum = mimari = None
+        for satir in kayit.split("\n"):
+            if satir.startswith("Package:"):
+                ad = satir[8:].strip()
+            elif satir.startswith("Version:"):
+                surum = satir[8:].strip()
+            elif satir.startswith("Status:"):
+                durum = satir.split()[-1]
+            elif satir.startswith("Architecture:"):
+                mimari = satir[13:].strip()
+        # multiarch: aynı ad birden çok mimaride olabilir, yüklü olan kazanır;
+        # "libc6:amd64" gibi mimarili adlar da (dpkg-query'deki gibi) aranabilsin
+        if ad and (ad not in indeks or durum == "installed"):
+            indeks[ad] = (surum, durum)
+        if ad and mimari:
+            indeks[f"{ad}:{mimari}"] = (surum, durum)
+    return indeks
+
+def _pacman_indeks():
+    # local/ altındaki her dizin "<ad>-<sürüm>-<rel>"; sürüm ve rel '-' içermez,
+    # desc dosyalarını açmaya gerek yok
+    indeks = {}
+    for girdi in os.listdir(PACMAN_LOCAL):
+        parcalar = girdi.rsplit("-", 2)
+        if len(parcalar) == 3:
+            indeks[parcalar[0]] = (f"{parcalar[1]}-{parcalar[2]}", "installed")
+    return indeks
+
+def _rpm_dizini():
+    return next((d for d in RPM_DIZINLERI if os.path.isdir(d)), None)
+
+def _rpm_indeks():
+    # rpm veritabanı (bdb/sqlite) doğrudan okunmaz: tek bir `rpm -qa` dökümü alınır;
+    # rpm komutu yoksa (ör. yalnız dizini kalmış) veritabanı yok sayılır
+    try:
+        sonuc = subprocess.run(["rpm", "-qa", "--qf", "%{NAME}\t%{ARCH}\t%{VERSION}-%{RELEASE}\n"],
+                               stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    except FileNotFoundError:
+        return None
+    indeks = {}
+    for satir in sonuc.stdout.splitlines():
+        parcalar = satir.split("\t")
+        if len(parcalar) != 3:
+            continue
+        ad, mimari, surum = parcalar
+        indeks[ad] = (surum, "installed")
+        indeks[f"{ad}.{mimari}"] = (surum, "installed")  # "glibc.x86_64" biçimi
+    return indeks
+
+def _rpm_damga():
+    dizin = _rpm_dizini()
+    # sqlite/bdb dosyaları yerinde güncellenir: dizinin değil dosyaların mtime'ı
+    return max((e.stat().st_mtime_ns for e in os.scandir(dizin) if e.is_file()), default=0)
+
+_PAKET_ARKA_UCLARI = (
+    ("dpkg", lambda: os.path.exists(DPKG_STATUS), lambda: os.stat(DPKG_STATUS).st_mtime_ns, _dpkg_indeks),
+    ("pacman", lambda: os.path.isdir(PACMAN_LOCAL), lambda: os.stat(PACMAN_LOCAL).st_mtime_ns, _pacman_indeks),
+    ("rpm", lambda: _rpm_dizini() is not None, _rpm_damga, _rpm_indeks),
+)
+_paket_onbellek = {}  # arka uç -> (mtime damgası, {ad: (sürüm, durum)})
+
+def paket_indeksi():
+    """
+    Sistemdeki paket veritabanını ad -> (sürüm, durum) indeksine çevirir.
+    İndeks oturum boyunca saklanır, kaynak dosyanın mtime'ı değişince
+    yeniden kurulur. dpkg'de "ad:mimari", rpm'de "ad.mimari" anahtarları da
+    vardır. Dönüş: (arka uç adı, indeks); veritabanı yoksa (None, {}).
+    """
+    for ad, var_mi, damga, oku in _PAKET_ARKA_UCLARI:
+        if not var_mi():
+            continue
+        simdiki = damga()
+        onceki = _paket_onbellek.get(ad)
+        if onceki is None or onceki[0] != simdiki:
+            indeks = oku()
+            if indeks is None:
+                continue  # araç eksik: sıradaki arka uca geç
+            _paket_onbellek[ad] = (simdiki, indeks)
+        return ad, _paket_onbellek[ad][1]
+    return None, {}
+
+def paket_durumlari(paketler):
+    """Her paket için (sürüm, durum) ya da bilinmiyorsa None; tek indeks, sıfır alt süreç."""
+    _, indeks = paket_indeksi()
+    return {p: indeks.get(p) for p in paketler}
+
+def paket_kontrol(paketler):
+    if isinstance(paketler, str):
+        paketler = paketler.replace(",", " ").split()
+    print(f"===== {' '.join(paketler[:5])}{' ...' if len(paketler) > 5 else ''} Paket Kontrolü =====")
+    t0 = time.perf_counter()
+    arka_uc, _ = paket_indeksi()
+    if arka_uc is None:
+        print("Paket veritabanı bulunamadı (dpkg, pacman, rpm).")
+        print()
+        return
+    durumlar = paket_durumlari(paketler)
+    gecen = time.perf_counter() - t0
+    for paket, bilgi in durumlar.items():
+        if bilgi is None:
+            print(f"{paket} yüklü değil.")
+        elif bilgi[1] == "installed":
+            print(f"{paket} yüklü ({bilgi[0]}).")
+        elif bilgi[1] == "config-files":
+            print(f"{paket} kaldırılmış, yapılandırma dosyaları duruyor.")
+        else:
+            print(f"{paket} yüklü değil ({bilgi[1]}).")
+    if len(paketler) > 1:
+        print(f"({len(paketler)} paket, {arka_uc}, {gecen*1000:.1f}ms)")
     print()
 
 def menu():
@@ -71,7 +768,8 @@ def menu():
 3. Ağ Bilgisi
 4. Çalışan Süreçler
 5. Paket Kontrolü
-6. Çıkış
+6. Süreç Ağacı
+7. Çıkış
 ===============================================
         """)
         secim = input("Seçiminiz: ")
@@ -82,15 +780,29 @@ def menu():
         elif secim == "3":
             ag_bilgisi()
         elif secim == "4":
-            prosesler()
+            sirala = input("Sıralama (cpu/rss/io) [cpu]: ").strip().lower() or "cpu"
+            adet = input("Kaç süreç [20]: ").strip()
+            if sirala not in ("cpu", "rss", "io") or (adet and not adet.isdigit()):
+                print("Geçersiz seçim!")
+                continue
+            prosesler(int(adet or 20), sirala)
         elif secim == "5":
-            paket = input("Kontrol etmek istediğiniz paketin adını yazın: ")
+            paket = input("Kontrol etmek istediğiniz paketlerin adlarını yazın (boşlukla ayırın): ")
             paket_kontrol(paket)
         elif secim == "6":
+            sirala = input("Sıralama (cpu/rss) [cpu]: ").strip().lower() or "cpu"
+            if sirala not in ("cpu", "rss"):
+                print("Geçersiz seçim!")
+                continue
+            surec_agaci(sirala=sirala)
+        elif secim == "7":
             print("Çıkış yapılıyor...")
             break
         else:
             print("Geçersiz seçim!")
 
 if __name__ == "__main__":
-    menu()
+    if sys.argv[1:] == ["--bench-agac"]:
+        agac_karsilastir()
+    else:
+        menu()
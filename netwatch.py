@@ -2,22 +2,38 @@
 """
 netwatch.py - Basit, paket gerektirmeyen ev ağı tarayıcı / izleyici
 - Hiçbir harici Python paketi gerekmez.
-- Linux üzerinde test edildi (uses /proc/net/arp).
+- Linux üzerinde test edildi (komşu tablosu netlink ile, olmazsa /proc/net/arp).
 Kullanım:
     python3 netwatch.py          # etkileşimli menü
     python3 netwatch.py --scan   # tek seferlik tarama
     python3 netwatch.py --watch 5  # her 5 saniyede tarama
+    python3 netwatch.py --scan --net 10.0.0.0/16,192.168.1.0/24   # istenen aralıklar
+    python3 netwatch.py --scan --ports 22,80,443  # TCP servis yoklaması (--ports default: 20 port)
+    python3 netwatch.py --inventory 24      # son 24 saatte görülen cihazlar
+    python3 netwatch.py --history <MAC|IP>  # MAC'in tuttuğu IP'ler / IP'yi tutan MAC'ler
+    python3 netwatch.py --oui-build oui.txt # IEEE listesinden üretici tablosunu derle (~/.local/share/netwatch)
+    python3 netwatch.py --oui-build oui.txt netwatch_oui.tsv.gz  # paketle gelen tabloyu yeniden üret
+    python3 netwatch.py --bench-neigh 50000 # netlink / /proc/net/arp ayrıştırıcı karşılaştırması
 """
 
+import errno
+import ipaddress
 import os
+import selectors
+import struct
 import sys
 import socket
 import platform
+import resource
 import subprocess
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import deque, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
 import csv
+import gzip
+import re
+import sqlite3
 
 # ------------------ DÜZELTİLMİŞ ASCII BAŞLIK ------------------
 ASCII = r"""
@@ -41,6 +57,24 @@ ASCII = r"""
 # --------- CONFIG ----------
 DEFAULT_WORKERS = 60
 PING_TIMEOUT = 1  # saniye
+SWEEP_WINDOW = 4096        # aynı anda yanıt bekleyen en fazla ICMP probu
+WATCH_FULL_EVERY = 10      # watch: kaç turda bir tüm alt ağ taransın
+WATCH_MISS_LIMIT = 2       # art arda kaç kaçırılan yanıttan sonra LEAVE
+WATCH_PROBE_TIMEOUT = 0.5  # bilinen cihazların hızlı yoklaması
+DNS_WORKERS = 32
+DNS_TIMEOUT = 1.0   # tüm ters DNS turu için üst süre
+DNS_TTL = 600       # başarılı isimler (saniye)
+DNS_NEG_TTL = 60    # isimsiz / hatalı yanıtlar
+PROBE_PORTS = [21, 22, 23, 25, 53, 80, 110, 139, 143, 443,
+               445, 548, 554, 631, 1883, 3389, 5000, 8080, 8443, 9100]
+PROBE_TIMEOUT = 1.0    # tek TCP connect için
+PROBE_BUDGET = 16384   # aynı anda açık connect soketi üst sınırı; gerçek değer RLIMIT_NOFILE'a göre
+PROBE_DEADLINE = 10.0  # tüm TCP yoklama fazı için üst süre
+PROBE_MAX_HOSTS = 4096 # bundan büyük aralıklarda yalnız ICMP'de canlı hostlar yoklanır
+OUI_BUNDLED = os.path.join(os.path.dirname(os.path.abspath(__file__)), "netwatch_oui.tsv.gz")
+# sistem listeleri; önce paket tablosu, sonra --oui-build ile derlenen kullanıcı tablosu denenir
+OUI_SOURCES = ["/usr/share/ieee-data/oui.txt", "/usr/share/hwdata/oui.txt",
+               "/usr/share/misc/oui.txt", "/usr/share/nmap/nmap-mac-prefixes"]
 # --------------------------
 
 COMMON_NETS = [
@@ -50,20 +84,73 @@ COMMON_NETS = [
     "172.16.0."
 ]
 
+def _route_network(my_ip):
+    # /proc/net/route'tan my_ip'yi içeren doğrudan bağlı ağı bul (gerçek önek uzunluğu)
+    try:
+        with open("/proc/net/route") as f:
+            next(f)
+            for line in f:
+                parts = line.split()
+                if len(parts) < 8 or parts[1] == "00000000" or parts[2] != "00000000":
+                    continue
+                dest = socket.inet_ntoa(struct.pack("<I", int(parts[1], 16)))
+                mask = socket.inet_ntoa(struct.pack("<I", int(parts[7], 16)))
+                net = ipaddress.ip_network(f"{dest}/{mask}", strict=False)
+                if ipaddress.ip_address(my_ip) in net:
+                    return str(net)
+    except (OSError, ValueError, StopIteration):
+        pass
+    return None
+
 def guess_local_subnet():
-    # Deneyerek lokal IP al
+    # Deneyerek lokal IP al; dönüş CIDR, örn "192.168.1.0/24"
     try:
         s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         s.connect(("8.8.8.8", 80))
         my_ip = s.getsockname()[0]
         s.close()
-        parts = my_ip.split('.')
-        return f"{parts[0]}.{parts[1]}.{parts[2]}."
+        return _route_network(my_ip) or str(ipaddress.ip_network(f"{my_ip}/24", strict=False))
     except Exception:
         # fallback
         for p in COMMON_NETS:
-            return p
-    return "192.168.1."
+            return normalize_subnet(p)
+    return "192.168.1.0/24"
+
+def normalize_subnet(spec):
+    """'192.168.1.' (eski önek biçimi) -> '192.168.1.0/24'; CIDR'ler olduğu gibi kalır."""
+    spec = spec.strip()
+    if spec.endswith("."):
+        return spec + "0/24"
+    return spec
+
+def parse_networks(spec):
+    """
+    '10.0.0.0/16, 192.168.1.0/24 10.1.2.3' -> [IPv4Network, ...]
+    ICMP soketi ve ARP yalnız IPv4 olduğundan IPv6 ağları ValueError verir.
+    """
+    nets = []
+    for tok in spec.replace(",", " ").split():
+        net = ipaddress.ip_network(normalize_subnet(tok), strict=False)
+        if net.version != 4:
+            raise ValueError(f"{tok}: IPv6 ağları desteklenmiyor (yalnız IPv4 taranır)")
+        nets.append(net)
+    return nets
+
+def iter_hosts(spec):
+    """Ağlardaki adresleri tembel üretir (liste kurulmaz)."""
+    for net in parse_networks(spec):
+        for addr in net.hosts():
+            yield str(addr)
+
+def count_hosts(spec):
+    """iter_hosts'un üreteceği adres sayısı (hosts() ile aynı kural, liste kurulmadan)."""
+    total = 0
+    for net in parse_networks(spec):
+        total += net.num_addresses
+        if net.prefixlen < net.max_prefixlen - 1:
+            # IPv4'te ağ ve yayın adresi, IPv6'da yalnız alt ağ yönlendirici adresi atlanır
+            total -= 2 if net.version == 4 else 1
+    return total
 
 def ping(ip):
     # ping tek paket, timeout 1s
@@ -75,10 +162,246 @@ def ping(ip):
     except Exception:
         return False
 
-def read_arp_table():
+# ------------------ ICMP sweep (tek soket, süreç içi) ------------------
+ICMP_ECHO_REQUEST = 8
+ICMP_ECHO_REPLY = 0
+
+def _icmp_checksum(data):
+    if len(data) % 2:
+        data += b"\x00"
+    s = sum(struct.unpack(f"!{len(data)//2}H", data))
+    s = (s >> 16) + (s & 0xffff)
+    s += s >> 16
+    return ~s & 0xffff
+
+def _echo_request(ident, seq, payload=b"netwatch"):
+    hdr = struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, 0, ident, seq)
+    csum = _icmp_checksum(hdr + payload)
+    return struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, csum, ident, seq) + payload
+
+def open_icmp_socket():
+    """
+    Önce yetkisiz ICMP datagram soketi (net.ipv4.ping_group_range), olmazsa
+    root/CAP_NET_RAW ile raw soket açar. Dönüş: (soket, raw_mu) veya (None, None).
+    """
+    for kind, raw in ((socket.SOCK_DGRAM, False), (socket.SOCK_RAW, True)):
+        try:
+            s = socket.socket(socket.AF_INET, kind, socket.IPPROTO_ICMP)
+        except OSError:
+            continue
+        s.setblocking(False)
+        for opt in (getattr(socket, "SO_RCVBUFFORCE", None), socket.SO_RCVBUF):
+            try:
+                s.setsockopt(socket.SOL_SOCKET, opt, 4 << 20)  # root: rmem_max'ı aşabilir
+                break
+            except (OSError, TypeError):
+                pass
+        return s, raw
+    return None, None
+
+def icmp_sweep(ips, timeout=PING_TIMEOUT, sock=None, window=SWEEP_WINDOW):
+    """
+    Echo request'leri tek soketten gönderir, yanıtları epoll ile toplar ve
+    id/sequence ile eşler. Canlı IP'leri bulundukları sırayla üretir.
+    ips tembel bir iterator olabilir: aynı anda en fazla window prob yanıt
+    bekler, her prob kendi timeout'u dolunca yer açar; bellek aralık
+    büyüklüğünden bağımsızdır.
+    ICMP soketi açılamazsa OSError fırlatır (çağıran subprocess'e düşer).
+    """
+    own = sock is None
+    if own:
+        sock, raw = open_icmp_socket()
+        if sock is None:
+            raise OSError("ICMP soketi açılamadı (ping_group_range / root gerekli)")
+    else:
+        raw = sock.type == socket.SOCK_RAW
+    # datagram soketlerde çekirdek id alanını kendi yazar, yanıtlar zaten bu sokete gelir
+    ident = os.getpid() & 0xffff
+    window = min(window, 32768)  # sequence alanı 16 bit; pencere taşmasın
+    sel = selectors.DefaultSelector()
+    sel.register(sock, selectors.EVENT_READ)
+    inflight = {}     # seq -> ip
+    expiry = deque()  # (deadline, seq) gönderim sırasıyla; timeout sabit olduğundan sıralı
+    ips = iter(ips)
+    seq = 0
+    backlog = None
+    exhausted = False
+
+    def drain():
+        while True:
+            try:
+                data, addr = sock.recvfrom(2048)
+            except (BlockingIOError, InterruptedError):
+                return
+            if raw:
+                data = data[(data[0] & 0x0f) * 4:]  # IP başlığını at
+            if len(data) < 8:
+                continue
+            typ, _, _, rid, rseq = struct.unpack("!BBHHH", data[:8])
+            if typ != ICMP_ECHO_REPLY or (raw and rid != ident):
+                continue
+            if inflight.get(rseq) == addr[0]:
+                del inflight[rseq]
+                yield addr[0]
+
+    try:
+        while True:
+            burst = 0
+            while not exhausted and len(inflight) < window and burst < 256:
+                if backlog is None:
+                    ip = next(ips, None)
+                    if ip is None:
+                        exhausted = True
+                        break
+                    seq = (seq + 1) & 0xffff
+                    backlog = (_echo_request(ident, seq), ip, seq)
+                try:
+                    sock.sendto(backlog[0], (backlog[1], 0))
+                except (BlockingIOError, InterruptedError):
+                    break  # gönderim tamponu dolu: önce yanıtları oku
+                except OSError as e:
+                    if e.errno == errno.ENOBUFS:
+                        break
+                    backlog = None  # erişilemeyen adres vb.: atla
+                    continue
+                _, ip, s = backlog
+                backlog = None
+                burst += 1
+                inflight[s] = ip
+                expiry.append((time.monotonic() + timeout, s))
+            now = time.monotonic()
+            while expiry and (expiry[0][0] <= now or expiry[0][1] not in inflight):
+                inflight.pop(expiry.popleft()[1], None)
+            if exhausted and not inflight:
+                return  # süre doldu ya da herkes yanıt verdi
+            if burst >= 256:
+                wait_s = 0.0  # araya yanıt okuma koy, alım tamponu taşmasın
+            elif backlog is not None or (not exhausted and len(inflight) < window):
+                wait_s = 0.002
+            else:
+                wait_s = expiry[0][0] - now
+            if sel.select(max(0.0, wait_s)):
+                yield from drain()
+    finally:
+        sel.close()
+        if own:
+            sock.close()
+
+# ------------------ Komşu tablosu (netlink RTM_GETNEIGH) ------------------
+RTM_NEWNEIGH, RTM_DELNEIGH, RTM_GETNEIGH = 28, 29, 30
+NLMSG_ERROR, NLMSG_DONE = 2, 3
+NLM_F_REQUEST, NLM_F_DUMP = 0x1, 0x300
+RTMGRP_NEIGH = 0x4
+NDA_DST, NDA_LLADDR = 1, 2
+NUD_STATES = {0x01: "INCOMPLETE", 0x02: "REACHABLE", 0x04: "STALE", 0x08: "DELAY",
+              0x10: "PROBE", 0x20: "FAILED", 0x40: "NOARP", 0x80: "PERMANENT", 0x00: "NONE"}
+
+_NLMSGHDR = struct.Struct("=IHHII")
+_NDMSG = struct.Struct("=BxxxiHBB")
+_RTATTR = struct.Struct("=HH")
+# çekirdeğin IPv4 komşu mesajı için ürettiği sabit yerleşim: hdr + ndmsg + NDA_DST + NDA_LLADDR
+_NEIGH4 = struct.Struct("=IHHII BxxxiHBB HH4s HH6s2x")
+
+Neighbor = namedtuple("Neighbor", "ip mac state ifindex family deleted")
+
+def parse_neigh_messages(buf):
+    """Netlink yanıt tamponundaki RTM_NEWNEIGH/RTM_DELNEIGH mesajlarını Neighbor'a çevirir."""
+    off, end = 0, len(buf)
+    unpack_hdr, unpack_nd, unpack_rta = _NLMSGHDR.unpack_from, _NDMSG.unpack_from, _RTATTR.unpack_from
+    ntop, ntoa, states, mv = socket.inet_ntop, socket.inet_ntoa, NUD_STATES, memoryview(buf)
+    unpack4, AF_INET = _NEIGH4.unpack_from, socket.AF_INET
+    while off + 16 <= end:
+        msg_len, msg_type, _, _, _ = unpack_hdr(buf, off)
+        if msg_len < 16:
+            break
+        if msg_type == RTM_NEWNEIGH or msg_type == RTM_DELNEIGH:
+            if msg_len >= 48 and off + 48 <= end:
+                (_, _, _, _, _, family, ifindex, state, _, _,
+                 l1, t1, dst, l2, t2, lladdr) = unpack4(buf, off)
+                if family == AF_INET and l1 == 8 and t1 == NDA_DST and l2 == 10 and t2 == NDA_LLADDR:
+                    yield Neighbor(ntoa(dst), lladdr.hex(":"), states.get(state) or hex(state),
+                                   ifindex, family, msg_type == RTM_DELNEIGH)
+                    off += (msg_len + 3) & ~3
+                    continue
+            family, ifindex, state, _, _ = unpack_nd(buf, off + 16)
+            ip = mac = None
+            a, msg_end = off + 28, off + msg_len
+            while a + 4 <= msg_end:
+                rta_len, rta_type = unpack_rta(buf, a)
+                if rta_len < 4:
+                    break
+                if rta_type == NDA_DST:
+                    ip = ntop(family, mv[a+4:a+rta_len])
+                elif rta_type == NDA_LLADDR and rta_len == 10:
+                    mac = mv[a+4:a+10].hex(":")
+                a += (rta_len + 3) & ~3
+            if ip is not None:
+                yield Neighbor(ip, mac, states.get(state) or hex(state), ifindex, family,
+                               msg_type == RTM_DELNEIGH)
+        elif msg_type == NLMSG_ERROR:
+            err = -struct.unpack_from("=i", buf, off + 16)[0]
+            if err:
+                raise OSError(err, os.strerror(err))
+        off += (msg_len + 3) & ~3
+
+def read_neighbors(family=socket.AF_UNSPEC):
+    """Çekirdeğin komşu tablosunu (IPv4 ARP + IPv6 NDP) tek netlink dump'ı ile okur."""
+    with socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE) as s:
+        s.bind((0, 0))
+        req = _NLMSGHDR.pack(16 + _NDMSG.size, RTM_GETNEIGH, NLM_F_REQUEST | NLM_F_DUMP, 1, 0) + \
+              _NDMSG.pack(family, 0, 0, 0, 0)
+        s.sendto(req, (0, 0))
+        out = []
+        while True:
+            buf = s.recv(1 << 20)
+            if not buf:
+                break
+            out.extend(parse_neigh_messages(buf))
+            # NLMSG_DONE tamponun son mesajıdır
+            if len(buf) >= 16 and any(t == NLMSG_DONE for t in _msg_types(buf)):
+                break
+        return out
+
+def _msg_types(buf):
+    off = 0
+    while off + 16 <= len(buf):
+        msg_len, msg_type = struct.unpack_from("=IH", buf, off)
+        if msg_len < 16:
+            return
+        yield msg_type
+        off += (msg_len + 3) & ~3
+
+class NeighborMonitor:
+    """RTMGRP_NEIGH aboneliği: çekirdek komşu tablosu değiştikçe Neighbor bildirimleri."""
+    def __init__(self):
+        self.sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+        self.sock.bind((0, RTMGRP_NEIGH))
+        self.sock.setblocking(False)
+        self.sel = selectors.DefaultSelector()
+        self.sel.register(self.sock, selectors.EVENT_READ)
+
+    def poll(self, timeout):
+        """timeout içinde gelen bildirimleri döndürür (gelmezse boş liste)."""
+        out = []
+        if self.sel.select(timeout):
+            while True:
+                try:
+                    buf = self.sock.recv(1 << 16)
+                except (BlockingIOError, InterruptedError):
+                    break
+                except OSError:  # ENOBUFS: bildirim kaçtı, bir sonraki taramada düzelir
+                    break
+                out.extend(parse_neigh_messages(buf))
+        return out
+
+    def close(self):
+        self.sel.close()
+        self.sock.close()
+
+def read_arp_table_proc(path="/proc/net/arp"):
     arp = {}
     try:
-        with open("/proc/net/arp") as f:
+        with open(path) as f:
             lines = f.readlines()[1:]
         for line in lines:
             parts = line.split()
@@ -90,26 +413,457 @@ def read_arp_table():
         pass
     return arp
 
-def scan(subnet_prefix, start=1, end=254, workers=DEFAULT_WORKERS):
-    live = []
-    ips = [f"{subnet_prefix}{i}" for i in range(start, end+1)]
+_ARP_STATES = frozenset(("REACHABLE", "STALE", "DELAY", "PROBE", "PERMANENT"))
+
+def read_arp_table():
+    # ip -> mac; netlink ile IPv4+IPv6, geçersiz (FAILED/INCOMPLETE) kayıtlar hariç
+    try:
+        return {n.ip: n.mac for n in read_neighbors() if n.mac and n.state in _ARP_STATES}
+    except OSError:
+        return read_arp_table_proc()
+
+def bench_neighbors(n=50000):
+    """
+    Komşu tablosu okuyucularını karşılaştırır: n sentetik kayıt üzerinde yalnız
+    ayrıştırma maliyeti, ardından canlı tabloda uçtan uca (çekirdek tarafı dahil)
+    süre. Canlı tabloyu büyütmek için: ip -batch ile 'neigh replace ... nud permanent'.
+    """
+    import tempfile
+    msgs, lines = [], ["IP address       HW type     Flags       HW address            Mask     Device\n"]
+    for i in range(n):
+        ip = f"10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}"
+        mac = bytes((0x02, 0, (i >> 24) & 255, (i >> 16) & 255, (i >> 8) & 255, i & 255))
+        attrs = _RTATTR.pack(8, NDA_DST) + socket.inet_aton(ip) + _RTATTR.pack(10, NDA_LLADDR) + mac + b"\0\0"
+        body = _NDMSG.pack(socket.AF_INET, 2, 0x02, 0, 1) + attrs
+        msgs.append(_NLMSGHDR.pack(16 + len(body), RTM_NEWNEIGH, 2, 1, 0) + body)
+        lines.append(f"{ip:<16} 0x1         0x2         {mac.hex(':')}     *        eth0\n")
+    buf = b"".join(msgs)
+    with tempfile.NamedTemporaryFile("w", suffix="_arp", delete=False) as f:
+        f.writelines(lines)
+
+    def best(fn, rounds=5):
+        t = float("inf")
+        for _ in range(rounds):
+            t0 = time.perf_counter()
+            out = fn()
+            t = min(t, time.perf_counter() - t0)
+        return t, out
+
+    try:
+        t_proc, proc = best(lambda: read_arp_table_proc(f.name))
+        t_nl, nl = best(lambda: {x.ip: x.mac for x in parse_neigh_messages(buf) if x.mac})
+    finally:
+        os.unlink(f.name)
+    assert proc == nl
+    print(f"sentetik {n} kayıt, yalnız ayrıştırma: /proc metni {t_proc*1000:.1f}ms, "
+          f"netlink {t_nl*1000:.1f}ms")
+    t_proc, proc = best(read_arp_table_proc)
+    t_nl, nl = best(read_neighbors)
+    print(f"canlı tablo uçtan uca: /proc/net/arp {len(proc)} kayıt {t_proc*1000:.1f}ms, "
+          f"netlink dump {len(nl)} kayıt (IPv4+IPv6, durumlu) {t_nl*1000:.1f}ms")
+
+
+def scan_subprocess(ips, workers=DEFAULT_WORKERS):
+    # eski yol: her adres için bir `ping` süreci; sınırlı sayıda iş bekletilir
+    ips = iter(ips)
     with ThreadPoolExecutor(max_workers=workers) as ex:
-        futures = {ex.submit(ping, ip): ip for ip in ips}
-        for fut in as_completed(futures):
-            ip = futures[fut]
-            try:
-                ok = fut.result()
-                if ok:
-                    live.append(ip)
-            except Exception:
-                pass
-    return live
+        futures = {}
+        while True:
+            while len(futures) < workers * 2:
+                ip = next(ips, None)
+                if ip is None:
+                    break
+                futures[ex.submit(ping, ip)] = ip
+            if not futures:
+                return
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for fut in done:
+                ip = futures.pop(fut)
+                try:
+                    if fut.result():
+                        yield ip
+                except Exception:
+                    pass
 
-def reverse_dns(ip):
+def sweep_stream(ips, timeout=PING_TIMEOUT, workers=DEFAULT_WORKERS):
+    # ICMP soketi varsa tek soketle, yoksa ping süreçleriyle; canlıları bulundukça üretir
+    sock, _ = open_icmp_socket()
+    if sock is None:
+        yield from scan_subprocess(ips, workers)
+        return
     try:
-        return socket.gethostbyaddr(ip)[0]
+        yield from icmp_sweep(ips, timeout, sock)
+    finally:
+        sock.close()
+
+def sweep(ips, timeout=PING_TIMEOUT, workers=DEFAULT_WORKERS):
+    return list(sweep_stream(ips, timeout, workers))
+
+def scan(subnet_prefix, start=1, end=254, workers=DEFAULT_WORKERS):
+    ips = (f"{subnet_prefix}{i}" for i in range(start, end+1))
+    return sweep(ips, workers=workers)
+
+# ------------------ TCP servis yoklaması ------------------
+def _fd_budget(want):
+    # açık dosya sınırını (gerekirse hard limite kadar) yükseltip kullanılabilir soket sayısını döndür
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != resource.RLIM_INFINITY and soft < want + 64:
+        new = want + 64 if hard == resource.RLIM_INFINITY else min(want + 64, hard)
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (new, hard))
+            soft = new
+        except (ValueError, OSError):
+            pass
+    return max(16, min(want, soft - 64))
+
+def tcp_probe(hosts, ports=PROBE_PORTS, timeout=PROBE_TIMEOUT, budget=PROBE_BUDGET,
+              deadline=PROBE_DEADLINE, stats=None):
+    """
+    hosts x ports için bloklamayan connect'ler. Tüm faz tek bir in-flight
+    bütçesini (budget soket) ve tek bir toplam süreyi (deadline) paylaşır; her
+    bağlantı en fazla timeout bekler. Dönüş: (ip -> açık portlar, canlı IP'ler).
+    RST (ECONNREFUSED) de canlılık sayılır: ICMP'ye yanıt vermeyen cihazlar da
+    böylece görünür. budget, açık dosya sınırı (hard limite kadar yükseltilir)
+    ile kırpılır. stats (dict) verilirse bütçe, connect sayısı, tur sayısı ve
+    süre dolduğu için yoklanmayan kalıp kalmadığı yazılır.
+    """
+    budget = _fd_budget(budget)
+    connects = 0
+    end = time.monotonic() + deadline
+    pairs = ((ip, port) for ip in hosts for port in ports)
+    sel = selectors.DefaultSelector()
+    expiry = deque()  # (deadline, sock) açılış sırasıyla; timeout sabit olduğundan sıralı
+    open_ports, alive = {}, set()
+    linger = struct.pack("ii", 1, 0)
+    exhausted = False
+
+    def finish(sock, err):
+        ip, port = sel.unregister(sock).data
+        if err == 0:
+            open_ports.setdefault(ip, []).append(port)
+            alive.add(ip)
+        elif err == errno.ECONNREFUSED:
+            alive.add(ip)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, linger)  # TIME_WAIT bırakma
+        sock.close()
+
+    try:
+        while True:
+            now = time.monotonic()
+            while not exhausted and len(sel.get_map()) < budget and now < end:
+                pair = next(pairs, None)
+                if pair is None:
+                    exhausted = True
+                    break
+                sock = socket.socket(socket.AF_INET6 if ":" in pair[0] else socket.AF_INET,
+                                     socket.SOCK_STREAM)
+                sock.setblocking(False)
+                err = sock.connect_ex(pair)
+                connects += 1
+                sel.register(sock, selectors.EVENT_WRITE, pair)
+                if err != errno.EINPROGRESS:
+                    finish(sock, err)
+                    continue
+                expiry.append((now + timeout, sock))
+            if not sel.get_map() and (exhausted or now >= end):
+                break
+            if now >= end:
+                break  # toplam süre doldu: bekleyenler aşağıda kapatılır
+            wait_for = min(end, expiry[0][0] if expiry else end) - now
+            for key, _ in sel.select(max(0.0, wait_for)):
+                finish(key.fileobj, key.fileobj.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR))
+            now = time.monotonic()
+            while expiry and (expiry[0][0] <= now or expiry[0][1].fileno() < 0):
+                sock = expiry.popleft()[1]
+                if sock.fileno() >= 0:
+                    finish(sock, errno.ETIMEDOUT)
+    finally:
+        for key in list(sel.get_map().values()):
+            finish(key.fileobj, errno.ETIMEDOUT)
+        sel.close()
+    for p in open_ports.values():
+        p.sort()
+    if stats is not None:
+        stats.update(budget=budget, connects=connects, rounds=-(-connects // budget),
+                     cut=not exhausted)
+    return open_ports, alive
+
+def parse_ports(spec):
+    # "22,80,8000-8010" -> [22, 80, 8000, ...]
+    ports = []
+    for part in spec.split(","):
+        part = part.strip()
+        if "-" in part:
+            lo, hi = part.split("-", 1)
+            ports.extend(range(int(lo), int(hi) + 1))
+        elif part:
+            ports.append(int(part))
+    if not ports or not all(0 < p < 65536 for p in ports):
+        raise ValueError(f"geçersiz port listesi: {spec}")
+    return list(dict.fromkeys(ports))
+
+# ------------------ Ters DNS (eşzamanlı, TTL önbellekli) ------------------
+_dns_cache = {}     # ip -> (isim veya "-", geçerlilik sonu)
+_dns_pending = {}   # ip -> Future (süresi aşılsa da bitince önbelleğe yazar)
+_dns_pool = None
+
+def _dns_lookup(ip):
+    try:
+        name = socket.gethostbyaddr(ip)[0]
     except Exception:
+        name = None
+    ttl = DNS_TTL if name else DNS_NEG_TTL  # olumsuz yanıtlar da önbelleğe
+    _dns_cache[ip] = (name or "-", time.monotonic() + ttl)
+    return name or "-"
+
+def resolve_many(ips, timeout=DNS_TIMEOUT):
+    """
+    IP'leri sınırlı bir thread havuzunda paralel çözer, {ip: isim} döndürür.
+    Önbellekte geçerli kaydı olanlar sorgulanmaz. timeout içinde bitmeyen
+    sorgular "-" döner ama arka planda sürer ve sonraki taramada önbellekten gelir.
+    """
+    global _dns_pool
+    now = time.monotonic()
+    out, futures = {}, {}
+    for ip in ips:
+        hit = _dns_cache.get(ip)
+        if hit and hit[1] > now:
+            out[ip] = hit[0]
+            continue
+        fut = _dns_pending.get(ip)
+        if fut is None:
+            if _dns_pool is None:
+                _dns_pool = ThreadPoolExecutor(max_workers=DNS_WORKERS, thread_name_prefix="rdns")
+            fut = _dns_pool.submit(_dns_lookup, ip)
+            _dns_pending[ip] = fut
+            fut.add_done_callback(lambda f, ip=ip: _dns_pending.pop(ip, None))
+        futures[fut] = ip
+    if futures:
+        done, _ = wait(futures, timeout=timeout)
+        for fut, ip in futures.items():
+            if fut in done:
+                out[ip] = fut.result()
+            else:
+                fut.cancel()  # kuyrukta bekleyenleri bırak; başlamış olanlar önbelleğe yazar
+                out[ip] = "-"
+    return out
+
+def reverse_dns(ip):
+    return resolve_many([ip])[ip]
+
+# ------------------ OUI (üretici) tablosu ------------------
+_oui_index = None   # 24-bit önek (int) -> üretici; ilk sorguda yüklenir
+# oui.txt'nin girintili adres satırları (posta kodları) ve "(base 16)" tekrarları eşleşmez
+_OUI_LINE = re.compile(r"^([0-9A-Fa-f]{2})[-:]?([0-9A-Fa-f]{2})[-:]?([0-9A-Fa-f]{2})\s+(?:\(hex\)\s+)?"
+                       r"(?!\(base 16\))(\S.*?)\s*$")
+
+def _parse_oui_lines(lines):
+    # IEEE oui.txt ("28-6F-B9   (hex)  Vendor"), oui.csv ("MA-L,286FB9,Vendor,..."),
+    # nmap-mac-prefixes ("286FB9 Vendor") ve kendi TSV biçimimiz
+    for line in lines:
+        if line.startswith("MA-L,"):
+            parts = line.split(",", 3)
+            if len(parts) >= 3 and len(parts[1]) == 6:
+                yield int(parts[1], 16), parts[2].strip().strip('"')
+            continue
+        m = _OUI_LINE.match(line)
+        if m:
+            yield int("".join(m.group(1, 2, 3)), 16), m.group(4)
+
+def _open_text(path):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    return open(path, "r", encoding="utf-8", errors="replace")
+
+def load_oui_index():
+    """Paketle gelen tabloyu, varsa sistemdeki tam IEEE listesiyle birleştirip indeksler."""
+    global _oui_index
+    if _oui_index is None:
+        index = {}
+        for path in (OUI_BUNDLED, default_oui_path(), *OUI_SOURCES):
+            try:
+                with _open_text(path) as f:
+                    index.update(_parse_oui_lines(f))
+            except OSError:
+                continue
+            if path != OUI_BUNDLED:
+                break  # ilk bulunan tam liste (derlenmiş ya da sistemdeki) yeterli
+        _oui_index = index
+    return _oui_index
+
+def oui_vendor(mac):
+    """MAC -> üretici adı; bilinmiyorsa "-"."""
+    try:
+        octets = [int(x, 16) for x in mac.replace("-", ":").split(":")[:3]]
+    except ValueError:
+        return "-"
+    if len(octets) != 3:
         return "-"
+    if octets[0] & 0x02:
+        return "(yerel/rastgele MAC)"
+    return load_oui_index().get((octets[0] << 16) | (octets[1] << 8) | octets[2], "-")
+
+def default_oui_path():
+    data = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    return os.path.join(data, "netwatch", "oui.tsv.gz")
+
+def build_oui_table(src, dst=None):
+    """
+    IEEE oui.txt/oui.csv ya da nmap-mac-prefixes dosyasını kullanıcı tablosuna
+    (dst verilirse oraya) derler. Paketle gelen netwatch_oui.tsv.gz de bununla
+    IEEE MA-L listesinden üretilir.
+    """
+    dst = dst or default_oui_path()
+    with _open_text(src) as f:
+        table = dict(_parse_oui_lines(f))
+    os.makedirs(os.path.dirname(dst) or ".", exist_ok=True)
+    with gzip.open(dst, "wt", encoding="utf-8") as f:
+        for prefix in sorted(table):
+            f.write(f"{prefix:06X}\t{table[prefix]}\n")
+    print(f"{len(table)} OUI kaydı yazıldı: {dst}")
+
+# ------------------ Cihaz envanteri (SQLite) ------------------
+INVENTORY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS devices (
+    mac TEXT NOT NULL,
+    ip TEXT NOT NULL,
+    host TEXT,
+    vendor TEXT,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    PRIMARY KEY (mac, ip)
+);
+CREATE TABLE IF NOT EXISTS scans (
+    id INTEGER PRIMARY KEY,
+    started REAL NOT NULL,
+    subnet TEXT,
+    live INTEGER
+);
+CREATE TABLE IF NOT EXISTS sightings (
+    scan_id INTEGER NOT NULL REFERENCES scans(id),
+    mac TEXT NOT NULL,
+    ip TEXT NOT NULL,
+    host TEXT,
+    seen REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_devices_last_seen ON devices(last_seen);
+CREATE INDEX IF NOT EXISTS idx_devices_ip ON devices(ip);
+CREATE INDEX IF NOT EXISTS idx_sightings_mac ON sightings(mac, seen);
+CREATE INDEX IF NOT EXISTS idx_sightings_ip ON sightings(ip, seen);
+CREATE INDEX IF NOT EXISTS idx_sightings_scan ON sightings(scan_id);
+"""
+
+def default_inventory_path():
+    data = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    return os.path.join(data, "netwatch", "inventory.db")
+
+def open_inventory(path=None):
+    path = path or default_inventory_path()
+    if path != ":memory:":
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(INVENTORY_SCHEMA)
+    except sqlite3.Error:
+        conn.close()  # bozuk / veritabanı olmayan dosya, salt okunur dizin...
+        raise
+    return conn
+
+def _mac_key(mac):
+    # ARP'ta olmayan cihazlar "" MAC ile tutulur (birincil anahtar NULL olamaz)
+    return "" if not mac or mac == "—" else mac.lower()
+
+def record_scan(conn, subnet, results, now=None):
+    """Bir taramanın tüm sonuçlarını tek transaction'da yazar; scan id döndürür."""
+    now = now or time.time()
+    rows = [(_mac_key(r["mac"]), r["ip"], r.get("host"), r.get("vendor"), now, now) for r in results]
+    with conn:
+        scan_id = conn.execute("INSERT INTO scans (started, subnet, live) VALUES (?, ?, ?)",
+                               (now, subnet, len(results))).lastrowid
+        conn.executemany("""
+            INSERT INTO devices (mac, ip, host, vendor, first_seen, last_seen) VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(mac, ip) DO UPDATE SET
+                host = CASE WHEN excluded.host IN ('-', '') THEN devices.host ELSE excluded.host END,
+                vendor = excluded.vendor,
+                last_seen = excluded.last_seen""", rows)
+        conn.executemany("INSERT INTO sightings (scan_id, mac, ip, host, seen) VALUES (?, ?, ?, ?, ?)",
+                         [(scan_id, mac, ip, host, now) for mac, ip, host, _, _, _ in rows])
+    return scan_id
+
+def devices_seen_since(conn, seconds=86400):
+    """Son `seconds` içinde görülen cihazlar (last_seen indeksi)."""
+    cur = conn.execute("""SELECT mac, ip, host, vendor, first_seen, last_seen FROM devices
+                          WHERE last_seen >= ? ORDER BY last_seen DESC""", (time.time() - seconds,))
+    return [dict(zip(("mac", "ip", "host", "vendor", "first_seen", "last_seen"), row)) for row in cur]
+
+def ips_for_mac(conn, mac):
+    """Bir MAC'in tuttuğu IP'ler: [(ip, ilk, son, görülme sayısı)]."""
+    cur = conn.execute("""SELECT ip, MIN(seen), MAX(seen), COUNT(*) FROM sightings
+                          WHERE mac = ? GROUP BY ip ORDER BY MAX(seen) DESC""", (_mac_key(mac),))
+    return cur.fetchall()
+
+def macs_for_ip(conn, ip):
+    """Bir IP'yi tutmuş MAC'ler: [(mac, ilk, son, görülme sayısı)]."""
+    cur = conn.execute("""SELECT mac, MIN(seen), MAX(seen), COUNT(*) FROM sightings
+                          WHERE ip = ? GROUP BY mac ORDER BY MAX(seen) DESC""", (ip,))
+    return cur.fetchall()
+
+def save_inventory(subnet, results):
+    try:
+        conn = open_inventory()
+        try:
+            record_scan(conn, subnet, results)
+        finally:
+            conn.close()
+    except (sqlite3.Error, OSError) as e:
+        print("Envantere yazılamadı:", e)
+
+def _ts(t):
+    return datetime.fromtimestamp(t).strftime("%Y-%m-%d %H:%M")
+
+def print_inventory(hours=24):
+    """Son `hours` saatte görülen cihazları yazar; envanter okunamazsa False döner."""
+    try:
+        conn = open_inventory()
+        try:
+            rows = devices_seen_since(conn, hours * 3600)
+        finally:
+            conn.close()
+    except (sqlite3.Error, OSError) as e:
+        print("Envanter okunamadı:", e, file=sys.stderr)
+        return False
+    print(f"\nSon {hours} saatte görülen cihazlar: {len(rows)}\n")
+    print(f"{'IP':16} {'MAC':18} {'Üretici':26} {'İlk':16} {'Son':16} Host")
+    print("-"*110)
+    for r in rows:
+        print(f"{r['ip']:16} {r['mac'] or '—':18} {(r['vendor'] or '-')[:26]:26} "
+              f"{_ts(r['first_seen']):16} {_ts(r['last_seen']):16} {r['host'] or '-'}")
+    print()
+    return True
+
+def print_history(key):
+    """MAC/IP geçmişini yazar; envanter okunamazsa False döner."""
+    try:
+        conn = open_inventory()
+        try:
+            try:
+                ip = str(ipaddress.ip_address(key))  # IPv6 da ':' içerir, önce IP olarak dene
+            except ValueError:
+                rows, title = ips_for_mac(conn, key), f"{key} MAC'inin tuttuğu IP'ler"
+            else:
+                rows, title = macs_for_ip(conn, ip), f"{key} IP'sini tutan MAC'ler"
+        finally:
+            conn.close()
+    except (sqlite3.Error, OSError) as e:
+        print("Envanter okunamadı:", e, file=sys.stderr)
+        return False
+    print(f"\n{title}: {len(rows)}\n")
+    for val, first, last, n in rows:
+        print(f"  {val or '—':18} ilk {_ts(first)}  son {_ts(last)}  ({n} tarama)")
+    print()
+    return True
 
 def save_csv(entries, filename=None):
     if not filename:
@@ -117,43 +871,202 @@ def save_csv(entries, filename=None):
     try:
         with open(filename, "w", newline='') as csvfile:
             writer = csv.writer(csvfile)
-            writer.writerow(["IP", "MAC", "Hostname"])
+            writer.writerow(["IP", "MAC", "Vendor", "Hostname", "Ports"])
             for e in entries:
-                writer.writerow([e.get("ip",""), e.get("mac",""), e.get("host","")])
+                writer.writerow([e.get("ip",""), e.get("mac",""), e.get("vendor",""), e.get("host",""),
+                                 " ".join(map(str, e.get("ports", [])))])
         print(f"CSV'ye kaydedildi: {filename}")
     except Exception as e:
         print("CSV kaydedilemedi:", e)
 
-def single_scan_flow(subnet):
-    print(f"\n[TARANIYOR] subnet: {subnet}0/24  (ping timeout {PING_TIMEOUT}s)\n")
-    live = scan(subnet, 1, 254)
+def ip_key(ip):
+    return ipaddress.ip_address(ip)
+
+def single_scan_flow(subnet, stream=None, ports=None):
+    """
+    subnet: CIDR, birden çok aralık ya da eski '192.168.1.' öneki.
+    stream=True (büyük aralıklarda varsayılan) ise canlılar bulundukça yazılır.
+    ports verilirse ICMP taramasından sonra TCP servis yoklaması yapılır: küçük
+    aralıklarda tüm adaylar (ping'e yanıt vermeyenler de bulunur), büyüklerde
+    yalnız canlı hostlar.
+    """
+    subnet = normalize_subnet(subnet)
+    total = count_hosts(subnet)
+    if stream is None:
+        stream = total > 1024
+    print(f"\n[TARANIYOR] {subnet}  ({total} adres, ping timeout {PING_TIMEOUT}s)\n")
+    t0 = time.monotonic()
+    live = []
+    for ip in sweep_stream(iter_hosts(subnet)):
+        live.append(ip)
+        if stream:
+            print(f"  [+] {ip}", flush=True)
+    elapsed = time.monotonic() - t0
+    print(f"Tarama: {total} adres, {elapsed:.2f}s, {total/elapsed if elapsed else 0:.0f} host/s")
+    open_ports = {}
+    if ports:
+        candidates = iter_hosts(subnet) if total <= PROBE_MAX_HOSTS else live
+        t0 = time.monotonic()
+        stats = {}
+        open_ports, tcp_alive = tcp_probe(candidates, ports, stats=stats)
+        silent = tcp_alive.difference(live)
+        live.extend(silent)
+        print(f"TCP yoklama: {len(ports)} port, {len(tcp_alive)} host yanıt verdi "
+              f"({len(silent)} tanesi ICMP'ye sessiz), {time.monotonic()-t0:.2f}s")
+        if stats["rounds"] > 1:
+            print(f"  Not: soket bütçesi {stats['budget']} (RLIMIT_NOFILE); {stats['connects']} connect "
+                  f"{stats['rounds']} tura bölündü")
+        if stats["cut"]:
+            print(f"  Uyarı: {PROBE_DEADLINE:.0f}s süre doldu, bazı host/port çiftleri yoklanmadı")
     arp = read_arp_table()
+    names = resolve_many(live)
     results = []
-    for ip in sorted(live, key=lambda x: tuple(map(int, x.split('.')))):
+    for ip in sorted(live, key=ip_key):
         mac = arp.get(ip, "—")
-        host = reverse_dns(ip)
-        results.append({"ip": ip, "mac": mac, "host": host})
+        r = {"ip": ip, "mac": mac, "vendor": oui_vendor(mac), "host": names[ip]}
+        if ports:
+            r["ports"] = open_ports.get(ip, [])
+        results.append(r)
     return results
 
 def pretty_print(results):
     print(f"\nCanlı cihaz sayısı: {len(results)}\n")
-    print(f"{'IP':16} {'MAC':20} {'Host/Not'}")
-    print("-"*60)
+    print(f"{'IP':16} {'MAC':20} {'Üretici':26} {'Host/Not'}")
+    print("-"*86)
     for r in results:
-        print(f"{r['ip']:16} {r['mac']:20} {r['host']}")
+        line = f"{r['ip']:16} {r['mac']:20} {r.get('vendor', '-')[:26]:26} {r['host']}"
+        if r.get("ports"):
+            line += "  [" + ",".join(map(str, r["ports"])) + "]"
+        print(line)
     print()
 
-def watch_mode(subnet, interval):
+# ------------------ Durumlu izleme ------------------
+class DeviceTracker:
+    """
+    IP -> cihaz kaydı tablosu (mac, host, first_seen, last_seen, flaps, online).
+    Her turda yalnızca yoklanan adresler değerlendirilir; art arda
+    WATCH_MISS_LIMIT kez yanıt vermeyen cihaz LEAVE sayılır (tek paket kaybı
+    olay üretmesin diye).
+    """
+    def __init__(self, miss_limit=WATCH_MISS_LIMIT):
+        self.miss_limit = miss_limit
+        self.devices = {}
+
+    def online(self):
+        return [ip for ip, d in self.devices.items() if d["online"]]
+
+    def update(self, probed, alive, arp, now=None):
+        """Bir turun sonucunu işler, (olay, ip, ayrıntı) listesi döndürür."""
+        now = now or time.time()
+        events = []
+        for ip in probed:
+            d = self.devices.get(ip)
+            if ip in alive:
+                mac = arp.get(ip)
+                if d is None:
+                    d = self.devices[ip] = {"ip": ip, "mac": mac or "—", "vendor": oui_vendor(mac or ""),
+                                            "host": "-", "first_seen": now,
+                                            "last_seen": now, "flaps": 0, "online": True, "misses": 0}
+                    events.append(("JOIN", ip, d))
+                else:
+                    if not d["online"]:
+                        d["online"] = True
+                        d["flaps"] += 1
+                        events.append(("JOIN", ip, d))
+                    if mac and d["mac"] not in ("—", mac):
+                        events.append(("MAC-CHANGE", ip, f"{d['mac']} -> {mac}"))
+                    if mac and mac != d["mac"]:
+                        d["mac"] = mac
+                        d["vendor"] = oui_vendor(mac)
+                    d["last_seen"] = now
+                    d["misses"] = 0
+            elif d is not None and d["online"]:
+                d["misses"] += 1
+                if d["misses"] >= self.miss_limit:
+                    d["online"] = False
+                    events.append(("LEAVE", ip, d))
+        return events
+
+def print_event(kind, ip, info, now=None):
+    ts = datetime.fromtimestamp(now or time.time()).strftime("%H:%M:%S")
+    if isinstance(info, dict):
+        detail = f"{info['mac']:18} {info['host']}"
+        if kind == "JOIN" and info["flaps"]:
+            detail += f"  (flap #{info['flaps']})"
+    else:
+        detail = info
+    print(f"[{ts}] {kind:10} {ip:16} {detail}", flush=True)
+
+def _emit_events(tracker, events, now):
+    joined = [ip for kind, ip, _ in events if kind == "JOIN" and tracker.devices[ip]["host"] == "-"]
+    if joined:
+        for ip, name in resolve_many(joined).items():
+            tracker.devices[ip]["host"] = name
+    for kind, ip, info in events:
+        print_event(kind, ip, info, now)
+
+def watch_mode(subnet, interval, full_every=WATCH_FULL_EVERY, passive=True):
+    """
+    Durumlu izleme: bilinen canlı cihazlar her interval'de, tüm alt ağ her
+    full_every turda bir yoklanır. Değişiklikler JOIN/LEAVE/MAC-CHANGE olayı
+    olarak akar; ekran her turda temizlenmez. passive=True ise turlar arasında
+    netlink komşu bildirimleri dinlenir ve yeni cihazlar yoklamadan yakalanır.
+    """
+    os.system("clear")
+    print(ASCII)
+    subnet = normalize_subnet(subnet)
+    print(f"Watch modu — subnet: {subnet} — interval: {interval}s, "
+          f"tam tarama her {full_every} turda  (Ctrl+C ile çık)\n")
+    tracker = DeviceTracker()
+    nets = parse_networks(subnet)
+    monitor = None
+    if passive:
+        try:
+            monitor = NeighborMonitor()
+        except OSError:
+            pass
+    cycle = 0
     try:
         while True:
-            os.system("clear")
-            print(ASCII)
-            print(f"Watch modu — subnet: {subnet}0/24 — interval: {interval}s  (Ctrl+C ile çık)\n")
-            results = single_scan_flow(subnet)
-            pretty_print(results)
-            time.sleep(interval)
+            full = cycle % full_every == 0
+            c0 = time.process_time()
+            if full:
+                alive = set(sweep(iter_hosts(subnet)))
+                probed = count_hosts(subnet)
+                targets = (ip for ip in iter_hosts(subnet) if ip in alive or ip in tracker.devices)
+            else:
+                targets = tracker.online()
+                alive = set(sweep(targets, WATCH_PROBE_TIMEOUT)) if targets else set()
+                probed = len(targets)
+            now = time.time()
+            _emit_events(tracker, tracker.update(targets, alive, read_arp_table(), now), now)
+            if full:
+                print(f"[{datetime.fromtimestamp(now).strftime('%H:%M:%S')}] {'SWEEP':10} "
+                      f"{len(tracker.online())} çevrimiçi / {probed} prob, "
+                      f"CPU {1000*(time.process_time()-c0):.1f}ms", flush=True)
+            cycle += 1
+            if monitor is None:
+                time.sleep(interval)
+                continue
+            # beklerken komşu tablosu bildirimlerini dinle: yeni cihaz yoklamadan görünür
+            deadline = time.monotonic() + interval
+            while (left := deadline - time.monotonic()) > 0:
+                for n in monitor.poll(left):
+                    if (n.deleted or not n.mac or n.family != socket.AF_INET
+                            or n.state not in _ARP_STATES
+                            or not any(ipaddress.ip_address(n.ip) in net for net in nets)):
+                        continue
+                    d = tracker.devices.get(n.ip)
+                    if d is None or not d["online"] or d["mac"] != n.mac:
+                        now = time.time()
+                        _emit_events(tracker, tracker.update([n.ip], {n.ip}, {n.ip: n.mac}, now), now)
     except KeyboardInterrupt:
         print("\nWatch modu sonlandırıldı.")
+        pretty_print(sorted((d for d in tracker.devices.values() if d["online"]),
+                            key=lambda d: ip_key(d["ip"])))
+    finally:
+        if monitor is not None:
+            monitor.close()
 
 def interactive_menu():
     os.system("clear")
@@ -165,11 +1078,14 @@ def interactive_menu():
         print(" 1) Hızlı tarama (tek seferlik)")
         print(" 2) İzle (watch) modu")
         print(" 3) Tarama sonucu CSV'ye kaydet")
-        print(" 4) Alt ağ değiştir (şu an):", subnet + "0/24")
+        print(" 4) Alt ağ değiştir (şu an):", subnet)
+        print(" 5) Envanter: son 24 saatte görülen cihazlar")
+        print(" 6) Envanter: MAC/IP geçmişi")
         print(" 0) Çıkış")
         choice = input("\nSeçiminiz: ").strip()
         if choice == "1":
             results = single_scan_flow(subnet)
+            save_inventory(subnet, results)
             pretty_print(results)
             input("Devam için Enter'a basın...")
             os.system("clear")
@@ -184,6 +1100,7 @@ def interactive_menu():
             print(ASCII)
         elif choice == "3":
             results = single_scan_flow(subnet)
+            save_inventory(subnet, results)
             pretty_print(results)
             fn = input("CSV dosya adı (boş bırak default): ").strip() or None
             save_csv(results, fn)
@@ -191,11 +1108,21 @@ def interactive_menu():
             os.system("clear")
             print(ASCII)
         elif choice == "4":
-            new = input("Yeni subnet prefix (örn 192.168.1.): ").strip()
-            if new.endswith("."):
-                subnet = new
+            new = input("Yeni alt ağ (örn 192.168.1.0/24, 10.0.0.0/16 veya 192.168.1.): ").strip()
+            try:
+                parse_networks(new)
+                subnet = normalize_subnet(new)
+            except ValueError:
+                print("Geçersiz alt ağ (örn 192.168.1.0/24)")
+                time.sleep(1)
+            os.system("clear")
+            print(ASCII)
+        elif choice in ("5", "6"):
+            if choice == "5":
+                print_inventory(24)
             else:
-                print("prefix sonuna '.' eklemeyi unutma (örn 192.168.1.)")
+                print_history(input("MAC veya IP: ").strip())
+            input("Devam için Enter'a basın...")
             os.system("clear")
             print(ASCII)
         elif choice == "0":
@@ -207,6 +1134,31 @@ def interactive_menu():
             os.system("clear")
             print(ASCII)
 
+def _usage_error(msg):
+    print(msg, file=sys.stderr)
+    print(__doc__, file=sys.stderr)
+    sys.exit(2)
+
+def _arg_value(args, flag):
+    # flag'den sonraki değer; yoksa ya da başka bir seçenekse None
+    idx = args.index(flag)
+    if idx+1 < len(args) and not args[idx+1].startswith("--"):
+        return args[idx+1]
+    return None
+
+def _number_arg(args, flag, default, kind=int):
+    # flag'in pozitif sayı değeri; verilmemişse default, geçersizse kullanım hatası
+    value = _arg_value(args, flag)
+    if value is None:
+        return default
+    try:
+        n = kind(value)
+    except ValueError:
+        n = 0
+    if not n > 0:
+        _usage_error(f"{flag} pozitif bir sayı ister: {value!r}")
+    return n
+
 def cli_main():
     # Basit CLI işleme: --scan, --watch N
     args = sys.argv[1:]
@@ -214,17 +1166,55 @@ def cli_main():
     if "--help" in args or "-h" in args:
         print(__doc__)
         return
+    if "--net" in args:
+        # --net 10.0.0.0/16[,192.168.1.0/24 ...]
+        idx = args.index("--net")
+        if idx+1 < len(args):
+            subnet = args[idx+1]
+        try:
+            parse_networks(subnet)
+        except ValueError as e:
+            print(f"geçersiz ağ: {e}", file=sys.stderr)
+            sys.exit(2)
+    if "--bench-neigh" in args:
+        bench_neighbors(_number_arg(args, "--bench-neigh", 50000))
+        return
+    if "--oui-build" in args:
+        src = _arg_value(args, "--oui-build")
+        if src is None:
+            _usage_error("--oui-build bir kaynak dosya ister")
+        # isteğe bağlı ikinci değer: hedef dosya (ör. paketteki netwatch_oui.tsv.gz)
+        idx = args.index("--oui-build")
+        dst = args[idx+2] if idx+2 < len(args) and not args[idx+2].startswith("--") else None
+        build_oui_table(src, dst)
+        return
+    if "--inventory" in args:
+        hours = _number_arg(args, "--inventory", 24, float)
+        if not print_inventory(hours):
+            sys.exit(1)
+        return
+    if "--history" in args:
+        key = _arg_value(args, "--history")
+        if key is None:
+            _usage_error("--history bir MAC ya da IP ister")
+        if not print_history(key):
+            sys.exit(1)
+        return
+    ports = None
+    if "--ports" in args:
+        # --ports 22,80,443 ya da --ports default (PROBE_PORTS)
+        spec = _arg_value(args, "--ports") or "default"
+        try:
+            ports = PROBE_PORTS if spec == "default" else parse_ports(spec)
+        except ValueError:
+            _usage_error(f"--ports: geçersiz port listesi: {spec!r} (ör. 22,80,8000-8010)")
     if "--scan" in args:
-        results = single_scan_flow(subnet)
+        results = single_scan_flow(subnet, ports=ports)
+        save_inventory(subnet, results)
         pretty_print(results)
         return
     if "--watch" in args:
-        try:
-            idx = args.index("--watch")
-            interval = int(args[idx+1]) if idx+1 < len(args) else 5
-        except Exception:
-            interval = 5
-        watch_mode(subnet, interval)
+        watch_mode(subnet, _number_arg(args, "--watch", 5))
         return
     # GUI (etkileşimli)
     interactive_menu()
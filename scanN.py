@@ -2,160 +2,1133 @@
 """
 syssec_no_install.py
 Saf-Python yerel güvenlik kontrol aracı — ekstra paket indirtmez.
-Kullanım: python3 syssec_no_install.py
+Kullanım: python3 syssec_no_install.py                 # etkileşimli
+          python3 syssec_no_install.py --format jsonl   # etkileşimsiz (cron); --help
 Not: root ile çalıştırmak daha fazla bilgi verir.
 """
 
+import argparse
+import errno
+import gzip
+import heapq
+import ipaddress
+import json
 import os
+import queue
+import re
+import resource
+import selectors
 import socket
+import stat
+import struct
+import sys
 import time
+from collections import deque, namedtuple
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
 
 # ---------- Ayarlar ----------
 PORT_SCAN_TIMEOUT = 0.35  # saniye
 DEFAULT_SCAN_RANGE = (1, 1024)
+SCAN_CONCURRENCY = 4096   # aynı anda açık bekleyen connect sayısı
+SCAN_RATE = 0             # saniyede başlatılan connect (0 = sınırsız)
+ADAPTIVE_MIN_TIMEOUT = 0.05   # RTT'den uyarlanan timeout alt/üst sınırları
+ADAPTIVE_MAX_TIMEOUT = 3.0
+DISCOVERY_TIMEOUT = 1.0       # canlı host keşfi (RTT bilinmiyorken)
+DISCOVERY_PORTS = [80, 443, 22, 445, 3389, 8080]
+BANNER_WORKERS = 64           # aynı anda çalışan banner probu
+BANNER_TIMEOUT = 1.0          # prob başına toplam süre
+BANNER_PASSIVE = 0.3          # servis önce konuşsun diye beklenen süre
+BANNER_BYTES = 512
+UDP_TIMEOUT = 0.5             # UDP probu başına bekleme (her tekrar denemede artar)
+UDP_RETRIES = 2
+UDP_CONCURRENCY = 512
+UDP_RATE = 500                # başlangıç gönderim hızı (prob/s), ICMP'ye göre uyarlanır
+UDP_MIN_RATE = 5
+UDP_MAX_RATE = 20000
+UDP_DEFAULT_PORTS = "53,67-69,123,137-138,161-162,500,514,520,1900,4500,5353,11211"
 WORLD_WRITABLE_PATHS = ["/tmp"]
+WORLD_WRITABLE_DEPTH = 2
 SUID_SEARCH_PATHS = ["/usr/bin", "/usr/sbin", "/bin", "/sbin"]
+AUDIT_WORKERS = min(32, (os.cpu_count() or 1) * 4)
 
 # ---------- Yardımcı fonksiyonlar ----------
-def read_proc_net(path):
-    try:
-        with open(path, "r") as f:
-            lines = f.read().splitlines()
-        return lines
-    except Exception:
-        return []
+# /proc/net/tcp* "st" sütunu (include/net/tcp_states.h)
+TCP_STATES = {
+    "01": "ESTABLISHED", "02": "SYN_SENT", "03": "SYN_RECV", "04": "FIN_WAIT1",
+    "05": "FIN_WAIT2", "06": "TIME_WAIT", "07": "CLOSE", "08": "CLOSE_WAIT",
+    "09": "LAST_ACK", "0A": "LISTEN", "0B": "CLOSING", "0C": "NEW_SYN_RECV",
+}
+# UDP'de aynı sütun yalnız bağlı (01) / bağlanmamış (07) demek; ss gibi adlandır
+UDP_STATES = {"01": "ESTAB", "07": "UNCONN"}
 
-def hex_to_ip_port(h):
-    """local_address field '0100007F:1F90' -> ('127.0.0.1', 8080)"""
-    try:
-        ip_hex, port_hex = h.split(":")
-        port = int(port_hex, 16)
-        if len(ip_hex) == 8:  # IPv4
-            ip = ".".join(str(int(ip_hex[i:i+2], 16)) for i in (6,4,2,0))
-            return ip, port
+SockRec = namedtuple("SockRec", "proto local_ip local_port remote_ip remote_port state uid inode pid cmd")
+
+_addr_cache = {}
+_V6_LE = struct.Struct("<4I")
+_V6_BE = struct.Struct(">4I")
+
+def decode_ip(ip_hex):
+    """/proc/net adres alanı (host byte order) -> '127.0.0.1' veya '::1'."""
+    ip = _addr_cache.get(ip_hex)
+    if ip is None:
+        raw = bytes.fromhex(ip_hex)
+        if len(raw) == 4:
+            ip = socket.inet_ntop(socket.AF_INET, raw[::-1])
         else:
-            # IPv6 (not prettified)
-            return ip_hex, port
-    except Exception:
-        return h, None
+            # IPv6: dört adet 32-bit kelime, her biri little-endian
+            ip = socket.inet_ntop(socket.AF_INET6, _V6_BE.pack(*_V6_LE.unpack(raw)))
+        _addr_cache[ip_hex] = ip
+    return ip
+
+def build_inode_index(proc="/proc"):
+    """
+    Tüm /proc/<pid>/fd bağlantılarını bir kez dolaşıp
+    soket inode -> (pid, komut) sözlüğü kurar.
+    """
+    index = {}
+    try:
+        pids = [e.name for e in os.scandir(proc) if e.name.isdigit()]
+    except OSError:
+        return index
+    for pid in pids:
+        owner = None
+        try:
+            with os.scandir(f"{proc}/{pid}/fd") as it:
+                for e in it:
+                    try:
+                        link = os.readlink(e.path)
+                    except OSError:
+                        continue
+                    if not link.startswith("socket:["):
+                        continue
+                    if owner is None:
+                        try:
+                            with open(f"{proc}/{pid}/comm") as f:
+                                owner = (int(pid), f.read().strip())
+                        except OSError:
+                            owner = (int(pid), "?")
+                    index.setdefault(int(link[8:-1]), owner)
+        except OSError:
+            continue  # izin yok veya süreç çıktı
+    return index
+
+_NO_OWNER = (None, None)
+
+def read_socket_table(protos=("tcp", "tcp6", "udp", "udp6"), owners=True, proc="/proc"):
+    """
+    /proc/net/{tcp,tcp6,udp,udp6} dosyalarını tek geçişte SockRec kayıtlarına çevirir.
+    owners=True ise her kayıt inode indeksi üzerinden sahibi olan PID/komutla eşlenir.
+    """
+    index = build_inode_index(proc) if owners else {}
+    decode = decode_ip
+    for proto in protos:
+        states = TCP_STATES if proto.startswith("tcp") else UDP_STATES
+        try:
+            f = open(f"{proc}/net/{proto}", "r")
+        except OSError:
+            continue
+        with f:
+            next(f, None)  # başlık
+            for line in f:
+                parts = line.split(None, 10)
+                if len(parts) < 10:
+                    continue
+                local, remote, st = parts[1], parts[2], parts[3]
+                inode = int(parts[9])
+                pid, cmd = index.get(inode, _NO_OWNER)
+                yield SockRec(proto, decode(local[:-5]), int(local[-4:], 16),
+                              decode(remote[:-5]), int(remote[-4:], 16),
+                              states.get(st, st), int(parts[7]), inode, pid, cmd)
+
+def is_listening(rec):
+    # TCP: LISTEN; UDP: bağlanmamış (uzak port 0) soketler
+    if rec.proto.startswith("tcp"):
+        return rec.state == "LISTEN"
+    return rec.remote_port == 0
+
+def format_addr(ip, port):
+    return f"[{ip}]:{port}" if ":" in ip else f"{ip}:{port}"
 
 # ---------- Dinlenen portları oku (proc) ----------
-def list_listening_proc():
+def listening_sockets():
+    return [rec for rec in read_socket_table() if is_listening(rec)]
+
+def list_listening_proc(recs=None):
     print("\n== /proc/net - Dinlenen bağlantılar (temel, paket gerektirmez) ==")
-    files = ["/proc/net/tcp", "/proc/net/tcp6", "/proc/net/udp", "/proc/net/udp6"]
+    if recs is None:
+        recs = listening_sockets()
     found = False
-    for p in files:
-        lines = read_proc_net(p)
-        if not lines or len(lines) < 2:
-            continue
-        print(f"\n-- {p} --")
-        for L in lines[1:]:
-            parts = L.split()
-            if len(parts) < 2:
-                continue
-            local = parts[1]
-            state = parts[3] if len(parts) > 3 else "??"
-            ip, port = hex_to_ip_port(local)
-            # state '0A' usually LISTEN for tcp
-            print(f"{ip}:{port}  state={state}")
+    for rec in recs:
+        if not found:
+            print(f"{'PROTO':6} {'ADRES':46} {'PID':>7}  KOMUT")
             found = True
+        pid, cmd = (str(rec.pid), rec.cmd) if rec.pid else ("-", "(bilinmiyor, root gerekebilir)")
+        print(f"{rec.proto:6} {format_addr(rec.local_ip, rec.local_port):46} {pid:>7}  {cmd}")
     if not found:
         print("(proc/net içinde dinlenen port bulunamadı veya okuma yetkisi kısıtlı)")
+    return recs
 
-# ---------- Lokal port tarayıcı (safe, pure Python) ----------
-def scan_ports(host="127.0.0.1", port_range=(1,1024), timeout=PORT_SCAN_TIMEOUT):
-    start, end = port_range
-    print(f"\n== Lokal port taraması: {host} {start}-{end} (timeout={timeout}s) ==")
-    open_ports = []
-    for port in range(start, end+1):
-        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        s.settimeout(timeout)
+# ---------- Non-blocking connect motoru ----------
+# connect() sonucu errno -> port durumu
+_CLOSED_ERRNOS = {errno.ECONNREFUSED, errno.ECONNRESET}
+_PENDING_ERRNOS = {errno.EINPROGRESS, errno.EALREADY, errno.EWOULDBLOCK}
+
+def fd_budget(want):
+    """RLIMIT_NOFILE soft limitini gerekirse yükseltir, kullanılabilir soket sayısını döndürür."""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    need = want + 64
+    if soft != resource.RLIM_INFINITY and soft < need:
+        new_soft = need if hard == resource.RLIM_INFINITY else min(need, hard)
         try:
-            s.connect((host, port))
-            open_ports.append(port)
-        except Exception:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (new_soft, hard))
+            soft = new_soft
+        except (ValueError, OSError):
             pass
-        finally:
-            try:
+    if soft == resource.RLIM_INFINITY:
+        return want
+    return max(1, min(want, soft - 64))
+
+def _close_rst(s):
+    # açık portu RST ile kapat: TIME_WAIT biriktirip yerel portları tüketmesin
+    try:
+        s.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, b"\x01\x00\x00\x00\x00\x00\x00\x00")
+    except OSError:
+        pass
+    s.close()
+
+def tcp_connect_scan(targets, timeout=PORT_SCAN_TIMEOUT, concurrency=SCAN_CONCURRENCY, rate=SCAN_RATE):
+    """
+    (host, port) çiftlerini non-blocking soketlerle aynı anda tarar.
+    Tamamlanan her hedef için (host, port, durum, rtt) üretir; durum
+    "open", "closed" veya "filtered" olur. Sonuçlar bitiş sırasıyla gelir.
+    timeout: saniye ya da host -> saniye döndüren fonksiyon
+    concurrency: aynı anda bekleyen en fazla connect sayısı
+    rate: saniyede en fazla kaç connect başlatılacağı (0 = sınırsız)
+    """
+    concurrency = fd_budget(concurrency)
+    timeout_for = timeout if callable(timeout) else (lambda host: timeout)
+    interval = 1.0 / rate if rate else 0.0
+    targets = iter(targets)
+    backlog = []        # EMFILE vb. yüzünden geri konan hedefler
+    pending = {}        # fd -> (sock, host, port, t0, token)
+    deadlines = []      # heap: (deadline, token, fd)
+    token = 0
+    exhausted = False
+    next_send = time.monotonic()
+    sel = selectors.DefaultSelector()
+
+    def finish(fd):
+        s, host, port, t0, _ = pending.pop(fd)
+        sel.unregister(s)
+        return s, host, port, t0
+
+    try:
+        while True:
+            now = time.monotonic()
+            # --- yeni bağlantıları başlat ---
+            while len(pending) < concurrency and (not interval or now >= next_send):
+                if backlog:
+                    host, port = backlog.pop()
+                elif exhausted:
+                    break
+                else:
+                    try:
+                        host, port = next(targets)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                family = socket.AF_INET6 if ":" in host else socket.AF_INET
+                try:
+                    s = socket.socket(family, socket.SOCK_STREAM)
+                except OSError as e:
+                    if e.errno in (errno.EMFILE, errno.ENFILE, errno.ENOBUFS) and pending:
+                        backlog.append((host, port))
+                        concurrency = max(1, len(pending))
+                        break
+                    raise
+                s.setblocking(False)
+                t0 = time.monotonic()
+                err = s.connect_ex((host, port))
+                if interval:
+                    next_send = max(next_send + interval, now)
+                if err in _PENDING_ERRNOS:
+                    token += 1
+                    fd = s.fileno()
+                    pending[fd] = (s, host, port, t0, token)
+                    sel.register(s, selectors.EVENT_WRITE)
+                    heapq.heappush(deadlines, (t0 + timeout_for(host), token, fd))
+                elif err == 0:
+                    _close_rst(s)
+                    yield host, port, "open", time.monotonic() - t0
+                else:
+                    s.close()
+                    if err == errno.EADDRNOTAVAIL and pending:
+                        # yerel port havuzu doldu; biraz boşalmasını bekle
+                        backlog.append((host, port))
+                        break
+                    state = "closed" if err in _CLOSED_ERRNOS else "filtered"
+                    yield host, port, state, time.monotonic() - t0
+
+            if not pending:
+                if exhausted and not backlog:
+                    return
+                if interval:
+                    time.sleep(max(0.0, next_send - time.monotonic()))
+                continue
+
+            # --- olayları bekle ---
+            wait = deadlines[0][0] - time.monotonic() if deadlines else 0.05
+            if interval and len(pending) < concurrency and (backlog or not exhausted):
+                wait = min(wait, next_send - time.monotonic())
+            for key, _ in sel.select(max(0.0, wait)):
+                fd = key.fd
+                s, host, port, t0 = finish(fd)
+                err = s.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                rtt = time.monotonic() - t0
+                if err == 0:
+                    _close_rst(s)
+                    yield host, port, "open", rtt
+                else:
+                    s.close()
+                    yield host, port, ("closed" if err in _CLOSED_ERRNOS else "filtered"), rtt
+
+            # --- süresi dolanları kapat ---
+            now = time.monotonic()
+            while deadlines and deadlines[0][0] <= now:
+                _, tok, fd = heapq.heappop(deadlines)
+                entry = pending.get(fd)
+                if entry is None or entry[4] != tok:
+                    continue  # zaten tamamlanmış
+                s, host, port, t0 = finish(fd)
                 s.close()
-            except:
-                pass
+                yield host, port, "filtered", now - t0
+    finally:
+        for s, *_ in pending.values():
+            s.close()
+        sel.close()
+
+# ---------- Lokal port tarayıcı (safe, pure Python) ----------
+def scan_ports(host="127.0.0.1", port_range=(1,1024), timeout=PORT_SCAN_TIMEOUT,
+               concurrency=SCAN_CONCURRENCY, rate=SCAN_RATE):
+    start, end = port_range
+    print(f"\n== Lokal port taraması: {host} {start}-{end} (timeout={timeout}s) ==")
+    t0 = time.monotonic()
+    targets = ((host, port) for port in range(start, end+1))
+    open_ports = sorted(port for _, port, state, _ in
+                        tcp_connect_scan(targets, timeout, concurrency, rate)
+                        if state == "open")
     if open_ports:
         print("Açık portlar:", ", ".join(str(p) for p in open_ports))
     else:
         print("Açık port bulunamadı (tarama kısa, local).")
+    print(f"({end-start+1} port, {time.monotonic()-t0:.2f}s)")
+    return open_ports
+
+# ---------- Çoklu host / CIDR taraması ----------
+class RttEstimator:
+    """
+    RFC 6298 tarzı SRTT/RTTVAR takibi; host başına connect zaman aşımı verir.
+    Zaman aşımları örnek sayılmaz (Karn), yalnızca SYN-ACK/RST süreleri kullanılır.
+    """
+    def __init__(self, initial=PORT_SCAN_TIMEOUT, min_rto=ADAPTIVE_MIN_TIMEOUT, max_rto=ADAPTIVE_MAX_TIMEOUT):
+        self.initial = initial
+        self.min_rto = min_rto
+        self.max_rto = max_rto
+        self.srtt = None
+        self.rttvar = None
+        self.probes = 0
+
+    def sample(self, rtt):
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - rtt)
+            self.srtt = 0.875 * self.srtt + 0.125 * rtt
+
+    def timeout(self):
+        if self.srtt is None:
+            return self.initial
+        return min(self.max_rto, max(self.min_rto, self.srtt + 4 * self.rttvar))
+
+def parse_targets(spec):
+    """'127.0.0.0/30, 10.0.0.5 sunucu.lan' -> ['127.0.0.1', '127.0.0.2', '10.0.0.5', ...]"""
+    hosts, seen = [], set()
+    for tok in spec.replace(",", " ").split():
+        try:
+            if "/" in tok:
+                addrs = [str(a) for a in ipaddress.ip_network(tok, strict=False).hosts()]
+            else:
+                addrs = [str(ipaddress.ip_address(tok))]
+        except ValueError:
+            try:
+                addrs = [socket.getaddrinfo(tok, None, proto=socket.IPPROTO_TCP)[0][4][0]]
+            except socket.gaierror:
+                print(f"Hedef çözülemedi, atlanıyor: {tok}", file=sys.stderr)
+                continue
+        for a in addrs:
+            if a not in seen:
+                seen.add(a)
+                hosts.append(a)
+    return hosts
+
+def ip_order(host):
+    """Sıralama anahtarı: IPv4 ve IPv6 adresleri karışık olsa da karşılaştırılabilir."""
+    ip = ipaddress.ip_address(host)
+    return ip.version, ip
+
+def parse_ports(spec):
+    """'22,80,8000-8010' -> [22, 80, 8000, ..., 8010]"""
+    ports = set()
+    for tok in spec.replace(" ", "").split(","):
+        if not tok:
+            continue
+        if "-" in tok:
+            a, b = tok.split("-", 1)
+            ports.update(range(int(a), int(b) + 1))
+        else:
+            ports.add(int(tok))
+    return sorted(p for p in ports if 0 < p < 65536)
+
+def _interleave(hosts, ports):
+    # host'ları sırayla dolaş: bir host'un tüm portları bitmeden diğerleri bekletilmez
+    ports = list(ports)
+    for port in ports:
+        for host in hosts:
+            yield host, port
+
+def discover_hosts(hosts, estimators, ports=DISCOVERY_PORTS, timeout=DISCOVERY_TIMEOUT,
+                   concurrency=SCAN_CONCURRENCY, rate=SCAN_RATE):
+    """
+    Birkaç yaygın porta connect atarak canlı host'ları bulur. SYN-ACK veya RST
+    gelen her host canlıdır; gelen süreler RTT tahmincisini ısıtır.
+    Dönüş: (canlı host listesi, keşifte bulunan açık (host, port) kümesi)
+    """
+    alive, open_found = set(), set()
+    for host, port, state, rtt in tcp_connect_scan(_interleave(hosts, ports), timeout, concurrency, rate):
+        estimators[host].probes += 1
+        if state == "filtered":
+            continue
+        alive.add(host)
+        estimators[host].sample(rtt)
+        if state == "open":
+            open_found.add((host, port))
+    return [h for h in hosts if h in alive], open_found
+
+def multi_scan(hosts, ports, timeout=PORT_SCAN_TIMEOUT, concurrency=SCAN_CONCURRENCY,
+               rate=SCAN_RATE, discover=True, stats=None, scan_silent=False):
+    """
+    Birden çok host'u tek bir global zamanlayıcıda tarar ve yalnızca istenen
+    portlar için (host, port, durum, rtt) üretir. discover=True ise önce canlı
+    host'lar bulunur ve RTT'leri ölçülür. Keşifte hiç yanıt vermeyen host'lar
+    atlanır: /24 gibi seyrek bir ağda bunların her portu tam zaman aşımı
+    bekletir. SYN'i düşüren güvenlik duvarının arkasındaki host'lar için
+    scan_silent=True ile başlangıç zaman aşımıyla yine de taranırlar.
+    Zaman aşımı her host için ölçülen RTT'den uyarlanır.
+    stats (dict) verilirse canlı host sayısı, host başına zaman aşımı ve
+    toplam connect sayısı yazılır.
+    """
+    estimators = {h: RttEstimator(timeout) for h in hosts}
+    ports = list(ports)
+    port_set = set(ports)
+    done = set()
+    live = hosts
+    if discover and len(hosts) > 1:
+        disc_ports = [p for p in DISCOVERY_PORTS if p in port_set] or DISCOVERY_PORTS
+        live, open_found = discover_hosts(hosts, estimators, disc_ports,
+                                          max(timeout, DISCOVERY_TIMEOUT), concurrency, rate)
+        for host, port in sorted(open_found):
+            if port in port_set:
+                done.add((host, port))
+                yield host, port, "open", estimators[host].srtt or 0.0
+        # canlı host'larda keşif portlarının sonucu kesin, yeniden denenmez
+        done.update((h, p) for h in live for p in disc_ports)
+        if not scan_silent:
+            hosts = live
+    targets = ((h, p) for h, p in _interleave(hosts, ports) if (h, p) not in done)
+    for host, port, state, rtt in tcp_connect_scan(targets, lambda h: estimators[h].timeout(),
+                                                   concurrency, rate):
+        estimators[host].probes += 1
+        if state != "filtered":
+            estimators[host].sample(rtt)
+        yield host, port, state, rtt
+    if stats is not None:
+        stats["live_hosts"] = len(live)
+        stats["timeouts"] = {h: estimators[h].timeout() for h in hosts}
+        stats["probes"] = sum(e.probes for e in estimators.values())
+
+# ---------- Banner / servis tespiti ----------
+# Servis konuşmazsa gönderilecek aktif problar
+PROBES = {
+    "http": b"HEAD / HTTP/1.0\r\nHost: scanN\r\n\r\n",
+    "redis": b"PING\r\n",
+    "postgres": b"\x00\x00\x00\x08\x04\xd2\x16\x2f",  # SSLRequest
+}
+# bilinen portlarda pasif beklemeden direkt prob gönder
+PORT_PROBES = {
+    80: "http", 81: "http", 443: "http", 591: "http", 3000: "http", 5000: "http", 8000: "http",
+    8008: "http", 8080: "http", 8081: "http", 8443: "http", 8888: "http", 9000: "http",
+    6379: "redis", 5432: "postgres",
+}
+# (servis, gerekli prob veya None = pasif banner, derlenmiş desen); ilk eşleşen kazanır
+SIGNATURES = [
+    ("ssh", None, re.compile(rb"^SSH-[\d.]+-([^\r\n]*)")),
+    ("smtp", None, re.compile(rb"^220[ -]([^\r\n]*(?:SMTP|Postfix|Exim|Sendmail)[^\r\n]*)", re.I)),
+    ("ftp", None, re.compile(rb"^220[ -]([^\r\n]*(?:FTP|FileZilla)[^\r\n]*)", re.I)),
+    ("pop3", None, re.compile(rb"^\+OK ?([^\r\n]*)")),
+    ("imap", None, re.compile(rb"^\* OK ?([^\r\n]*)")),
+    ("mysql", None, re.compile(rb"^.{4}\x0a([\w.~+-]+)\x00", re.S)),
+    ("vnc", None, re.compile(rb"^(RFB \d{3}\.\d{3})")),
+    ("telnet", None, re.compile(rb"^\xff[\xfb-\xfe]")),
+    ("http", None, re.compile(rb"^HTTP/\d\.\d \d{3}.*?(?:^Server: *([^\r\n]+))?", re.S | re.M)),
+    ("http", "http", re.compile(rb"^HTTP/\d\.\d (\d{3})")),
+    ("redis", "redis", re.compile(rb"^(\+PONG|-NOAUTH|-DENIED)")),
+    ("postgres", "postgres", re.compile(rb"^([SN])$")),
+    ("smtp", None, re.compile(rb"^(220[ -][^\r\n]*)")),  # genel 220 karşılaması
+]
+_HTTP_SERVER = re.compile(rb"^Server: *([^\r\n]+)", re.M | re.I)
+
+def fingerprint(data, probe=None):
+    """Banner baytlarını imza tablosuyla eşler -> (servis, ayrıntı) veya (None, ilk satır)."""
+    for name, need, rx in SIGNATURES:
+        if need is not None and need != probe:
+            continue
+        m = rx.search(data)
+        if m:
+            if name == "http":
+                srv = _HTTP_SERVER.search(data)
+                detail = srv.group(1) if srv else data.split(b"\r\n", 1)[0]
+            else:
+                detail = m.group(1) if m.groups() and m.group(1) else b""
+            return name, detail.decode("latin-1").strip()
+    first = data.split(b"\n", 1)[0][:60]
+    return None, first.decode("latin-1").strip()
+
+def grab_banner(host, port, timeout=BANNER_TIMEOUT, passive=BANNER_PASSIVE):
+    """
+    Porta bağlanıp ilk baytları okur; servis önce konuşmazsa porta uygun
+    (yoksa HTTP) probunu gönderir. Toplam süre timeout ile sınırlıdır.
+    Dönüş: (host, port, servis, ayrıntı)
+    """
+    deadline = time.monotonic() + timeout
+    data, probe = b"", PORT_PROBES.get(port)
+    try:
+        with socket.create_connection((host, port), timeout=timeout) as s:
+            if probe is None:
+                s.settimeout(max(0.01, min(passive, deadline - time.monotonic())))
+                try:
+                    data = s.recv(BANNER_BYTES)
+                except socket.timeout:
+                    probe = "http"
+            if probe is not None:
+                s.sendall(PROBES[probe])
+            # satır protokolleri tek okumada biter (pasif banner dahil); HTTP başlık sonunu bekle
+            while len(data) < BANNER_BYTES and (not data or data.startswith(b"HTTP/")
+                                                and b"\r\n\r\n" not in data):
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    break
+                s.settimeout(left)
+                chunk = s.recv(BANNER_BYTES - len(data))
+                if not chunk:
+                    break
+                data += chunk
+    except OSError:
+        pass
+    svc, detail = fingerprint(data, probe)
+    return host, port, svc, detail
+
+def scan_with_banners(hosts, ports, timeout=PORT_SCAN_TIMEOUT, concurrency=SCAN_CONCURRENCY,
+                      rate=SCAN_RATE, discover=True, stats=None, workers=BANNER_WORKERS,
+                      banner_timeout=BANNER_TIMEOUT, scan_silent=False):
+    """
+    multi_scan ile aynı tarama; bulunan her açık port anında sınırlı bir
+    banner havuzuna gönderilir. Tespitler tarama sürerken (host, port, servis,
+    ayrıntı) olarak üretilir, tarama bitince yalnızca süren problar beklenir.
+    """
+    done_q = queue.SimpleQueue()
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        inflight = 0
+        for host, port, state, _ in multi_scan(hosts, ports, timeout, concurrency, rate, discover, stats,
+                                               scan_silent):
+            if state == "open":
+                ex.submit(grab_banner, host, port, banner_timeout).add_done_callback(done_q.put)
+                inflight += 1
+            while not done_q.empty():
+                inflight -= 1
+                yield done_q.get().result()
+        while inflight:
+            inflight -= 1
+            yield done_q.get().result()
+
+def collect_scan(spec, port_spec="1-1024", timeout=PORT_SCAN_TIMEOUT, concurrency=SCAN_CONCURRENCY,
+                 rate=SCAN_RATE, discover=True, banners=False, scan_silent=False):
+    """Taramayı yapar, sonucu JSON'a uygun sözlük olarak döndürür (ekrana yazmaz)."""
+    hosts = parse_targets(spec)
+    ports = parse_ports(port_spec)
+    stats = {}
+    found = {}
+    if banners:
+        for host, port, svc, detail in scan_with_banners(hosts, ports, timeout, concurrency, rate, discover, stats,
+                                                         scan_silent=scan_silent):
+            found.setdefault(host, {})[port] = {"service": svc, "detail": detail}
+    else:
+        for host, port, state, _ in multi_scan(hosts, ports, timeout, concurrency, rate, discover, stats,
+                                               scan_silent):
+            if state == "open":
+                found.setdefault(host, {})[port] = {}
+    return {
+        "hosts": len(hosts), "ports": len(ports), "live_hosts": stats.get("live_hosts", 0),
+        "probes": stats.get("probes", 0), "timeout": timeout,
+        "open": {h: {p: found[h][p] for p in sorted(found[h])}
+                 for h in sorted(found, key=ip_order)},
+        "timeouts": {h: round(t, 4) for h, t in stats.get("timeouts", {}).items() if h in found},
+    }
+
+def print_scan(res, elapsed=None):
+    print(f"\n== Port taraması: {res['hosts']} host x {res['ports']} port "
+          f"(uyarlanır timeout, başlangıç {res['timeout']}s) ==")
+    for host, ports in res["open"].items():
+        print(f" {host:15} (timeout {res['timeouts'].get(host, res['timeout'])*1000:.0f}ms) açık: "
+              + ", ".join(str(p) for p in ports))
+        for port, info in ports.items():
+            if info:
+                print(f"   {port:>5}/tcp  {info['service'] or '?':9} {info['detail']}")
+    if not res["open"]:
+        print(" Açık port bulunamadı.")
+    took = f", {elapsed:.2f}s" if elapsed is not None else ""
+    print(f"({res['live_hosts']} canlı host{took})")
+
+# ---------- UDP taraması ----------
+def _snmp_get_sysdescr():
+    # SNMPv1 GetRequest, community "public", OID 1.3.6.1.2.1.1.1.0 (sysDescr)
+    vb = b"\x30\x0c\x06\x08\x2b\x06\x01\x02\x01\x01\x01\x00\x05\x00"
+    pdu = b"\x02\x04\x00\x00\x53\x4e\x02\x01\x00\x02\x01\x00" + b"\x30" + bytes([len(vb)]) + vb
+    body = b"\x02\x01\x00\x04\x06public" + b"\xa0" + bytes([len(pdu)]) + pdu
+    return b"\x30" + bytes([len(body)]) + body
+
+_DNS_QUERY = b"\x53\x4e\x01\x00\x00\x01\x00\x00\x00\x00\x00\x00\x00\x00\x02\x00\x01"  # ". NS"
+# port -> yanıt almak için protokole özgü yük (yoksa boş datagram gönderilir)
+UDP_PAYLOADS = {
+    53: _DNS_QUERY,
+    5353: _DNS_QUERY,
+    69: b"\x00\x01scanN\x00octet\x00",                       # TFTP RRQ
+    123: b"\xe3" + b"\x00" * 47,                             # NTPv4 client
+    137: (b"\x80\xf0\x00\x00\x00\x01\x00\x00\x00\x00\x00\x00"
+          b"\x20CKAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA\x00\x00\x21\x00\x01"),  # NBSTAT
+    161: _snmp_get_sysdescr(),
+    1900: b"M-SEARCH * HTTP/1.1\r\nHOST: 239.255.255.250:1900\r\nMAN: \"ssdp:discover\"\r\nMX: 1\r\nST: ssdp:all\r\n\r\n",
+    11211: b"\x53\x4e\x00\x00\x00\x01\x00\x00stats\r\n",    # memcached UDP
+}
+# ICMP host/ağ erişilemez, yasaklı vb. -> filtered
+_UDP_FILTERED_ERRNOS = {errno.EHOSTUNREACH, errno.ENETUNREACH, errno.EACCES, errno.EPERM}
+
+class IcmpPacer:
+    """
+    UDP gönderim hızını ICMP port-unreachable yanıtlarına göre ayarlar.
+    Çekirdek ICMP hata üretimini sınırlar (net.ipv4.icmp_ratelimit,
+    icmp_msgs_per_sec); sınır aşılınca kapalı portlar sessiz kalır ve
+    yanlışlıkla open|filtered görünür. İlk denemede sessiz kalıp tekrar
+    denemede ICMP dönen port bu düşüşün kanıtıdır: o pencerede hız gözlenen
+    yanıt hızına indirilir, düşüş yoksa hız kademeli olarak artırılır.
+    """
+    def __init__(self, rate=UDP_RATE, min_rate=UDP_MIN_RATE, max_rate=UDP_MAX_RATE, window=0.25):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.window = window
+        self.limited = False
+        self.history = []
+        self._reset(time.monotonic())
+
+    def _reset(self, now):
+        self.t0 = now
+        self.answers = self.late_icmp = 0
+
+    def answered(self, attempt, icmp):
+        self.answers += 1
+        if icmp and attempt > 0:
+            self.late_icmp += 1
+
+    def tick(self, now):
+        elapsed = now - self.t0
+        if elapsed < self.window:
+            return
+        if self.late_icmp:
+            self.limited = True
+            self.rate = max(self.min_rate, min(self.rate, self.answers / elapsed))
+        else:
+            self.rate = min(self.max_rate, self.rate * 1.5)
+        self.history.append(round(self.rate, 1))
+        self._reset(now)
+
+def udp_scan(targets, timeout=UDP_TIMEOUT, retries=UDP_RETRIES, concurrency=UDP_CONCURRENCY,
+             pacer=None):
+    """
+    (host, port) çiftlerine non-blocking, bağlı (connect edilmiş) UDP soketleriyle
+    prob gönderir; bağlı soket ICMP port-unreachable'ı ECONNREFUSED olarak alır.
+    (host, port, durum, yanıt) üretir; durum "open", "closed", "filtered" veya
+    yanıt gelmediyse "open|filtered". Gönderim hızı pacer (IcmpPacer) belirler.
+    """
+    pacer = pacer or IcmpPacer()
+    concurrency = fd_budget(concurrency)
+    targets = iter(targets)
+    queue_ = deque()        # yeniden denenecek (host, port, attempt)
+    pending = {}            # fd -> [sock, host, port, attempt, token]
+    deadlines = []          # heap: (deadline, token, fd)
+    token = 0
+    exhausted = False
+    next_send = time.monotonic()
+    sel = selectors.DefaultSelector()
+
+    def drop(fd):
+        s, host, port, attempt, _ = pending.pop(fd)
+        sel.unregister(s)
+        s.close()
+        return host, port, attempt
+
+    try:
+        while True:
+            now = time.monotonic()
+            while len(pending) < concurrency and now >= next_send:
+                if queue_:
+                    host, port, attempt = queue_.popleft()
+                elif not exhausted:
+                    try:
+                        host, port = next(targets)
+                        attempt = 0
+                    except StopIteration:
+                        exhausted = True
+                        continue
+                else:
+                    break
+                family = socket.AF_INET6 if ":" in host else socket.AF_INET
+                s = socket.socket(family, socket.SOCK_DGRAM)
+                s.setblocking(False)
+                try:
+                    s.connect((host, port))
+                    s.send(UDP_PAYLOADS.get(port, b""))
+                except OSError as e:
+                    s.close()
+                    if e.errno == errno.ECONNREFUSED:
+                        pacer.answered(attempt, True)
+                        yield host, port, "closed", None
+                    else:
+                        yield host, port, "filtered" if e.errno in _UDP_FILTERED_ERRNOS else "open|filtered", None
+                    continue
+                token += 1
+                pending[s.fileno()] = [s, host, port, attempt, token]
+                sel.register(s, selectors.EVENT_READ)
+                heapq.heappush(deadlines, (now + timeout * (attempt + 1), token, s.fileno()))
+                next_send = max(next_send + 1.0 / pacer.rate, now)
+                now = time.monotonic()
+
+            if not pending:
+                if exhausted and not queue_:
+                    return
+                time.sleep(max(0.0, next_send - time.monotonic()))
+                continue
+
+            wait_s = deadlines[0][0] - time.monotonic()
+            if len(pending) < concurrency and (queue_ or not exhausted):
+                wait_s = min(wait_s, next_send - time.monotonic())
+            for key, _ in sel.select(max(0.0, wait_s)):
+                s = key.fileobj
+                attempt = pending[key.fd][3]
+                try:
+                    data = s.recv(512)
+                    state, icmp = "open", False
+                except OSError as e:
+                    data = None
+                    state = ("closed" if e.errno == errno.ECONNREFUSED else
+                             "filtered" if e.errno in _UDP_FILTERED_ERRNOS else "open|filtered")
+                    icmp = True
+                host, port, _ = drop(key.fd)
+                pacer.answered(attempt, icmp)
+                yield host, port, state, data
+
+            now = time.monotonic()
+            while deadlines and deadlines[0][0] <= now:
+                _, tok, fd = heapq.heappop(deadlines)
+                entry = pending.get(fd)
+                if entry is None or entry[4] != tok:
+                    continue
+                host, port, attempt = drop(fd)
+                if attempt < retries:
+                    queue_.append((host, port, attempt + 1))
+                else:
+                    yield host, port, "open|filtered", None
+            pacer.tick(now)
+    finally:
+        for s, *_ in pending.values():
+            s.close()
+        sel.close()
+
+def collect_udp_scan(spec, port_spec=UDP_DEFAULT_PORTS,
+                     timeout=UDP_TIMEOUT, retries=UDP_RETRIES, rate=UDP_RATE):
+    """UDP taramasını yapıp JSON'a uygun sözlük döndürür; yalnızca closed olmayanlar listelenir."""
+    hosts = parse_targets(spec)
+    ports = parse_ports(port_spec)
+    pacer = IcmpPacer(rate)
+    found, counts = {}, {}
+    for host, port, state, data in udp_scan(_interleave(hosts, ports), timeout, retries, pacer=pacer):
+        counts[state] = counts.get(state, 0) + 1
+        if state != "closed":
+            found.setdefault(host, {})[port] = {"state": state,
+                                                "reply": data[:32].hex() if data else None}
+    return {
+        "hosts": len(hosts), "ports": len(ports), "counts": counts,
+        "icmp_limited": pacer.limited, "final_rate": round(pacer.rate, 1), "rate_history": pacer.history,
+        "ports_by_host": {h: {p: found[h][p] for p in sorted(found[h])}
+                          for h in sorted(found, key=ip_order)},
+    }
+
+def print_udp_scan(res, elapsed=None):
+    print(f"\n== UDP taraması: {res['hosts']} host x {res['ports']} port ==")
+    for host, ports in res["ports_by_host"].items():
+        for port, info in ports.items():
+            print(f" {host:15} {port:>5}/udp  {info['state']}")
+    if not res["ports_by_host"]:
+        print(" Açık/filtrelenmiş UDP portu yok (hepsi ICMP ile kapalı).")
+    took = f", {elapsed:.2f}s" if elapsed is not None else ""
+    limit = f", ICMP hız sınırı algılandı -> {res['final_rate']}/s" if res["icmp_limited"] else ""
+    print(f"({', '.join(f'{k}={v}' for k, v in sorted(res['counts'].items()))}{limit}{took})")
 
 # ---------- SSH config kontrolü ----------
-def check_ssh_config():
-    print("\n== SSH (/etc/ssh/sshd_config) kontrolü ==")
-    path = "/etc/ssh/sshd_config"
+SSH_CONFIG_PATH = "/etc/ssh/sshd_config"
+SSH_OPTIONS = ("PermitRootLogin", "PasswordAuthentication", "Port", "PermitEmptyPasswords", "ChallengeResponseAuthentication")
+
+def read_ssh_config(path=SSH_CONFIG_PATH):
+    """sshd_config'ten SSH_OPTIONS satırlarını okur; dosya yoksa None, hata varsa {"error": ...}."""
     if not os.path.exists(path):
-        print("sshd_config bulunamadı.")
-        return
+        return None
     try:
         with open(path, "r", errors="ignore") as f:
             lines = f.read().splitlines()
-        def find_opt(opt):
-            for ln in lines:
-                s = ln.strip()
-                if not s or s.startswith("#"):
-                    continue
-                if s.lower().startswith(opt.lower()):
-                    return s
-            return None
-        print("Örnek ayarlar (varsa):")
-        for opt in ("PermitRootLogin", "PasswordAuthentication", "Port", "PermitEmptyPasswords", "ChallengeResponseAuthentication"):
-            val = find_opt(opt)
-            print(f" {opt}: {val if val else '(yok veya yorumlanmış)'}")
     except Exception as e:
-        print("Okuma hatası:", e)
+        return {"error": str(e)}
+    def find_opt(opt):
+        for ln in lines:
+            s = ln.strip()
+            if not s or s.startswith("#"):
+                continue
+            if s.lower().startswith(opt.lower()):
+                return s
+        return None
+    return {opt: find_opt(opt) for opt in SSH_OPTIONS}
+
+def check_ssh_config(opts=...):
+    print("\n== SSH (/etc/ssh/sshd_config) kontrolü ==")
+    if opts is ...:
+        opts = read_ssh_config()
+    if opts is None:
+        print("sshd_config bulunamadı.")
+        return opts
+    if "error" in opts:
+        print("Okuma hatası:", opts["error"])
+        return opts
+    print("Örnek ayarlar (varsa):")
+    for opt, val in opts.items():
+        print(f" {opt}: {val if val else '(yok veya yorumlanmış)'}")
+    return opts
+
+# ---------- Dosya sistemi denetimi (tek geçiş, paralel) ----------
+AuditFinding = namedtuple("AuditFinding", "rule path mode")
+
+# kural -> açıklama (rapor başlıklarında kullanılır)
+AUDIT_RULES = {
+    "suid": "SUID bitli dosya",
+    "sgid": "SGID bitli dosya",
+    "ww_dir": "World-writable dir",
+    "ww_file": "World-writable dosya",
+    "ww_nosticky": "Sticky bit'siz world-writable dir",
+}
+
+def _audit_mode(path, mode, is_dir, out):
+    if is_dir:
+        if mode & 0o002:
+            out.append(AuditFinding("ww_dir", path, mode))
+            if not mode & 0o1000:
+                out.append(AuditFinding("ww_nosticky", path, mode))
+    elif stat.S_ISREG(mode):
+        if mode & 0o4000:
+            out.append(AuditFinding("suid", path, mode))
+        if mode & 0o2000 and mode & 0o010:  # g+s ve g-x: zorunlu kilit, SGID değil
+            out.append(AuditFinding("sgid", path, mode))
+        if mode & 0o002:
+            out.append(AuditFinding("ww_file", path, mode))
+
+def _audit_dir(path, depth, depth_limit, dev, prev=None):
+    """
+    Tek dizini tarar. prev (önceki baseline kaydı) verilmişse ve dizinin
+    mtime'ı değişmemişse scandir yapılmaz; kayıttaki her giriş lstat ile
+    yeniden okunur ve mode/ctime karşılaştırılır (chmod yalnızca dosyanın
+    ctime'ını değiştirir, dizinin mtime'ını değil).
+    Dönüş: (kayıt, bulgular, değişiklikler, sayaçlar)
+    kayıt = [mtime_ns, {isim: [ino, mode, mtime_ns, size, ctime_ns]}, [alt dizin isimleri]]
+    """
+    counts = {"scandir": 0, "lstat": 0, "reused": 0}
+    findings, changes = [], []
+    if prev is not None:
+        try:
+            dst = os.lstat(path)
+            counts["lstat"] += 1
+        except OSError:
+            return None, findings, changes, counts
+        if dst.st_mtime_ns == prev[0]:
+            entries, mode_changes = {}, []
+            for name, old in prev[1].items():
+                fp = os.path.join(path, name)
+                try:
+                    st = os.lstat(fp)
+                    counts["lstat"] += 1
+                except OSError:
+                    break  # mtime aynı ama giriş yok: dizini baştan oku
+                if st.st_ino != old[0]:
+                    break
+                ent = old if st.st_ctime_ns == old[4] else \
+                    [st.st_ino, st.st_mode, st.st_mtime_ns, st.st_size, st.st_ctime_ns]
+                if ent[1] != old[1]:
+                    mode_changes.append(("mode", fp, old[1], ent[1]))
+                entries[name] = ent
+                _audit_mode(fp, ent[1], stat.S_ISDIR(ent[1]), findings)
+            else:
+                counts["reused"] += 1
+                changes.extend(mode_changes)
+                return [prev[0], entries, prev[2]], findings, changes, counts
+            findings = []
+        mtime = dst.st_mtime_ns
+    else:
+        mtime = None
+    entries, subdirs = {}, []
+    try:
+        it = os.scandir(path)
+        counts["scandir"] += 1
+    except OSError:
+        return None, findings, changes, counts
+    with it:
+        for e in it:
+            try:
+                if e.is_symlink():
+                    continue  # d_type'tan gelir, ek syscall yok
+                st = e.stat(follow_symlinks=False)
+                counts["lstat"] += 1
+            except OSError:
+                continue
+            mode = st.st_mode
+            is_dir = stat.S_ISDIR(mode)
+            entries[e.name] = [st.st_ino, mode, st.st_mtime_ns, st.st_size, st.st_ctime_ns]
+            _audit_mode(e.path, mode, is_dir, findings)
+            if is_dir and st.st_dev == dev and (depth_limit is None or depth + 1 < depth_limit):
+                subdirs.append(e.name)
+    if mtime is None:
+        try:
+            mtime = os.lstat(path).st_mtime_ns
+            counts["lstat"] += 1
+        except OSError:
+            mtime = 0
+    if prev is not None:
+        old = prev[1]
+        for name, ent in entries.items():
+            o = old.get(name)
+            if o is None:
+                changes.append(("added", os.path.join(path, name), None, ent[1]))
+            elif o[1] != ent[1]:
+                changes.append(("mode", os.path.join(path, name), o[1], ent[1]))
+        for name, o in old.items():
+            if name not in entries:
+                changes.append(("removed", os.path.join(path, name), o[1], None))
+    return [mtime, entries, subdirs], findings, changes, counts
+
+def audit_walk(roots, workers=AUDIT_WORKERS, baseline=None):
+    """
+    Verilen kökleri tek geçişte dolaşır ve tüm AUDIT_RULES kurallarını
+    aynı lstat sonucu üzerinde değerlendirir. Dizinler thread havuzuna
+    dağıtılır, kökün dosya sisteminin dışına çıkılmaz.
+    roots: (yol, derinlik_limiti) çiftleri; limit None ise sınırsız.
+    baseline: load_baseline() çıktısı; verilirse yalnızca mtime'ı değişen
+    dizinler yeniden okunur (scandir), diğerlerinde kayıtlı girişler lstat
+    ile kontrol edilir ve "changes" listesi doldurulur.
+    Dönüş: {"findings", "changes", "tree", "dirs", "scandir", "lstat", "reused", "elapsed"}
+    """
+    t0 = time.monotonic()
+    prev_tree = baseline["dirs"] if baseline else {}
+    findings, changes, tree = [], [], {}
+    counts = {"dirs": 0, "scandir": 0, "lstat": 0, "reused": 0}
+    seen, submitted = set(), set()
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        running = set()
+
+        def submit(path, depth, depth_limit, dev):
+            if path in submitted:
+                return  # iç içe kökler: her dizin bir kez
+            submitted.add(path)
+            prev = prev_tree.get(path)
+            if baseline and prev is None:
+                prev = [None, {}, []]  # yeni dizin: tüm girişler "added"
+            fut = ex.submit(_audit_dir, path, depth, depth_limit, dev, prev)
+            fut.meta = (path, depth, depth_limit, dev)
+            running.add(fut)
+
+        for root, depth_limit in roots:
+            try:
+                st = os.lstat(root)
+            except OSError:
+                continue
+            counts["lstat"] += 1
+            if not stat.S_ISDIR(st.st_mode) or (st.st_dev, st.st_ino) in seen:
+                continue
+            seen.add((st.st_dev, st.st_ino))  # /bin -> /usr/bin gibi tekrarları atla
+            _audit_mode(root, st.st_mode, True, findings)
+            if depth_limit is None or depth_limit > 0:
+                submit(root, 0, depth_limit, st.st_dev)
+        while running:
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                path, depth, depth_limit, dev = fut.meta
+                rec, found, changed, c = fut.result()
+                counts["dirs"] += 1
+                for k, v in c.items():
+                    counts[k] += v
+                findings.extend(found)
+                changes.extend(changed)
+                if rec is None:
+                    continue
+                tree[path] = rec
+                for name in rec[2]:
+                    submit(os.path.join(path, name), depth + 1, depth_limit, dev)
+    findings.sort(key=lambda f: f.path)
+    changes.sort(key=lambda c: c[1])
+    counts.update(findings=findings, changes=changes, tree=tree,
+                  elapsed=time.monotonic() - t0)
+    return counts
+
+# ---------- Baseline (artımlı denetim) ----------
+BASELINE_VERSION = 2  # 2: girişlere ctime_ns eklendi
+
+def default_baseline_path():
+    cache = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(cache, "scanN", "baseline.json.gz")
+
+def load_baseline(path, roots):
+    """Baseline'ı okur; sürüm veya kök listesi farklıysa None döndürür."""
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError, EOFError):
+        return None
+    if data.get("version") != BASELINE_VERSION or data.get("roots") != [list(r) for r in roots]:
+        return None
+    return data
+
+def save_baseline(path, roots, audit):
+    """Denetim ağacını sıkıştırılmış JSON olarak atomik biçimde yazar."""
+    data = {"version": BASELINE_VERSION, "created": datetime.now().isoformat(timespec="seconds"),
+            "roots": [list(r) for r in roots], "dirs": audit["tree"]}
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=6) as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp, path)
+    except OSError as e:
+        print("Baseline kaydedilemedi:", e, file=sys.stderr)
+
+def report_baseline_changes(audit, baseline, rebuilt=False):
+    print("\n== Baseline karşılaştırması ==")
+    if baseline is None:
+        print(" Baseline tam taramayla yeniden yazıldı." if rebuilt else
+              " Önceki baseline yok; yeni baseline oluşturuldu.")
+        return
+    print(f" Baseline: {baseline.get('created', '?')}  "
+          f"(yeniden okunan dizin: {audit['scandir']}, değişmeyen: {audit['reused']})")
+    if not audit["changes"]:
+        print(" Değişiklik yok.")
+        return
+    for kind, path, old, new in audit["changes"]:
+        if kind == "added":
+            print(f"  + {stat.filemode(new)} {path}")
+        elif kind == "removed":
+            print(f"  - {stat.filemode(old)} {path}")
+        else:
+            print(f"  ~ {stat.filemode(old)} -> {stat.filemode(new)} {path}")
+
+def default_audit_roots(checks=("ww", "suid")):
+    """Seçili kontrollerin (ww, suid) denetim kökleri; baseline'daki kök listesiyle aynı sırada."""
+    return (([(p, None) for p in SUID_SEARCH_PATHS] if "suid" in checks else []) +
+            ([(p, WORLD_WRITABLE_DEPTH) for p in WORLD_WRITABLE_PATHS] if "ww" in checks else []))
+
+def audit_benchmark(n_entries=1_000_000, per_dir=1000, base=None):
+    """
+    Sentetik bir ağaç (n_entries giriş) kurar, audit_walk ile eski
+    os.walk + os.stat yolunu karşılaştırıp süre ve syscall sayılarını yazdırır.
+    """
+    import shutil
+    import tempfile
+    base = tempfile.mkdtemp(prefix="scann_audit_", dir=base)
+    try:
+        print(f"Sentetik ağaç kuruluyor: {n_entries} giriş -> {base}")
+        t0 = time.monotonic()
+        made = 0
+        d = 0
+        while made < n_entries:
+            sub = os.path.join(base, f"d{d // 32:04d}", f"d{d:05d}")
+            os.makedirs(sub)
+            made += 1
+            for i in range(min(per_dir, n_entries - made)):
+                fp = os.path.join(sub, f"f{i}")
+                os.close(os.open(fp, os.O_CREAT | os.O_WRONLY, 0o644))
+                if i == 0:
+                    os.chmod(fp, 0o4755 if d % 2 else 0o666)
+                made += 1
+            if d % 50 == 0:
+                os.chmod(sub, 0o777)
+            d += 1
+        print(f" kurulum: {time.monotonic()-t0:.1f}s")
+
+        res = audit_walk([(base, None)])
+        by_rule = {}
+        for f in res["findings"]:
+            by_rule[f.rule] = by_rule.get(f.rule, 0) + 1
+        print(f" audit_walk : {res['elapsed']:.2f}s  scandir={res['scandir']}  lstat={res['lstat']}  bulgular={by_rule}")
+
+        t0 = time.monotonic()
+        nstat = nscan = 0
+        for root, dirs, files in os.walk(base):
+            nscan += 1
+            for fn in dirs + files:  # eski check_suid + check_world_writable toplamı
+                try:
+                    os.stat(os.path.join(root, fn))
+                    nstat += 1
+                except OSError:
+                    pass
+        print(f" os.walk+stat: {time.monotonic()-t0:.2f}s  scandir={nscan}  stat={nstat}  (tek kural seti)")
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
 
 # ---------- World-writable kontrolü ----------
-def check_world_writable(paths=WORLD_WRITABLE_PATHS, depth_limit=2):
+def check_world_writable(paths=WORLD_WRITABLE_PATHS, depth_limit=WORLD_WRITABLE_DEPTH, audit=None):
     print("\n== World-writable dizin / örnek dosyalar (ilk derinlikler) ==")
+    if audit is None:
+        audit = audit_walk([(p, depth_limit) for p in paths])
     for root in paths:
         if not os.path.isdir(root):
             print(f" {root} yok.")
-            continue
-        print(f" Aranıyor: {root} (derinlik <= {depth_limit})")
-        for cur_root, dirs, files in os.walk(root):
-            level = cur_root[len(root):].count(os.sep)
-            if level > depth_limit:
-                dirs[:] = []  # derinliği sınırlamak için
-                continue
-            try:
-                mode = os.stat(cur_root).st_mode
-                if mode & 0o002:
-                    print(f"  World-writable dir: {cur_root}")
-            except Exception:
-                pass
+    for f in audit["findings"]:
+        if f.rule in ("ww_dir", "ww_file", "ww_nosticky"):
+            print(f"  {AUDIT_RULES[f.rule]}: {f.path} ({stat.filemode(f.mode)})")
 
 # ---------- SUID bitli dosyaları bul (sınırlı yollar) ----------
-def check_suid(paths=SUID_SEARCH_PATHS, max_results=80):
-    print("\n== SUID bitli dosyalar (sınırlı tarama) ==")
-    results = []
-    for p in paths:
-        if not os.path.isdir(p):
-            continue
-        for root, dirs, files in os.walk(p):
-            for fn in files:
-                fp = os.path.join(root, fn)
-                try:
-                    st = os.stat(fp)
-                    if st.st_mode & 0o4000:
-                        results.append(fp)
-                        if len(results) >= max_results:
-                            break
-                except Exception:
-                    pass
-            if len(results) >= max_results:
-                break
-        if len(results) >= max_results:
-            break
+def check_suid(paths=SUID_SEARCH_PATHS, max_results=80, audit=None):
+    print("\n== SUID / SGID bitli dosyalar (sınırlı tarama) ==")
+    if audit is None:
+        audit = audit_walk([(p, None) for p in paths])
+    results = [f for f in audit["findings"] if f.rule in ("suid", "sgid")]
     if results:
-        for r in results[:max_results]:
-            print(" ", r)
+        for f in results[:max_results]:
+            print(f"  {f.rule.upper():5} {stat.filemode(f.mode)} {f.path}")
         if len(results) > max_results:
             print(f" ... ve daha fazla ({len(results)-max_results} adet) ...")
     else:
@@ -170,7 +1143,141 @@ def suggestions():
     print("- SUID dosyalarını inceleyin; gereksizse izinleri kısıtlayın.")
     print("- Sistem güncellemelerini düzenli uygulayın.")
 
+# ---------- Faz ölçümü ----------
+def _proc_io():
+    """/proc/self/io -> (read sınıfı syscall, write sınıfı syscall); okunamazsa (0, 0)."""
+    try:
+        with open("/proc/self/io") as f:
+            c = dict(line.split(":", 1) for line in f)
+        return int(c["syscr"]), int(c["syscw"])
+    except (OSError, KeyError, ValueError):
+        return 0, 0
+
+def _io_overhead():
+    # _proc_io'nun kendi open/read çağrıları ölçüme karışmasın
+    a = _proc_io()
+    b = _proc_io()
+    return b[0] - a[0], b[1] - a[1]
+
+_IO_OVERHEAD = _io_overhead()
+
+@contextmanager
+def phase(name, phases):
+    """
+    Bloğun duvar saati, CPU süresi (tüm thread'ler), read/write syscall sayısı
+    (/proc/self/io) ve bağlam değişimlerini ölçüp phases listesine ekler.
+    Faz kendi iş sayaçlarını (connect, lstat...) dönen sözlüğe yazabilir.
+    """
+    rec = {"name": name}
+    ru0 = resource.getrusage(resource.RUSAGE_SELF)
+    r0, w0 = _proc_io()
+    c0, t0 = time.process_time(), time.perf_counter()
+    try:
+        yield rec
+    finally:
+        wall, cpu = time.perf_counter() - t0, time.process_time() - c0
+        r1, w1 = _proc_io()
+        ru1 = resource.getrusage(resource.RUSAGE_SELF)
+        rec.update(wall_s=round(wall, 6), cpu_s=round(cpu, 6),
+                   syscalls={"read": max(0, r1 - r0 - _IO_OVERHEAD[0]),
+                             "write": max(0, w1 - w0 - _IO_OVERHEAD[1])},
+                   ctx_switches=(ru1.ru_nvcsw - ru0.ru_nvcsw) + (ru1.ru_nivcsw - ru0.ru_nivcsw))
+        phases.append(rec)
+
+def print_phases(phases):
+    print("\n== Faz süreleri ==")
+    print(f" {'FAZ':16} {'DUVAR':>9} {'CPU':>9} {'READ':>8} {'WRITE':>8}  İŞ")
+    for p in phases:
+        ops = ", ".join(f"{k}={v}" for k, v in p.get("ops", {}).items())
+        print(f" {p['name']:16} {p['wall_s']:8.3f}s {p['cpu_s']:8.3f}s "
+              f"{p['syscalls']['read']:8} {p['syscalls']['write']:8}  {ops}")
+
 # ---------- Ana akış ----------
+CHECKS = ("proc", "ports", "udp", "ssh", "ww", "suid")
+DEFAULT_CHECKS = ("proc", "ports", "ssh", "ww", "suid")  # udp yavaş olabilir, istenince
+
+def run_checks(checks=DEFAULT_CHECKS, hosts="127.0.0.1", port_spec="{}-{}".format(*DEFAULT_SCAN_RANGE),
+               timeout=PORT_SCAN_TIMEOUT, concurrency=SCAN_CONCURRENCY, rate=SCAN_RATE,
+               discover=True, banners=False, baseline_path=None, emit=None, show=True,
+               udp_ports=UDP_DEFAULT_PORTS, rebuild_baseline=False, scan_silent=False):
+    """
+    Seçili kontrolleri sırayla fazlar halinde çalıştırır ve rapor sözlüğü döndürür.
+    emit verilirse her faz bittiğinde (faz kaydı, sonuç) ile çağrılır (JSONL için).
+    show=True ise insan okunur bölümler ekrana yazılır.
+    baseline_path None ise baseline kullanılmaz; rebuild_baseline=True ise
+    eski baseline okunmaz, tam taramanın sonucu üzerine yazılır.
+    """
+    report = {"host": socket.gethostname(), "started": datetime.now().isoformat(timespec="seconds"),
+              "euid": os.geteuid(), "checks": list(checks), "phases": [], "results": {}}
+    phases, results = report["phases"], report["results"]
+
+    def done(rec, key, value):
+        results[key] = value
+        if emit:
+            emit(rec, value)
+
+    if "proc" in checks:
+        with phase("proc_parse", phases) as rec:
+            recs = listening_sockets()
+            rec["ops"] = {"sockets": len(recs)}
+        if show:
+            list_listening_proc(recs)
+        done(rec, "listening", [r._asdict() for r in recs])
+    if "ports" in checks:
+        with phase("port_scan", phases) as rec:
+            scan = collect_scan(hosts, port_spec, timeout, concurrency, rate, discover, banners, scan_silent)
+            rec["ops"] = {"connects": scan["probes"], "live_hosts": scan["live_hosts"]}
+        if show:
+            print_scan(scan, rec["wall_s"])
+        done(rec, "ports", scan)
+    if "udp" in checks:
+        with phase("udp_scan", phases) as rec:
+            udp = collect_udp_scan(hosts, udp_ports)
+            rec["ops"] = {"probes": sum(udp["counts"].values()), "final_rate": udp["final_rate"]}
+        if show:
+            print_udp_scan(udp, rec["wall_s"])
+        done(rec, "udp", udp)
+    if "ssh" in checks:
+        with phase("ssh_config", phases) as rec:
+            opts = read_ssh_config()
+        if show:
+            check_ssh_config(opts)
+        done(rec, "ssh_config", opts)
+    if "ww" in checks or "suid" in checks:
+        roots = default_audit_roots(checks)
+        # world-writable ve SUID kuralları tek geçişte değerlendirilir
+        with phase("audit_walk", phases) as rec:
+            baseline = load_baseline(baseline_path, roots) \
+                if baseline_path and not rebuild_baseline else None
+            audit = audit_walk(roots, baseline=baseline)
+            if baseline_path:
+                save_baseline(baseline_path, roots, audit)
+            rec["ops"] = {k: audit[k] for k in ("dirs", "scandir", "lstat", "reused")}
+        # iki kontrolün işi bu tek fazda; ayrı faz açılmaz, bulgular faz sonucuna girer
+        findings = [f._asdict() for f in audit["findings"]]
+        found = {}
+        if "ww" in checks:
+            found["world_writable"] = [f for f in findings if f["rule"] in ("ww_dir", "ww_file", "ww_nosticky")]
+            if show:
+                check_world_writable(audit=audit)
+        if "suid" in checks:
+            found["suid"] = [f for f in findings if f["rule"] in ("suid", "sgid")]
+            if show:
+                check_suid(audit=audit)
+        rec["ops"].update((k, len(v)) for k, v in found.items())
+        results.update(found)
+        if emit:
+            emit(rec, found)
+        if baseline_path:
+            changes = [{"change": k, "path": p, "old_mode": o, "new_mode": n}
+                       for k, p, o, n in audit["changes"]]
+            if show:
+                report_baseline_changes(audit, baseline, rebuild_baseline)
+            results["baseline_changes"] = None if baseline is None else changes
+    report["total"] = {"wall_s": round(sum(p["wall_s"] for p in phases), 6),
+                       "cpu_s": round(sum(p["cpu_s"] for p in phases), 6)}
+    return report
+
 def main():
     print("=== SYSSEC (no-install) QUICK CHECK ===")
     if os.geteuid() == 0:
@@ -179,28 +1286,95 @@ def main():
         print("Not: root değilsiniz. Bazı kontroller eksik olabilir (daha ayrıntılı için sudo kullanın).")
 
     t0 = time.time()
-    list_listening_proc()
-    do_scan = input("\nLocal port taraması yap? (1-1024) [E/h]: ").strip().lower() or "e"
+    checks = list(DEFAULT_CHECKS)
+    hosts, rng, banners = "127.0.0.1", "{}-{}".format(*DEFAULT_SCAN_RANGE), False
+    do_scan = input("\nPort taraması yap? (1-1024) [E/h]: ").strip().lower() or "e"
     if do_scan in ("e","evet","y","yes","1"):
-        rng = input(f"Tarama aralığı gir (ör. 1-1024) veya Enter: ").strip()
-        if rng:
+        hosts = input("Hedef(ler) gir (ör. 127.0.0.1, 192.168.1.0/24) veya Enter: ").strip() or hosts
+        r = input(f"Tarama aralığı gir (ör. 1-1024,8080) veya Enter: ").strip()
+        if r:
             try:
-                a,b = rng.split("-",1)
-                a,b = int(a), int(b)
-            except:
+                parse_ports(r)
+                rng = r
+            except ValueError:
                 print("Aralık parse edilemedi, varsayılan kullanılacak.")
-                a,b = DEFAULT_SCAN_RANGE
-            scan_ports("127.0.0.1", (a,b))
-        else:
-            scan_ports("127.0.0.1", DEFAULT_SCAN_RANGE)
-    check_ssh_config()
-    check_world_writable()
-    check_suid()
+        svc = input("Açık portlarda servis tespiti (banner) yap? [e/H]: ").strip().lower()
+        banners = svc in ("e","evet","y","yes","1")
+    else:
+        checks.remove("ports")
+    report = run_checks(checks, hosts, rng, banners=banners, baseline_path=default_baseline_path())
     suggestions()
+    print_phases(report["phases"])
     print(f"\nTamam. Çalışma süresi: {time.time()-t0:.1f}s")
 
+def parse_args(argv):
+    ap = argparse.ArgumentParser(prog="scanN", description="Saf-Python yerel güvenlik kontrol aracı (etkileşimsiz mod).")
+    ap.add_argument("--checks", default=",".join(DEFAULT_CHECKS),
+                    help=f"virgülle ayrılmış kontroller: {','.join(CHECKS)} (varsayılan: udp hariç hepsi)")
+    ap.add_argument("--hosts", default="127.0.0.1", help="host, liste veya CIDR (ör. 127.0.0.0/24)")
+    ap.add_argument("--ports", default="{}-{}".format(*DEFAULT_SCAN_RANGE), help="ör. 1-1024,8080")
+    ap.add_argument("--timeout", type=float, default=PORT_SCAN_TIMEOUT, help="başlangıç connect timeout (s)")
+    ap.add_argument("--concurrency", type=int, default=SCAN_CONCURRENCY)
+    ap.add_argument("--rate", type=float, default=SCAN_RATE, help="saniyede connect (0 = sınırsız)")
+    ap.add_argument("--no-discovery", action="store_true", help="canlı host keşfini atla, tüm host'ları tara")
+    ap.add_argument("--scan-silent", action="store_true",
+                    help="keşifte hiç yanıt vermeyen host'ları da başlangıç timeout'uyla tara (varsayılan: atla)")
+    ap.add_argument("--udp-ports", default=UDP_DEFAULT_PORTS, help="udp kontrolünün portları (varsayılan: yaygın servisler)")
+    ap.add_argument("--banners", action="store_true", help="açık portlarda servis tespiti yap")
+    ap.add_argument("--baseline", default=default_baseline_path(), help="baseline dosyası")
+    ap.add_argument("--no-baseline", action="store_true", help="baseline okuma/yazma yapma (tam tarama)")
+    ap.add_argument("--rebuild-baseline", action="store_true",
+                    help="eski baseline'ı okumadan tam tara ve baseline'ı yeniden yaz")
+    ap.add_argument("--format", choices=("text", "json", "jsonl"), default="text")
+    ap.add_argument("--bench-audit", type=int, metavar="N", help="N girişli sentetik ağaçta denetim benchmark'ı")
+    args = ap.parse_args(argv)
+    args.checks = [c.strip() for c in args.checks.split(",") if c.strip()]
+    bad = [c for c in args.checks if c not in CHECKS]
+    if bad:
+        ap.error(f"bilinmeyen kontrol: {', '.join(bad)}")
+    for opt, spec in (("--ports", args.ports), ("--udp-ports", args.udp_ports)):
+        try:
+            ok = bool(parse_ports(spec))
+        except ValueError:
+            ok = False
+        if not ok:
+            ap.error(f"{opt}: geçersiz port listesi: {spec!r} (ör. 22,80,8000-8010)")
+    if args.no_baseline and args.rebuild_baseline:
+        ap.error("--no-baseline ve --rebuild-baseline birlikte kullanılamaz")
+    return args
+
+def cli_main(argv):
+    args = parse_args(argv)
+    if args.bench_audit:
+        audit_benchmark(args.bench_audit)
+        return
+    fmt = args.format
+
+    def emit(rec, value):
+        print(json.dumps({"type": "phase", **rec, "result": value}, ensure_ascii=False, default=str), flush=True)
+
+    report = run_checks(args.checks, args.hosts, args.ports, args.timeout, args.concurrency, args.rate,
+                        not args.no_discovery, args.banners,
+                        None if args.no_baseline else args.baseline,
+                        emit=emit if fmt == "jsonl" else None, show=fmt == "text",
+                        udp_ports=args.udp_ports, rebuild_baseline=args.rebuild_baseline,
+                        scan_silent=args.scan_silent)
+    if fmt == "json":
+        print(json.dumps(report, ensure_ascii=False, indent=2, default=str))
+    elif fmt == "jsonl":
+        summary = {k: v for k, v in report.items() if k not in ("phases", "results")}
+        if "baseline_changes" in report["results"]:
+            summary["baseline_changes"] = report["results"]["baseline_changes"]
+        print(json.dumps({"type": "summary", **summary}, ensure_ascii=False, default=str))
+    else:
+        print_phases(report["phases"])
+        print(f"\nToplam: {report['total']['wall_s']:.2f}s duvar, {report['total']['cpu_s']:.2f}s CPU")
+
 if __name__ == "__main__":
     try:
-        main()
+        if len(sys.argv) > 1:
+            cli_main(sys.argv[1:])
+        else:
+            main()
     except KeyboardInterrupt:
         print("\nİptal edildi.")
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# betikler depo kökünde duruyor; testler onları modül olarak içe aktarır
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
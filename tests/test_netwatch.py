@@ -0,0 +1,87 @@
+import time
+
+import pytest
+
+import netwatch
+
+
+def _icmp_available():
+    sock, _ = netwatch.open_icmp_socket()
+    if sock is None:
+        return False
+    sock.close()
+    return True
+
+
+needs_icmp = pytest.mark.skipif(not _icmp_available(), reason="ICMP soketi yok (ping_group_range / root)")
+
+
+def test_echo_request_checksum():
+    pkt = netwatch._echo_request(0x1234, 7)
+    assert pkt[0] == netwatch.ICMP_ECHO_REQUEST and pkt.endswith(b"netwatch")
+    assert netwatch._icmp_checksum(pkt) == 0  # doğru sağlama toplamıyla paketin toplamı sıfırdır
+    assert netwatch._icmp_checksum(b"\x00\x01\xf2\x03\xf4\xf5\xf6\xf7") == 0x220d  # RFC 1071 örneği
+
+
+@needs_icmp
+def test_icmp_sweep_loopback():
+    ips = [f"127.0.0.{i}" for i in range(1, 9)]
+    assert sorted(netwatch.icmp_sweep(ips, timeout=0.5)) == ips
+
+
+@needs_icmp
+def test_icmp_sweep_small_window_and_silent_host():
+    # pencere 2: problar sırayla yer açar; yanıtsız adres timeout sonunda düşer
+    ips = ["127.0.0.1", "203.0.113.7", "127.0.0.2", "127.0.0.3"]
+    t0 = time.monotonic()
+    alive = list(netwatch.icmp_sweep(iter(ips), timeout=0.3, window=2))
+    assert sorted(alive) == ["127.0.0.1", "127.0.0.2", "127.0.0.3"]
+    assert time.monotonic() - t0 < 2.0
+
+
+IEEE_SAMPLE = """\
+OUI/MA-L                                                    Organization
+company_id                                                  Organization
+                                                            Address
+
+10-E9-92   (hex)\t\tINGRAM MICRO SERVICES
+10E992     (base 16)\t\tINGRAM MICRO SERVICES
+\t\t\t\t100 CHEMIN DE BAILLOT
+\t\t\t\t    214400
+\t\t\t\tFR
+""".splitlines(True)
+
+
+def test_parse_oui_lines_formats():
+    assert dict(netwatch._parse_oui_lines(IEEE_SAMPLE)) == {0x10E992: "INGRAM MICRO SERVICES"}
+    other = ["286FB9 Nokia\n", "00:1A:2B\tFoo Bar\n", "MA-L,ACDE48,Private,addr\n"]
+    assert dict(netwatch._parse_oui_lines(other)) == \
+        {0x286FB9: "Nokia", 0x001A2B: "Foo Bar", 0xACDE48: "Private"}
+
+
+def test_bundled_oui_table():
+    with netwatch._open_text(netwatch.OUI_BUNDLED) as f:
+        table = dict(netwatch._parse_oui_lines(f))
+    assert len(table) > 30000  # IEEE MA-L listesinin tamamı
+    assert table[0xB827EB] == "Raspberry Pi Foundation"
+
+
+def test_inventory_errors(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path))
+    assert netwatch.print_inventory(1)
+    (tmp_path / "netwatch" / "inventory.db").write_bytes(b"x" * 4096)
+    with pytest.raises(netwatch.sqlite3.DatabaseError):
+        netwatch.open_inventory()
+    assert not netwatch.print_inventory(1)
+    assert not netwatch.print_history("10.0.0.1")
+    assert "Envanter okunamadı" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("spec", ["10.0.0.0/30", "10.0.0.0/31", "10.0.0.5", "192.168.1.", "10.0.0.0/29,10.0.1.0/31"])
+def test_count_hosts_matches_iter_hosts(spec):
+    assert netwatch.count_hosts(spec) == len(list(netwatch.iter_hosts(spec)))
+
+
+def test_parse_networks_rejects_ipv6():
+    with pytest.raises(ValueError, match="IPv6"):
+        netwatch.parse_networks("10.0.0.0/24, fd00::/126")
@@ -0,0 +1,211 @@
+import os
+import socket
+import threading
+import time
+
+import scanN
+
+
+def _touch(path, mode):
+    with open(path, "w"):
+        pass
+    os.chmod(path, mode)
+
+
+def _rules(audit):
+    return {(f.rule, os.path.basename(f.path)) for f in audit["findings"]}
+
+
+def test_audit_walk_rules(tmp_path):
+    _touch(tmp_path / "suid", 0o4755)
+    _touch(tmp_path / "sgid", 0o2755)
+    _touch(tmp_path / "lock", 0o2644)   # g+s, g-x: zorunlu kilit, SGID değil
+    _touch(tmp_path / "ww", 0o666)
+    _touch(tmp_path / "plain", 0o644)
+    (tmp_path / "open").mkdir()
+    os.chmod(tmp_path / "open", 0o777)
+    (tmp_path / "sticky").mkdir()
+    os.chmod(tmp_path / "sticky", 0o1777)
+    os.symlink(tmp_path / "suid", tmp_path / "link")
+    audit = scanN.audit_walk([(str(tmp_path), None)])
+    assert _rules(audit) == {
+        ("suid", "suid"), ("sgid", "sgid"), ("ww_file", "ww"),
+        ("ww_dir", "open"), ("ww_nosticky", "open"), ("ww_dir", "sticky"),
+    }
+    assert audit["scandir"] == 3
+    assert set(audit["tree"]) == {str(tmp_path), str(tmp_path / "open"), str(tmp_path / "sticky")}
+
+
+def test_audit_walk_depth_limit(tmp_path):
+    deep = tmp_path / "a" / "b"
+    deep.mkdir(parents=True)
+    _touch(tmp_path / "a" / "top", 0o4755)
+    _touch(deep / "bottom", 0o4755)
+    audit = scanN.audit_walk([(str(tmp_path), 2)])
+    assert _rules(audit) == {("suid", "top")}
+    assert str(deep) not in audit["tree"]
+
+
+def test_audit_walk_nested_roots_once(tmp_path):
+    (tmp_path / "sub").mkdir()
+    _touch(tmp_path / "sub" / "x", 0o4755)
+    audit = scanN.audit_walk([(str(tmp_path), None), (str(tmp_path / "sub"), None)])
+    assert [f.rule for f in audit["findings"]] == ["suid"]
+    assert audit["dirs"] == 2
+
+
+def test_default_audit_roots():
+    assert scanN.default_audit_roots(["suid"]) == [(p, None) for p in scanN.SUID_SEARCH_PATHS]
+    assert scanN.default_audit_roots(["ww"]) == \
+        [(p, scanN.WORLD_WRITABLE_DEPTH) for p in scanN.WORLD_WRITABLE_PATHS]
+    assert scanN.default_audit_roots() == \
+        scanN.default_audit_roots(["suid"]) + scanN.default_audit_roots(["ww"])
+
+
+def _baseline_round(tmp_path, roots):
+    path = str(tmp_path / "cache" / "baseline.json.gz")
+    scanN.save_baseline(path, roots, scanN.audit_walk(roots))
+    baseline = scanN.load_baseline(path, roots)
+    assert baseline is not None
+    # dosya sistemi zaman damgaları kaba olabilir: değişiklikler sonraki tike düşsün
+    time.sleep(0.05)
+    return baseline
+
+
+def test_baseline_unchanged_tree(tmp_path):
+    tree = tmp_path / "tree"
+    (tree / "sub").mkdir(parents=True)
+    _touch(tree / "sub" / "x", 0o644)
+    roots = [(str(tree), None)]
+    baseline = _baseline_round(tmp_path, roots)
+    audit = scanN.audit_walk(roots, baseline=baseline)
+    assert audit["changes"] == []
+    assert audit["scandir"] == 0
+    assert audit["reused"] == 2
+
+
+def test_baseline_diff(tmp_path):
+    tree = tmp_path / "tree"
+    (tree / "sub").mkdir(parents=True)
+    _touch(tree / "keep", 0o644)
+    _touch(tree / "gone", 0o644)
+    _touch(tree / "sub" / "bin", 0o755)
+    roots = [(str(tree), None)]
+    baseline = _baseline_round(tmp_path, roots)
+    os.remove(tree / "gone")
+    _touch(tree / "new", 0o666)
+    os.chmod(tree / "sub" / "bin", 0o4755)  # yalnız ctime değişir, dizinin mtime'ı değil
+    audit = scanN.audit_walk(roots, baseline=baseline)
+    assert audit["changes"] == [
+        ("removed", str(tree / "gone"), 0o100644, None),
+        ("added", str(tree / "new"), None, 0o100666),
+        ("mode", str(tree / "sub" / "bin"), 0o100755, 0o104755),
+    ]
+    assert audit["reused"] == 1  # sub yeniden okunmadan kontrol edildi
+    assert ("suid", "bin") in _rules(audit)
+
+
+def test_baseline_rejects_other_roots(tmp_path):
+    roots = [(str(tmp_path), None)]
+    path = str(tmp_path / "baseline.json.gz")
+    scanN.save_baseline(path, roots, scanN.audit_walk(roots))
+    assert scanN.load_baseline(path, roots) is not None
+    assert scanN.load_baseline(path, [(str(tmp_path), 1)]) is None
+    assert scanN.load_baseline(str(tmp_path / "missing.gz"), roots) is None
+
+
+def _free_port(kind=socket.SOCK_STREAM):
+    with socket.socket(socket.AF_INET, kind) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _tcp_server(reply, greet=True):
+    """Arka planda dinleyici: greet ise önce konuşur, değilse ilk istekten sonra yanıtlar."""
+    srv = socket.socket()
+    srv.bind(("127.0.0.1", 0))
+    srv.listen(8)
+
+    def serve():
+        while True:
+            conn, _ = srv.accept()
+            with conn:
+                try:
+                    if not greet:
+                        conn.recv(1024)
+                    conn.sendall(reply)
+                    conn.recv(1024)
+                except OSError:
+                    pass  # tarayıcının connect'i RST ile kapanır
+
+    threading.Thread(target=serve, daemon=True).start()
+    return srv.getsockname()[1]
+
+
+def test_tcp_connect_scan_states():
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(8)
+    with listener:
+        open_port, closed_port = listener.getsockname()[1], _free_port()
+        res = {port: state for _, port, state, _ in
+               scanN.tcp_connect_scan([("127.0.0.1", open_port), ("127.0.0.1", closed_port)], 1.0)}
+    assert res == {open_port: "open", closed_port: "closed"}
+
+
+def test_fingerprint_signatures():
+    assert scanN.fingerprint(b"SSH-2.0-OpenSSH_9.6\r\n") == ("ssh", "OpenSSH_9.6")
+    assert scanN.fingerprint(b"220 mail ESMTP Postfix\r\n") == ("smtp", "mail ESMTP Postfix")
+    assert scanN.fingerprint(b"+PONG\r\n", "redis") == ("redis", "+PONG")
+    assert scanN.fingerprint(b"\x00junk\nmore") == (None, "\x00junk")
+
+
+def test_grab_banner_passive():
+    port = _tcp_server(b"SSH-2.0-OpenSSH_9.6\r\n")
+    assert scanN.grab_banner("127.0.0.1", port) == ("127.0.0.1", port, "ssh", "OpenSSH_9.6")
+
+
+def test_grab_banner_http_probe():
+    port = _tcp_server(b"HTTP/1.0 200 OK\r\nServer: test/1.0\r\n\r\n", greet=False)
+    assert scanN.grab_banner("127.0.0.1", port, passive=0.05) == ("127.0.0.1", port, "http", "test/1.0")
+
+
+def test_scan_with_banners():
+    port = _tcp_server(b"SSH-2.0-OpenSSH_9.6\r\n")
+    res = list(scanN.scan_with_banners(["127.0.0.1"], [port, _free_port()], timeout=1.0))
+    assert res == [("127.0.0.1", port, "ssh", "OpenSSH_9.6")]
+
+
+def test_udp_scan_states():
+    echo = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    echo.bind(("127.0.0.1", 0))
+    silent = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    silent.bind(("127.0.0.1", 0))
+
+    def serve():
+        data, addr = echo.recvfrom(512)
+        echo.sendto(b"pong:" + data, addr)
+
+    threading.Thread(target=serve, daemon=True).start()
+    with echo, silent:
+        open_port, quiet_port = echo.getsockname()[1], silent.getsockname()[1]
+        closed_port = _free_port(socket.SOCK_DGRAM)
+        targets = [("127.0.0.1", p) for p in (open_port, closed_port, quiet_port)]
+        res = {port: (state, data) for _, port, state, data in
+               scanN.udp_scan(targets, timeout=0.05, retries=1)}
+    assert res == {open_port: ("open", b"pong:"), closed_port: ("closed", None),
+                   quiet_port: ("open|filtered", None)}
+
+
+def test_icmp_pacer():
+    pacer = scanN.IcmpPacer(rate=100, window=1.0)
+    pacer._reset(0.0)
+    pacer.answered(0, True)
+    pacer.tick(1.0)
+    assert pacer.rate == 150 and not pacer.limited
+    for _ in range(20):
+        pacer.answered(0, True)
+    pacer.answered(1, True)  # tekrar denemede gelen ICMP: ilk deneme düşürüldü
+    pacer.tick(3.0)
+    assert pacer.limited and pacer.rate == 10.5
+    assert pacer.history == [150, 10.5]